@@ -2,6 +2,8 @@ from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as AuthUserAdmin
 from django.contrib.auth.models import Group
 
+from extras.admin import IndexedSearchMixin
+
 from .models import User
 
 # Grouping users is not relevant for the project, hence the built-in
@@ -11,7 +13,7 @@ admin.site.unregister(Group)
 
 
 @admin.register(User)
-class UserAdmin(AuthUserAdmin, admin.ModelAdmin):
+class UserAdmin(IndexedSearchMixin, AuthUserAdmin, admin.ModelAdmin):
     """Admin options for the User model."""
 
     def get_fieldsets(self, request, obj):
@@ -0,0 +1,643 @@
+import hashlib
+import json
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+from itertools import islice
+from pathlib import Path
+
+import django
+from django.contrib.auth import get_user_model
+from django.contrib.auth.base_user import BaseUserManager
+from django.contrib.auth.hashers import make_password
+from django.db import connections, transaction
+from django.db.models import Q
+
+from extras.text import TRUE_VALUES
+
+import openpyxl
+import pandas as pd
+
+from .models import post_bulk_save
+
+USER_FIELDS = [
+    {
+        "name": field[0],
+        "required": field[1],
+        "default": field[2] if len(field) > 2 else None,
+    }
+    for field in [
+        ("id", True),
+        ("username", True),
+        ("password", True),
+        ("first_name", False, ""),
+        ("last_name", False, ""),
+        ("email", False, ""),
+        ("is_staff", False, False),
+        ("is_superuser", False, False),
+    ]
+]
+
+FIELD_NAMES = [field["name"] for field in USER_FIELDS]
+
+REQUIRED_FIELD_NAMES = [field["name"] for field in USER_FIELDS if field["required"]]
+
+# Fields of the existing users overwritten by the import. Passwords are taken
+# from the data for the newly created users only, so that the users keep the
+# passwords they have set themselves.
+UPDATE_FIELD_NAMES = [
+    "username",
+    "first_name",
+    "last_name",
+    "email",
+    "is_staff",
+    "is_superuser",
+]
+
+# Fields the existing users can be matched on
+KEY_FIELD_NAMES = ["id", "username"]
+
+
+def check_columns(columns, sheet, workbook_path):
+    """Check whether all the user fields are present in the data columns."""
+    missing_columns = [field for field in FIELD_NAMES if field not in columns]
+
+    if missing_columns:
+        raise KeyError(
+            "The following columns are missing in the data sheet "
+            "'{}' of workbook '{}': {}.".format(
+                sheet,
+                workbook_path,
+                ", ".join(missing_columns),
+            )
+        )
+
+
+def select_sheet(workbook_sheets, sheet, workbook_path):
+    """Return the name of the user-data sheet of the workbook."""
+    # If the workbook has more than a single sheet, check if it also
+    # has the sheet specified as the function parameter.
+    if len(workbook_sheets) > 1:
+        if sheet not in workbook_sheets:
+            raise ValueError(
+                "Sheet '{}' not found in the workbook '{}'.".format(
+                    sheet,
+                    workbook_path,
+                )
+            )
+        return sheet
+
+    # The only sheet is taken as the user-data sheet
+    return workbook_sheets[0]
+
+
+def read_workbook(workbook_path, sheet):
+    """
+    Read the user data from the Excel workbook into a dataframe.
+
+    The index of the dataframe is set to the numbers of the sheet rows, so that
+    the errors can be reported with respect to the workbook.
+    """
+    with pd.ExcelFile(workbook_path) as workbook:
+        sheet = select_sheet(workbook.sheet_names, sheet, workbook_path)
+
+        # Read the sheet from the workbook
+        users = pd.read_excel(workbook, sheet_name=sheet, dtype="object")
+
+    # Extract only the required data
+    check_columns(users.columns, sheet, workbook_path)
+    users = users[FIELD_NAMES]
+
+    # The first row of the sheet is the header
+    users.index += 2
+
+    return users
+
+
+def iter_workbook_chunks(workbook_path, sheet, chunk_size):
+    """
+    Read the user data from the Excel workbook in chunks of `chunk_size` rows.
+
+    The workbook is opened in read-only mode and its rows are read lazily, so
+    that only a single chunk is kept in memory at a time.
+    """
+    workbook = openpyxl.load_workbook(workbook_path, read_only=True, data_only=True)
+
+    try:
+        sheet = select_sheet(workbook.sheetnames, sheet, workbook_path)
+        rows = workbook[sheet].iter_rows(values_only=True)
+
+        # The first row of the sheet is the header
+        columns = list(next(rows, ()))
+        check_columns(columns, sheet, workbook_path)
+
+        rows = (
+            (row_number, row)
+            for row_number, row in enumerate(rows, start=2)
+            if any(value is not None for value in row)
+        )
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            row_numbers, records = zip(*chunk)
+            yield pd.DataFrame.from_records(
+                records,
+                index=row_numbers,
+                columns=columns,
+            )[FIELD_NAMES].astype("object")
+    finally:
+        workbook.close()
+
+
+def iter_csv_chunks(csv_path, chunk_size):
+    """Read the user data from the CSV file in chunks of `chunk_size` rows."""
+    check_columns(pd.read_csv(csv_path, nrows=0).columns, "-", csv_path)
+
+    with pd.read_csv(
+        csv_path,
+        usecols=FIELD_NAMES,
+        dtype="object",
+        chunksize=chunk_size,
+    ) as reader:
+        for users in reader:
+            # The first line of the file is the header
+            users.index += 2
+            yield users[FIELD_NAMES]
+
+
+def iter_parquet_chunks(parquet_path, chunk_size):
+    """Read the user data from the Parquet file in chunks of `chunk_size` rows."""
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Reading Parquet files requires the 'pyarrow' package.")
+
+    parquet_file = pq.ParquetFile(parquet_path)
+    check_columns(parquet_file.schema_arrow.names, "-", parquet_path)
+
+    start = 1
+    for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=FIELD_NAMES):
+        users = batch.to_pandas().astype("object")
+        users.index += start
+        start += len(users)
+        yield users
+
+
+def iter_user_chunks(path, sheet, chunk_size):
+    """
+    Read the user data in chunks of `chunk_size` rows.
+
+    The format of the data is determined by the file extension: Excel workbooks
+    (.xlsx, .xlsm), CSV (.csv) and Parquet (.parquet) files are supported.
+    """
+    extension = Path(path).suffix.lower()
+
+    if extension in [".xlsx", ".xlsm"]:
+        return iter_workbook_chunks(path, sheet, chunk_size)
+    if extension == ".csv":
+        return iter_csv_chunks(path, chunk_size)
+    if extension == ".parquet":
+        return iter_parquet_chunks(path, chunk_size)
+
+    raise ValueError("Unsupported format of the user data file '{}'.".format(path))
+
+
+def to_bool(value):
+    """Convert the boolean flag read from the data file."""
+    if isinstance(value, str):
+        return value.strip().lower() in TRUE_VALUES
+    return bool(value)
+
+
+def validate_users(users):
+    """
+    Validate the user data and return the valid rows along with the row errors.
+
+    The checks are vectorized over the whole dataframe. The errors are returned
+    as a list of (row, message) tuples, with at most a single error per row.
+    """
+    User = get_user_model()
+    errors = {}
+
+    def reject(mask, message):
+        for row in users.index[mask].tolist():
+            errors.setdefault(row, message)
+
+    reject(
+        users[REQUIRED_FIELD_NAMES].isnull().any(axis=1),
+        "The following fields has to be specified: {}.".format(
+            ", ".join(REQUIRED_FIELD_NAMES)
+        ),
+    )
+
+    ids = pd.to_numeric(users["id"], errors="coerce")
+    reject(
+        users["id"].notnull() & ~((ids >= 1) & (ids % 1 == 0)),
+        "The ID has to be a positive integer.",
+    )
+    reject(ids.notnull() & ids.duplicated(keep=False), "The ID is duplicated.")
+
+    usernames = (
+        users["username"]
+        .astype("string")
+        .str.strip()
+        .map(User.normalize_username, na_action="ignore")
+    )
+    reject(
+        usernames.str.len()
+        .gt(User._meta.get_field("username").max_length)
+        .fillna(False)
+        .astype(bool),
+        "The username is too long.",
+    )
+    reject(
+        usernames.notnull() & usernames.duplicated(keep=False),
+        "The username is duplicated.",
+    )
+
+    users = users.drop(index=list(errors)).copy()
+
+    # Handle NaN or empty values in the remaining columns
+    for user_field in USER_FIELDS:
+        if user_field["default"] is not None and not user_field["required"]:
+            users[user_field["name"]] = users[user_field["name"]].fillna(
+                user_field["default"]
+            )
+
+    users["id"] = ids.drop(index=list(errors)).astype("int64")
+    users["username"] = usernames.drop(index=list(errors)).astype(str)
+    users["password"] = users["password"].astype(str)
+    for name in ["first_name", "last_name", "email"]:
+        users[name] = users[name].astype(str).str.strip()
+    users["email"] = users["email"].map(BaseUserManager.normalize_email)
+    for name in ["is_staff", "is_superuser"]:
+        users[name] = users[name].map(to_bool).astype(bool)
+
+    return users, sorted(errors.items())
+
+
+def get_row_hash(values):
+    """Return the digest of the values of the fields updated by the import."""
+    return hashlib.blake2b(
+        repr(tuple(values[name] for name in UPDATE_FIELD_NAMES)).encode(),
+        digest_size=16,
+    ).digest()
+
+
+def hash_passwords(passwords, executor=None, chunksize=1):
+    """Hash the raw passwords, in the pool of worker processes if given."""
+    if executor is None:
+        return [make_password(password) for password in passwords]
+    return list(executor.map(make_password, passwords, chunksize=chunksize))
+
+
+@dataclass
+class ImportReport:
+    """A class to represent the summary of the User objects import."""
+
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    errors: list = field(default_factory=list)
+
+    @property
+    def failed(self):
+        return len(self.errors)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{**data, "errors": [tuple(error) for error in data["errors"]]})
+
+    def merge(self, other):
+        """Add the results of the other report to the report."""
+        self.created += other.created
+        self.updated += other.updated
+        self.unchanged += other.unchanged
+        self.errors.extend(other.errors)
+
+
+class ImportCheckpoint:
+    """
+    A class to represent the checkpoint of the streamed User objects import.
+
+    The checkpoint is saved to a JSON file after each committed chunk. It holds
+    the indices of the committed chunks and the merged report of their import,
+    along with the signature of the data file and of the import options, so that
+    it cannot be resumed against different data.
+    """
+
+    def __init__(self, path, source, **options):
+        source = Path(source).resolve()
+        stat = source.stat()
+
+        self.path = Path(path)
+        self.signature = {
+            "source": str(source),
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+            **options,
+        }
+        self.chunks = set()
+        self.report = ImportReport()
+
+    def load(self):
+        """Load the checkpoint saved by the interrupted import."""
+        data = json.loads(self.path.read_text())
+
+        if data["signature"] != self.signature:
+            raise ValueError(
+                "The checkpoint '{}' does not match the data file or the import "
+                "options.".format(self.path)
+            )
+
+        self.chunks = set(data["chunks"])
+        self.report = ImportReport.from_dict(data["report"])
+
+    def save(self):
+        """Save the checkpoint, replacing the previous one atomically."""
+        temporary_path = self.path.with_name(self.path.name + ".tmp")
+        temporary_path.write_text(
+            json.dumps(
+                {
+                    "signature": self.signature,
+                    "chunks": sorted(self.chunks),
+                    "report": asdict(self.report),
+                }
+            )
+        )
+        os.replace(temporary_path, self.path)
+
+    def delete(self):
+        """Delete the checkpoint of the completed import."""
+        self.path.unlink(missing_ok=True)
+
+    def commit(self, index, report):
+        """Record the chunk as committed."""
+        self.chunks.add(index)
+        self.report.merge(report)
+        self.save()
+
+
+class BulkUserImporter:
+    """
+    A class to import the User objects in bulk.
+
+    The rows are split into the new and the existing users, matched by the `key`
+    field (ID or username), and written with `bulk_create()` and `bulk_update()`
+    in chunks of `batch_size` rows. The existing users whose data have not
+    changed, as told by the row hashes, are skipped. The passwords are hashed in
+    a pool of `processes` worker processes; the pool is started when
+    the importer is entered as a context manager.
+
+    The users can be imported either from a single dataframe, in a single
+    transaction, or from a stream of dataframes, each in its own transaction.
+    The latter can be checkpointed and split across worker processes.
+    """
+
+    def __init__(self, batch_size=1000, processes=None, key="id"):
+        if key not in KEY_FIELD_NAMES:
+            raise ValueError(
+                "The key has to be one of the fields: {}.".format(
+                    ", ".join(KEY_FIELD_NAMES)
+                )
+            )
+
+        self.key = key
+        self.batch_size = batch_size
+        self.processes = processes or os.cpu_count()
+        self.executor = None
+        self.report = ImportReport()
+
+    def __enter__(self):
+        if self.processes != 1:
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.processes,
+                initializer=django.setup,
+            )
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def import_users(self, users):
+        """Validate and import the users dataframe in a single transaction."""
+        users, errors = validate_users(users)
+        self.report.errors.extend(errors)
+
+        with transaction.atomic():
+            for start in range(0, len(users), self.batch_size):
+                stop = start + self.batch_size
+                self.import_chunk(users.iloc[start:stop], self.report)
+
+        return self.report
+
+    def import_stream(self, chunks, checkpoint=None, workers=1):
+        """
+        Validate and import the stream of users dataframes.
+
+        Each chunk is committed in its own transaction, so that the memory usage
+        does not depend on the total number of rows. The committed chunks are
+        recorded in the `checkpoint`, if given, and skipped when the import is
+        resumed.
+
+        The duplicates are detected within each chunk only, the other chunks
+        being matched against the database: a row repeating the key of a row of
+        a previous chunk updates the user imported by the latter. With more than
+        a single worker, the chunks repeating the same new users may be imported
+        at once, and the import then fails on the unique constraints.
+
+        With more than a single worker, the chunks are validated in the current
+        process and imported in the pool of `workers` processes, each with its
+        own database connection. At most two chunks per worker are kept in
+        memory at a time.
+        """
+        committed_chunks = set()
+        if checkpoint is not None:
+            committed_chunks = set(checkpoint.chunks)
+            self.report.merge(checkpoint.report)
+
+        pending_chunks = (
+            (index, *validate_users(users))
+            for index, users in enumerate(chunks)
+            if index not in committed_chunks
+        )
+
+        if workers > 1:
+            self.import_chunks_in_workers(pending_chunks, checkpoint, workers)
+        else:
+            for index, users, errors in pending_chunks:
+                report = ImportReport(errors=errors)
+                with transaction.atomic():
+                    self.import_chunk(users, report)
+                self.commit_chunk(index, report, checkpoint)
+
+        return self.report
+
+    def import_chunks_in_workers(self, chunks, checkpoint, workers):
+        """Import the validated chunks in the pool of worker processes."""
+        # The worker processes must not share the connections of this process
+        connections.close_all()
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=django.setup,
+        ) as executor:
+            futures = set()
+
+            try:
+                for index, users, errors in chunks:
+                    if len(futures) >= 2 * workers:
+                        done, futures = wait(futures, return_when=FIRST_COMPLETED)
+                        self.commit_futures(done, checkpoint)
+
+                    futures.add(
+                        executor.submit(
+                            import_chunk_in_worker,
+                            index,
+                            users,
+                            errors,
+                            self.batch_size,
+                            self.key,
+                        )
+                    )
+            except BaseException:
+                # Record the chunks committed by the running workers anyway
+                for future in futures:
+                    future.cancel()
+                self.commit_futures(wait(futures).done, checkpoint, fail=False)
+                raise
+
+            self.commit_futures(wait(futures).done, checkpoint)
+
+    def commit_futures(self, futures, checkpoint, fail=True):
+        """Record the chunks imported by the workers; re-raise their errors."""
+        exception = None
+
+        for future in futures:
+            if future.cancelled():
+                continue
+            if future.exception() is not None:
+                exception = exception or future.exception()
+                continue
+            self.commit_chunk(*future.result(), checkpoint)
+
+        if fail and exception is not None:
+            raise exception
+
+    def commit_chunk(self, index, report, checkpoint):
+        """Add the report of the committed chunk to the checkpoint, if given."""
+        self.report.merge(report)
+
+        if checkpoint is not None:
+            checkpoint.commit(index, report)
+
+    def import_chunk(self, users, report):
+        """Import the chunk of the validated users dataframe."""
+        User = get_user_model()
+
+        # Fetch the users colliding with the chunk by ID or username at once
+        existing_users = User.objects.filter(
+            Q(id__in=users["id"].tolist()) | Q(username__in=users["username"].tolist())
+        ).only("id", *UPDATE_FIELD_NAMES)
+        users_by_id = {user.id: user for user in existing_users}
+        users_by_username = {user.username: user for user in users_by_id.values()}
+
+        new_users, new_passwords, updated_users = [], [], []
+        updated_fields = set()
+
+        for row, user_data in zip(users.index.tolist(), users.to_dict("records")):
+            password = user_data.pop("password")
+
+            if self.key == "username":
+                user = users_by_username.get(user_data["username"])
+                # The IDs of the existing users are never changed
+                if user is not None:
+                    user_data["id"] = user.id
+            else:
+                user = users_by_id.get(user_data["id"])
+
+            # The users matched by ID may be renamed, while the new users may
+            # take neither an ID nor a username of an existing user.
+            owner = users_by_username.get(user_data["username"])
+            if owner is not None and owner.id != user_data["id"]:
+                report.errors.append(
+                    (
+                        row,
+                        "The username '{}' is already taken by user ID={}.".format(
+                            user_data["username"],
+                            owner.id,
+                        ),
+                    )
+                )
+                continue
+            if user is None and user_data["id"] in users_by_id:
+                report.errors.append(
+                    (
+                        row,
+                        "The ID={} is already taken by user '{}'.".format(
+                            user_data["id"],
+                            users_by_id[user_data["id"]].username,
+                        ),
+                    )
+                )
+                continue
+
+            if user is None:
+                new_users.append(User(**user_data))
+                new_passwords.append(password)
+            elif get_row_hash(user_data) == get_row_hash(user.__dict__):
+                report.unchanged += 1
+            else:
+                for name in UPDATE_FIELD_NAMES:
+                    if getattr(user, name) != user_data[name]:
+                        setattr(user, name, user_data[name])
+                        updated_fields.add(name)
+                updated_users.append(user)
+
+        for user, password in zip(
+            new_users,
+            hash_passwords(
+                new_passwords,
+                self.executor,
+                chunksize=max(1, len(new_passwords) // (4 * self.processes)),
+            ),
+        ):
+            user.password = password
+
+        User.objects.bulk_create(new_users, batch_size=self.batch_size)
+        if updated_users:
+            User.objects.bulk_update(
+                updated_users,
+                sorted(updated_fields),
+                batch_size=self.batch_size,
+            )
+
+        # As the bulk writes send no `post_save` signals, e.g. for the search index
+        saved_users = new_users + updated_users
+        if saved_users:
+            post_bulk_save.send(
+                sender=User,
+                pks=[user.pk for user in saved_users],
+                update_fields=None if new_users else sorted(updated_fields),
+            )
+
+        report.created += len(new_users)
+        report.updated += len(updated_users)
+
+
+def import_chunk_in_worker(index, users, errors, batch_size, key):
+    """
+    Import the chunk of the validated users dataframe in the worker process.
+
+    Each worker process uses its own database connection and hashes
+    the passwords of its chunk on its own.
+    """
+    report = ImportReport(errors=errors)
+
+    with transaction.atomic():
+        BulkUserImporter(batch_size, processes=1, key=key).import_chunk(users, report)
+
+    return index, report
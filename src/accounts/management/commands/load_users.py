@@ -1,26 +1,16 @@
 from django.contrib.auth import get_user_model
-from django.core.management import BaseCommand
-from django.db import IntegrityError
-
-import pandas as pd
-
-USER_FIELDS = [
-    {
-        "name": field[0],
-        "required": field[1],
-        "default": field[2] if len(field) > 2 else None,
-    }
-    for field in [
-        ("id", True),
-        ("username", True),
-        ("password", True),
-        ("first_name", False, ""),
-        ("last_name", False, ""),
-        ("email", False, ""),
-        ("is_staff", False, False),
-        ("is_superuser", False, False),
-    ]
-]
+from django.core.management import BaseCommand, CommandError
+
+from accounts.importers import (
+    KEY_FIELD_NAMES,
+    BulkUserImporter,
+    ImportCheckpoint,
+    iter_user_chunks,
+    read_workbook,
+)
+
+# The options of the streaming mode only, unset by default
+STREAM_OPTIONS = ["workers", "checkpoint", "resume"]
 
 
 class Command(BaseCommand):
@@ -28,7 +18,9 @@ class Command(BaseCommand):
     A command for bulk creating/updating the User objects.
 
     The data for the users to be inserted into database are taken from Excel workbook
-    by using Pandas dataframes.
+    by using Pandas dataframes. The users are upserted in batches, see
+    `BulkUserImporter`, either from the whole sheet at once or, in streaming mode,
+    chunk by chunk.
     """
 
     help = (
@@ -41,12 +33,14 @@ class Command(BaseCommand):
         parser.add_argument(
             "workbook",
             type=str,
-            help="Path to the user data Microsoft Excel workbook.",
+            help=(
+                "Path to the user data Microsoft Excel workbook. In streaming "
+                "mode, CSV and Parquet files are accepted as well."
+            ),
         )
         parser.add_argument(
             "-s",
             "--sheet",
-            nargs=1,
             type=str,
             required=False,
             default=get_user_model()._meta.label_lower,
@@ -56,6 +50,65 @@ class Command(BaseCommand):
                 "'{}'.".format(get_user_model()._meta.label_lower)
             ),
         )
+        parser.add_argument(
+            "--stream",
+            action="store_true",
+            help=(
+                "Read the data file in chunks and import each chunk in its own "
+                "transaction, keeping the memory usage independent of the number "
+                "of rows. By default, the whole sheet is validated up front and "
+                "imported within a single transaction."
+            ),
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=None,
+            help=(
+                "Number of users read and written to the database at once. "
+                "Defaults to 1000."
+            ),
+        )
+        parser.add_argument(
+            "--key",
+            choices=KEY_FIELD_NAMES,
+            default=None,
+            help="Field the existing users are matched on. Defaults to 'id'.",
+        )
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=None,
+            help=(
+                "Number of processes hashing the passwords. "
+                "Defaults to the number of CPUs."
+            ),
+        )
+
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help=(
+                "Number of processes importing the chunks in streaming mode, "
+                "each with its own database connection. Defaults to 1."
+            ),
+        )
+        parser.add_argument(
+            "--checkpoint",
+            type=str,
+            default=None,
+            help=(
+                "Path to the checkpoint file saved after each committed chunk in "
+                "streaming mode. Defaults to the data file path suffixed with "
+                "'.checkpoint.json'."
+            ),
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Resume the interrupted streaming import from the checkpoint.",
+        )
 
     def handle(self, *args, **options):
         """Define what does the command do."""
@@ -63,68 +116,88 @@ class Command(BaseCommand):
         workbook_path = options["workbook"]
         sheet = options["sheet"]
 
-        # If the workbook has more than a single sheet, check if it also
-        # has the sheet specified as the function parameter.
-        workbook_sheets = pd.ExcelFile(workbook_path).sheet_names
-
-        if len(workbook_sheets) > 1:
-            if sheet not in workbook_sheets:
-                raise ValueError(
-                    "Sheet '{}' not found in the workbook '{}'.".format(
-                        sheet,
-                        workbook_path,
-                    )
-                )
-        else:
-            # The only sheet is taken as the user-data sheet
-            sheet = workbook_sheets[0]
+        self.check_options(options)
+        options["batch_size"] = options["batch_size"] or 1000
+        options["key"] = options["key"] or "id"
+        options["workers"] = options["workers"] or 1
+
+        if options["stream"]:
+            self.handle_stream(workbook_path, sheet, options)
+            return
 
         # Read the sheet from the workbook
-        users = pd.read_excel(workbook_path, sheet_name=sheet, dtype="object")
-
-        # Get the user's required fields
-        fields = [field["name"] for field in USER_FIELDS]
-
-        # Extract only the required data
-        try:
-            users = users[fields]
-        except KeyError:
-            raise KeyError(
-                "The following columns are missing in the data sheet "
-                "'{}' of workbook '{}': {}.".format(
-                    sheet,
-                    workbook_path,
-                    ", ".join([field for field in fields if field not in users]),
-                )
+        self.handle_bulk(read_workbook(workbook_path, sheet), options)
+
+    def check_options(self, options):
+        """Reject the options which are not used in the chosen mode."""
+        if options["stream"]:
+            # The passwords are hashed by the workers themselves, if there are any
+            unused = ["processes"] if (options["workers"] or 1) > 1 else []
+            mode = "streaming mode with more than one worker"
+        else:
+            unused, mode = STREAM_OPTIONS, "bulk mode"
+
+        given = [
+            "--{}".format(name.replace("_", "-"))
+            for name in unused
+            if options[name] not in (None, False)
+        ]
+        if given:
+            raise CommandError(
+                "{} cannot be used in {}.".format(", ".join(given), mode)
             )
 
-        # Required fields
-        required_fields = [field["name"] for field in USER_FIELDS if field["required"]]
-
-        # Username and password are the required fields for each user
-        if users[required_fields].isnull().values.any():
-            raise ValueError(
-                "The following fields has to be specified for"
-                "all the users: {}.".format(", ".join(required_fields))
+    def handle_bulk(self, users, options):
+        """Create and update the users in batches."""
+        with BulkUserImporter(
+            batch_size=options["batch_size"],
+            processes=options["processes"],
+            key=options["key"],
+        ) as importer:
+            report = importer.import_users(users)
+
+        self.write_report(report)
+
+    def handle_stream(self, path, sheet, options):
+        """Create and update the users chunk by chunk."""
+        checkpoint = ImportCheckpoint(
+            options["checkpoint"] or "{}.checkpoint.json".format(path),
+            path,
+            sheet=sheet,
+            batch_size=options["batch_size"],
+            key=options["key"],
+        )
+        if options["resume"]:
+            checkpoint.load()
+
+        # The passwords are hashed by the workers themselves, if there are any
+        with BulkUserImporter(
+            batch_size=options["batch_size"],
+            processes=1 if options["workers"] > 1 else options["processes"],
+            key=options["key"],
+        ) as importer:
+            report = importer.import_stream(
+                iter_user_chunks(path, sheet, options["batch_size"]),
+                checkpoint=checkpoint,
+                workers=options["workers"],
             )
 
-        # Handle NaN or empty values in the remaining columns
-        for field in USER_FIELDS:
-            if field["default"] is not None and not field["required"]:
-                users[field["name"]] = users[field["name"]].fillna(field["default"])
-
-        # Create and/or update the users
-        for _, user in users.iterrows():
-            user = user.to_dict()
-
-            try:
-                get_user_model().objects.create_user(**user)
-            except IntegrityError:
-                self.stdout.write(
-                    self.style.ERROR(
-                        (
-                            "Database integrity problems occurred when creating user "
-                            "'{}'. Check whether this name has been already saved."
-                        ).format(user["username"])
-                    )
+        checkpoint.delete()
+
+        self.write_report(report)
+
+    def write_report(self, report):
+        """Write the row errors and the summary of the import."""
+        for row, message in sorted(report.errors):
+            self.stdout.write(self.style.ERROR("Row {}: {}".format(row, message)))
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Created: {}, updated: {}, unchanged: {}, failed: {}.".format(
+                    report.created,
+                    report.updated,
+                    report.unchanged,
+                    report.failed,
                 )
+            )
+        )
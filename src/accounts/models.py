@@ -1,6 +1,12 @@
 from django.contrib.auth.models import AbstractUser
+from django.dispatch import Signal
 from django.utils.text import capfirst
 
+# Sent after the users are created or updated in bulk, e.g. by `load_users`,
+# which sends no `post_save` signals, with the `pks` of the users and the
+# `update_fields` (None if any user was created).
+post_bulk_save = Signal()
+
 
 class User(AbstractUser):
     """
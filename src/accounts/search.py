@@ -0,0 +1,13 @@
+from django.dispatch import receiver
+
+from extras.search import search_index
+
+from .models import User, post_bulk_save
+
+search_index.register(User, ["username", "first_name", "last_name", "email"])
+
+
+@receiver(post_bulk_save, sender=User)
+def reindex_bulk_saved_users(sender, pks, **kwargs):
+    """Reindex the users saved in bulk, along with their employees and authors."""
+    search_index.reindex_bulk_saved(User.objects.filter(pk__in=pks))
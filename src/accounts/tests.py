@@ -0,0 +1,112 @@
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from attainments.models import Author, AuthorAlias
+from employees.models import Employee
+from extras.search import search_index
+from extras.text import get_name_key
+
+import pandas as pd
+
+from .importers import FIELD_NAMES, BulkUserImporter
+from .models import User
+
+
+class BulkUserImporterTests(TestCase):
+    """A class to represent the tests of the bulk import of the users."""
+
+    def make_users(self, *rows):
+        return pd.DataFrame(
+            [
+                {"password": "hasło", "email": "", "is_staff": False, **row}
+                for row in rows
+            ],
+            columns=FIELD_NAMES,
+            dtype="object",
+        )
+
+    def import_users(self, *rows):
+        with BulkUserImporter(processes=1) as importer:
+            report = importer.import_users(self.make_users(*rows))
+        self.assertEqual(report.errors, [])
+
+    def test_imported_users_are_indexed(self):
+        self.import_users(
+            {"id": 1, "username": "jnowak", "first_name": "Jan", "last_name": "Nowak"}
+        )
+        self.assertQuerySetEqual(
+            search_index.filter(User.objects.all(), "jan nowak"),
+            User.objects.filter(pk=1),
+        )
+
+    def test_renamed_users_are_reindexed(self):
+        user = User.objects.create_user(
+            "jnowak", id=1, first_name="Jan", last_name="Nowak"
+        )
+        employee = Employee.objects.create(user=user)
+        author = Author.objects.create(employee=employee, alias="Nowak J.")
+
+        self.import_users(
+            {"id": 1, "username": "jnowak", "first_name": "Jan", "last_name": "Kowal"}
+        )
+        self.assertQuerySetEqual(
+            search_index.filter(Employee.objects.all(), "kowal"), [employee]
+        )
+        self.assertQuerySetEqual(
+            search_index.filter(Author.objects.all(), "kowal"), [author]
+        )
+        self.assertEqual(
+            set(AuthorAlias.objects.values_list("key", flat=True)),
+            {get_name_key("Kowal J."), get_name_key("Nowak J.")},
+        )
+
+    def test_stream_chunks_are_matched_against_database(self):
+        chunks = [
+            self.make_users({"id": 1, "username": "jnowak", "last_name": "Nowak"}),
+            self.make_users({"id": 1, "username": "jnowak", "last_name": "Kowal"}),
+            self.make_users({"id": 2, "username": "jnowak", "last_name": "Nowak"}),
+        ]
+        with BulkUserImporter(processes=1) as importer:
+            report = importer.import_stream(chunks)
+
+        self.assertEqual((report.created, report.updated, report.failed), (1, 1, 1))
+        self.assertEqual(
+            list(User.objects.values_list("id", "username", "last_name")),
+            [(1, "jnowak", "Kowal")],
+        )
+
+
+class LoadUsersTests(TestCase):
+    """A class to represent the tests of the load_users command."""
+
+    def load_users(self, last_name):
+        with tempfile.TemporaryDirectory() as directory:
+            path = str(Path(directory) / "users.xlsx")
+            users = pd.DataFrame(
+                [[1, "jnowak", "hasło", "Jan", last_name, "", False, False]],
+                columns=FIELD_NAMES,
+            )
+            users.to_excel(path, sheet_name="accounts.user", index=False)
+
+            stdout = StringIO()
+            call_command("load_users", path, processes=1, stdout=stdout)
+        return stdout.getvalue().strip()
+
+    def test_users_are_upserted(self):
+        self.assertEqual(
+            self.load_users("Nowak"),
+            "Created: 1, updated: 0, unchanged: 0, failed: 0.",
+        )
+        self.assertEqual(
+            self.load_users("Nowak"),
+            "Created: 0, updated: 0, unchanged: 1, failed: 0.",
+        )
+        self.assertEqual(
+            self.load_users("Kowal"),
+            "Created: 0, updated: 1, unchanged: 0, failed: 0.",
+        )
+        self.assertEqual(User.objects.get(pk=1).last_name, "Kowal")
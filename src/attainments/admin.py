@@ -1 +1,5 @@
 from .contributions.admin import AuthorAdmin, ContributionAdmin
+from .elements.articles.admin import ArticleAdmin
+from .elements.grants.admin import GrantAdmin
+from .elements.patents.admin import PatentAdmin
+from .evaluation.admin import DepartmentEvaluationAdmin, DisciplineEvaluationAdmin
@@ -5,3 +5,9 @@ class AttainmentsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "attainments"
     verbose_name = "Dorobek"
+
+    def ready(self):
+        from .contributions import search as contribution_search
+        from .contributions import signals as contribution_signals
+        from .elements import search as element_search
+        from .evaluation import signals as evaluation_signals
@@ -1,11 +1,19 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import PermissionDenied
+from django.shortcuts import get_object_or_404, redirect
+from django.template.response import TemplateResponse
+from django.urls import path, reverse
+from django.utils.html import format_html
 
-from .forms import ContributionAdminForm
-from .models import Author, Contribution
+from extras.admin import IndexedSearchMixin
+
+from .forms import ContributionAdminForm, ElementContributionFormSet
+from .models import ELEMENT_MODEL_NAMES, Author, Contribution
 
 
 @admin.register(Author)
-class AuthorAdmin(admin.ModelAdmin):
+class AuthorAdmin(IndexedSearchMixin, admin.ModelAdmin):
     """Admin options for the Author model."""
 
     fieldsets = [
@@ -16,15 +24,17 @@ class AuthorAdmin(admin.ModelAdmin):
     autocomplete_fields = ["employee"]
 
     list_display = ["id", "employee", "alias"]
+    list_select_related = ["employee__user"]
     search_fields = [
         "employee__user__last_name",
         "employee__user__first_name",
         "alias",
     ]
+    ordering = ["id"]
 
 
 @admin.register(Contribution)
-class ContributionAdmin(admin.ModelAdmin):
+class ContributionAdmin(IndexedSearchMixin, admin.ModelAdmin):
     """Admin options for the Contribution model."""
 
     form = ContributionAdminForm
@@ -46,9 +56,107 @@ class ContributionAdmin(admin.ModelAdmin):
     readonly_fields = ["id"]
     autocomplete_fields = ["author"]
     radio_fields = {"content_type": admin.VERTICAL}
-    list_display = ["id", "author", "order", "percentage", "by_employee"]
+    list_display = [
+        "id",
+        "author",
+        "object_preview",
+        "order",
+        "percentage",
+        "by_employee",
+        "element_link",
+    ]
+    list_select_related = ["author"]
     search_fields = ["author__alias"]
+    search_index_path = "author"
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_content_objects()
+
+    def get_urls(self):
+        return [
+            path(
+                "element/<int:content_type_id>/<int:object_id>/",
+                self.admin_site.admin_view(self.element_view),
+                name="attainments_contribution_element",
+            ),
+            *super().get_urls(),
+        ]
+
+    def element_view(self, request, content_type_id, object_id):
+        """Edit all the contributions to a single element at once."""
+        content_type = get_object_or_404(
+            ContentType,
+            pk=content_type_id,
+            app_label="attainments",
+            model__in=ELEMENT_MODEL_NAMES,
+        )
+        model = content_type.model_class()
+        element = get_object_or_404(model, pk=object_id)
+
+        if not (
+            self.has_change_permission(request)
+            and self.admin_site.get_model_admin(model).has_change_permission(
+                request, element
+            )
+        ):
+            raise PermissionDenied
+
+        contributions = Contribution.objects.filter(
+            content_type=content_type,
+            object_id=object_id,
+        ).order_by("order")
+
+        formset = ElementContributionFormSet(
+            request.POST or None,
+            initial=list(contributions.values("author", "order", "percentage")),
+        )
+
+        if request.method == "POST" and formset.is_valid():
+            created, updated, deleted = Contribution.objects.save_element(
+                content_type,
+                object_id,
+                formset.get_entries(),
+            )
+            self.message_user(
+                request,
+                message=(
+                    f"Zapisano autorów elementu: dodano {created}, "
+                    f"zmieniono {updated}, usunięto {deleted}."
+                ),
+                level=messages.SUCCESS,
+            )
+            return redirect(request.path)
+
+        context = {
+            **self.admin_site.each_context(request),
+            "opts": self.model._meta,
+            "title": "Autorzy elementu typu {} (ID={})".format(
+                content_type.name,
+                element.pk,
+            ),
+            "formset": formset,
+            "media": self.media + formset.media,
+        }
+        return TemplateResponse(
+            request,
+            "admin/attainments/contribution/element.html",
+            context,
+        )
+
+    @admin.display(description="Autorzy elementu")
+    def element_link(self, obj):
+        return format_html(
+            '<a href="{}">Edytuj</a>',
+            reverse(
+                "admin:attainments_contribution_element",
+                args=(obj.content_type_id, obj.object_id),
+            ),
+        )
+
+    @admin.display(description="Podgląd obiektu")
+    def object_preview(self, obj):
+        return obj.content_object
 
     @admin.display(description="Pracownik", boolean=True)
     def by_employee(self, obj):
-        return obj.author.employee is not None
+        return obj.author.employee_id is not None
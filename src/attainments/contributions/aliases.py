@@ -0,0 +1,146 @@
+import math
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+from extras.text import get_name_key
+
+from .models import AuthorAlias
+
+# Minimum similarity of the keys of the names matched approximately
+SIMILARITY_THRESHOLD = 0.6
+
+
+def get_trigrams(key):
+    """Return the set of the trigrams of the key, padded with the spaces."""
+    key = "  {} ".format(key)
+    return {"".join(trigram) for trigram in zip(key, key[1:], key[2:])}
+
+
+@dataclass
+class AuthorMatch:
+    """A class to represent the result of matching a name to the authors."""
+
+    name: str
+    key: str
+    exact: bool = False
+    similarity: float = 0.0
+    # The (author ID, employee ID) pairs the name matches; the author ID is None
+    # for the employees with no authors yet
+    candidates: list = field(default_factory=list)
+
+    @property
+    def ambiguous(self):
+        return len(self.candidates) > 1
+
+
+class AuthorMatcher:
+    """
+    A class to represent the matcher of the names against the authors.
+
+    The whole alias index, see `AuthorAlias`, is loaded with a single query,
+    hence a matcher is meant to resolve the names of a whole import at once.
+    The names are matched on the exact keys first; the remaining ones are
+    matched on the most similar keys, by the Jaccard similarity of their
+    trigrams, looked up in the inverted index of the trigrams.
+    """
+
+    def __init__(self, threshold=SIMILARITY_THRESHOLD):
+        self.threshold = threshold
+        self.candidates = defaultdict(set)
+        for key, author_id, employee_id in AuthorAlias.objects.values_list(
+            "key", "author", "employee"
+        ).iterator():
+            self.candidates[key].add((author_id, employee_id))
+
+        # The employees matched by their authors are not repeated on their own
+        for key, candidates in self.candidates.items():
+            employee_ids = {
+                employee_id for author_id, employee_id in candidates if author_id
+            }
+            self.candidates[key] = sorted(
+                (
+                    (author_id, employee_id)
+                    for author_id, employee_id in candidates
+                    if author_id or employee_id not in employee_ids
+                ),
+                key=lambda candidate: (candidate[0] is None, candidate),
+            )
+
+        self.trigrams = {key: get_trigrams(key) for key in self.candidates}
+        self.keys_by_trigram = defaultdict(set)
+        for key, trigrams in self.trigrams.items():
+            for trigram in trigrams:
+                self.keys_by_trigram[trigram].add(key)
+
+    def add(self, key, author_id, employee_id=None):
+        """Add the author created after the matcher was loaded to its index."""
+        candidates = self.candidates.get(key, [])
+        if key not in self.candidates:
+            self.trigrams[key] = get_trigrams(key)
+            for trigram in self.trigrams[key]:
+                self.keys_by_trigram[trigram].add(key)
+
+        # The author replaces its employee matched on its own
+        self.candidates[key] = [
+            (author_id, employee_id),
+            *(
+                candidate
+                for candidate in candidates
+                if candidate[0] is not None or candidate[1] != employee_id
+            ),
+        ]
+
+    def find_similar(self, key):
+        """Return the most similar key and the similarity, or (None, 0)."""
+        trigrams = get_trigrams(key)
+
+        # Any key similar enough shares at least one of the rarest trigrams
+        # of the key (prefix filtering), hence the frequent trigrams, e.g. of
+        # the initials, are not looked up at all
+        prefix_length = len(trigrams) - math.ceil(self.threshold * len(trigrams)) + 1
+        rarest_trigrams = sorted(
+            trigrams,
+            key=lambda trigram: len(self.keys_by_trigram.get(trigram, ())),
+        )[:prefix_length]
+        other_keys = set().union(
+            *(self.keys_by_trigram.get(trigram, ()) for trigram in rarest_trigrams)
+        )
+
+        best_key, best_similarity = None, 0.0
+        for other_key in sorted(other_keys):
+            other_trigrams = self.trigrams[other_key]
+            shared = len(trigrams & other_trigrams)
+            similarity = shared / (len(trigrams) + len(other_trigrams) - shared)
+            if similarity > best_similarity:
+                best_key, best_similarity = other_key, similarity
+        return best_key, best_similarity
+
+    def match(self, names):
+        """Match the names, returning the list of the AuthorMatch objects."""
+        matches = []
+        similar_keys = {}
+
+        for name in names:
+            key = get_name_key(name)
+            match = AuthorMatch(name=name, key=key)
+
+            if key in self.candidates:
+                match.exact = True
+                match.similarity = 1.0
+                match.candidates = list(self.candidates[key])
+            elif key:
+                if key not in similar_keys:
+                    similar_keys[key] = self.find_similar(key)
+                similar_key, similarity = similar_keys[key]
+                if similarity >= self.threshold:
+                    match.similarity = similarity
+                    match.candidates = list(self.candidates[similar_key])
+
+            matches.append(match)
+
+        return matches
+
+
+def match_authors(names, threshold=SIMILARITY_THRESHOLD):
+    """Match the names against the authors, see `AuthorMatcher`."""
+    return AuthorMatcher(threshold).match(names)
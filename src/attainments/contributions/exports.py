@@ -0,0 +1,45 @@
+from django.contrib.contenttypes.models import ContentType
+
+from extras.exports import TableExport
+
+from .admin import ContributionAdmin
+from .models import Contribution
+
+
+def get_element_type(contribution):
+    # The content types are cached by their manager, hence no query is made
+    content_type = ContentType.objects.get_for_id(contribution.content_type_id)
+    return content_type.model_class()._meta.verbose_name
+
+
+class ContributionExport(TableExport):
+    """A class to represent the export of the Contribution objects."""
+
+    name = "contributions"
+    columns = [
+        ("ID", "id"),
+        (Contribution._meta.get_field("content_type").verbose_name, get_element_type),
+        (Contribution._meta.get_field("object_id").verbose_name, "object_id"),
+        ("element", "content_object"),
+        (Contribution._meta.get_field("order").verbose_name, "order"),
+        (Contribution._meta.get_field("author").verbose_name, "author"),
+        ("ID pracownika", "author.employee_id"),
+        (Contribution._meta.get_field("percentage").verbose_name, "percentage"),
+    ]
+
+    def __init__(self, in_evaluation=None):
+        self.in_evaluation = in_evaluation
+
+    def get_queryset(self):
+        # The joins are the same as on the admin changelist; the elements are
+        # prefetched for each chunk of the iterator
+        queryset = (
+            Contribution.objects.select_related(*ContributionAdmin.list_select_related)
+            .with_content_objects()
+            .order_by("id")
+        )
+        if self.in_evaluation is not None:
+            queryset = queryset.filter(
+                author__employee__in_evaluation=self.in_evaluation
+            )
+        return queryset
@@ -1,9 +1,18 @@
 from django import forms
+from django.contrib import admin
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.contrib.contenttypes.forms import BaseGenericInlineFormSet
 from django.contrib.contenttypes.models import ContentType
+from django.utils.text import capfirst
 
 from extras.forms import ReadOnlyField
 
-from .models import Contribution
+from .models import (
+    ELEMENT_MODEL_NAMES,
+    Author,
+    Contribution,
+    validate_element_contributions,
+)
 
 
 class ContributionAdminForm(forms.ModelForm):
@@ -18,7 +27,10 @@ class ContributionAdminForm(forms.ModelForm):
             return obj.name
 
     content_type = ContentTypeModelChoiceField(
-        queryset=ContentType.objects.filter(app_label="attainments"),
+        queryset=ContentType.objects.filter(
+            app_label="attainments",
+            model__in=ELEMENT_MODEL_NAMES,
+        ),
         label="Rodzaj elementu",
         required=True,
         widget=forms.widgets.RadioSelect(attrs={"class": "radiolist"}),
@@ -31,3 +43,66 @@ class ContributionAdminForm(forms.ModelForm):
         self.fields["object_preview"].initial = (
             str(self.instance.content_object) if self.instance.pk else "-"
         )
+
+
+class ContributionInlineFormSet(BaseGenericInlineFormSet):
+    """
+    A class to represent the inline formset of the contributions to an element.
+
+    The authors of the contributions, selected along with them, are passed to
+    the autocomplete widgets, see `PrefetchedAutocompleteSelect`, so that they
+    are rendered with no queries.
+    """
+
+    def _construct_form(self, i, **kwargs):
+        form = super()._construct_form(i, **kwargs)
+        if form.instance.author_id is not None:
+            widget = form.fields["author"].widget
+            # The widget is wrapped along with the links to the related objects
+            getattr(widget, "widget", widget).objects = {
+                str(form.instance.author_id): form.instance.author
+            }
+        return form
+
+
+class ElementContributionForm(forms.Form):
+    """A class to represent a form of a single contribution to an element."""
+
+    author = forms.ModelChoiceField(
+        queryset=Author.objects.all(),
+        label=capfirst(Author._meta.verbose_name),
+        widget=AutocompleteSelect(Contribution._meta.get_field("author"), admin.site),
+    )
+    order = forms.IntegerField(
+        label=capfirst(Contribution._meta.get_field("order").verbose_name),
+        min_value=1,
+    )
+    percentage = forms.IntegerField(
+        label=capfirst(Contribution._meta.get_field("percentage").verbose_name),
+        min_value=0,
+        max_value=100,
+    )
+
+
+class BaseElementContributionFormSet(forms.BaseFormSet):
+    """A class to represent a formset of all the contributions to an element."""
+
+    def get_entries(self):
+        return [
+            form.cleaned_data
+            for form in self.forms
+            if form.cleaned_data and not self._should_delete_form(form)
+        ]
+
+    def clean(self):
+        if any(self.errors):
+            return
+        validate_element_contributions(self.get_entries())
+
+
+ElementContributionFormSet = forms.formset_factory(
+    ElementContributionForm,
+    formset=BaseElementContributionFormSet,
+    extra=1,
+    can_delete=True,
+)
@@ -1,10 +1,17 @@
+from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
+from django.dispatch import Signal
 
 from employees.models import Employee
+from extras.text import get_name_key
+from units.models import Department, Faculty, University
+
+# The names of the models of the elements the contributions can be made to
+ELEMENT_MODEL_NAMES = ["article", "patent", "grant"]
 
 
 class Author(models.Model):
@@ -41,14 +48,357 @@ class Author(models.Model):
         if self.employee and not self.alias:
             self.alias = self.employee.user.get_short_name()
 
+    def is_employee(self):
+        return self.employee is not None
+
     def is_employed(self):
-        if self.is_employee():
-            return hasattr(self.employee, "employment")
+        return self.is_employee() and hasattr(self.employee, "employment")
 
     @property
     def department(self):
-        if self.is_employed():
-            return self.employee.employment.department
+        # The department is taken from the materialized affiliation, hence
+        # `select_related("affiliation__department")` avoids any extra queries.
+        affiliation = getattr(self, "affiliation", None)
+        if affiliation:
+            return affiliation.department
+
+
+class AuthorAffiliationManager(models.Manager):
+    """A class to represent the manager of the AuthorAffiliation objects."""
+
+    def refresh(self, authors):
+        """
+        Recompute the affiliations of the authors given as a queryset.
+
+        The units are read with a single query walking the employee's employment,
+        department and faculty, and the affiliations are rewritten in bulk.
+        """
+        prefix = "employee__employment__department"
+        affiliations = [
+            self.model(
+                author_id=author["id"],
+                employee_id=author["employee"],
+                department_id=author[prefix],
+                faculty_id=author[f"{prefix}__faculty"],
+                university_id=author[f"{prefix}__faculty__university"],
+            )
+            for author in authors.values(
+                "id",
+                "employee",
+                prefix,
+                f"{prefix}__faculty",
+                f"{prefix}__faculty__university",
+            )
+        ]
+
+        with transaction.atomic():
+            self.filter(
+                author__in=[affiliation.author_id for affiliation in affiliations]
+            ).delete()
+            self.bulk_create(affiliations)
+
+
+class AuthorAffiliation(models.Model):
+    """
+    A class to represent the materialized affiliations of the Author objects.
+
+    Maps the authors onto the employees and the units they are employed in, so that
+    the contributions can be grouped by unit with a single join. The objects are kept
+    up to date by the signals, see `signals.py`.
+    """
+
+    author = models.OneToOneField(
+        to=Author,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        verbose_name=Author._meta.verbose_name,
+        related_name="affiliation",
+    )
+    employee = models.ForeignKey(
+        to=Employee,
+        on_delete=models.SET_NULL,
+        verbose_name=Employee._meta.verbose_name,
+        related_name="author_affiliations",
+        blank=True,
+        null=True,
+    )
+    department = models.ForeignKey(
+        to=Department,
+        on_delete=models.SET_NULL,
+        verbose_name=Department._meta.verbose_name,
+        related_name="author_affiliations",
+        blank=True,
+        null=True,
+    )
+    faculty = models.ForeignKey(
+        to=Faculty,
+        on_delete=models.SET_NULL,
+        verbose_name=Faculty._meta.verbose_name,
+        related_name="author_affiliations",
+        blank=True,
+        null=True,
+    )
+    university = models.ForeignKey(
+        to=University,
+        on_delete=models.SET_NULL,
+        verbose_name=University._meta.verbose_name,
+        related_name="author_affiliations",
+        blank=True,
+        null=True,
+    )
+
+    objects = AuthorAffiliationManager()
+
+    class Meta:
+        verbose_name = "afiliacja autora"
+        verbose_name_plural = "afiliacje autorów"
+
+    def __str__(self):
+        return str(self.author)
+
+
+class AuthorAliasManager(models.Manager):
+    """A class to represent the manager of the AuthorAlias objects."""
+
+    def refresh(self, authors=None, employees=None):
+        """
+        Recompute the alias keys of the authors and employees given as querysets.
+
+        The keys of an author are derived from its alias and from the short
+        name of its employee, see `User.get_short_name()`; the keys of an
+        employee are derived from the short name only. The names are read with
+        a query per model and the keys are rewritten in bulk.
+        """
+        aliases = []
+
+        if authors is not None:
+            authors = list(
+                authors.values_list(
+                    "id",
+                    "employee",
+                    "alias",
+                    "employee__user__first_name",
+                    "employee__user__last_name",
+                )
+            )
+            for author_id, employee_id, alias, first_name, last_name in authors:
+                names = {alias}
+                if employee_id is not None:
+                    names.add(get_short_name(first_name, last_name))
+                aliases.extend(
+                    self.model(key=key, author_id=author_id, employee_id=employee_id)
+                    for key in {get_name_key(name)[:255] for name in names} - {""}
+                )
+
+        if employees is not None:
+            employees = list(
+                employees.values_list("id", "user__first_name", "user__last_name")
+            )
+            for employee_id, first_name, last_name in employees:
+                key = get_name_key(get_short_name(first_name, last_name))[:255]
+                if key:
+                    aliases.append(self.model(key=key, employee_id=employee_id))
+
+        with transaction.atomic():
+            if authors is not None:
+                self.filter(author__in=[author[0] for author in authors]).delete()
+            if employees is not None:
+                self.filter(
+                    author=None,
+                    employee__in=[employee[0] for employee in employees],
+                ).delete()
+            self.bulk_create(aliases)
+
+
+def get_short_name(first_name, last_name):
+    """Return the short name of the user, as `User.get_short_name()` does."""
+    user = get_user_model()(first_name=first_name or "", last_name=last_name or "")
+    return user.get_short_name()
+
+
+class AuthorAlias(models.Model):
+    """
+    A class to represent the normalized keys of the names of the authors.
+
+    The keys are folded and consist of the initials followed by the last name,
+    see `extras.text.get_name_key()`, so that e.g. "J. Kowalski" and "Jan
+    Kowalski" share the key "j kowalski". The employees are indexed as well,
+    even if they have no authors yet. The objects are kept up to date by the
+    signals, see `signals.py`, and used to match the names, see `aliases.py`.
+    """
+
+    key = models.CharField(verbose_name="klucz", max_length=255, db_index=True)
+    author = models.ForeignKey(
+        to=Author,
+        on_delete=models.CASCADE,
+        verbose_name=Author._meta.verbose_name,
+        related_name="alias_keys",
+        blank=True,
+        null=True,
+    )
+    employee = models.ForeignKey(
+        to=Employee,
+        on_delete=models.CASCADE,
+        verbose_name=Employee._meta.verbose_name,
+        related_name="alias_keys",
+        blank=True,
+        null=True,
+    )
+
+    objects = AuthorAliasManager()
+
+    class Meta:
+        verbose_name = "klucz aliasu"
+        verbose_name_plural = "klucze aliasów"
+
+    def __str__(self):
+        return self.key
+
+
+def validate_element_contributions(entries):
+    """
+    Validate the complete list of the contributions to a single element.
+
+    The `entries` are the mappings with the "author", "order" and "percentage"
+    keys. The orders have to run from 1 to the number of the authors, each author
+    can be listed once only and the percentages have to sum up to 100.
+    """
+    if not entries:
+        return
+
+    orders = sorted(entry["order"] for entry in entries)
+    if orders != list(range(1, len(entries) + 1)):
+        raise ValidationError(
+            "Numery autorów muszą tworzyć ciąg kolejnych liczb, począwszy od 1."
+        )
+
+    author_ids = [getattr(entry["author"], "pk", entry["author"]) for entry in entries]
+    if len(set(author_ids)) != len(author_ids):
+        raise ValidationError("Każdy autor może zostać wskazany tylko raz.")
+
+    if sum(entry["percentage"] for entry in entries) != 100:
+        raise ValidationError("Udziały autorów muszą sumować się do 100%.")
+
+
+# Sent around the bulk writes of `ContributionQuerySet.save_element()`, which
+# send no `pre_save`/`post_save` signals, with the `content_type` and `object_id`
+# of the element. The deleted contributions are sent `pre_delete`/`post_delete`.
+pre_save_element = Signal()
+post_save_element = Signal()
+
+
+class ContributionQuerySet(models.QuerySet):
+    """A class to represent the querysets of the Contribution objects."""
+
+    def group_by_unit(self, unit="department"):
+        """
+        Count the contributions and sum their percentages per unit.
+
+        The `unit` is one of "department", "faculty" or "university".
+        """
+        return (
+            self.values(f"author__affiliation__{unit}")
+            .annotate(
+                contributions=models.Count("id"),
+                percentage=models.Sum("percentage"),
+            )
+            .order_by(f"author__affiliation__{unit}")
+        )
+
+    def with_content_objects(self):
+        """
+        Resolve the related objects of the contributions in bulk.
+
+        The contributions are grouped by content type and the objects of each
+        type are fetched with a single query, instead of a query per contribution.
+        """
+        return self.prefetch_related("content_object")
+
+    def save_element(self, content_type, object_id, entries):
+        """
+        Save the complete ordered list of the contributions to a single element.
+
+        The `entries` are validated with `validate_element_contributions()` and
+        diffed by author against the existing contributions, which are fetched
+        with a single query. The contributions are then created, updated and
+        deleted in bulk within a single transaction. Returns the numbers of
+        the created, updated and deleted contributions.
+        """
+        entries = list(entries)
+        validate_element_contributions(entries)
+
+        entries_by_author_id = {
+            getattr(entry["author"], "pk", entry["author"]): entry for entry in entries
+        }
+
+        with transaction.atomic():
+            contributions, deleted_ids = {}, []
+            for contribution in self.select_for_update().filter(
+                content_type=content_type,
+                object_id=object_id,
+            ):
+                # The repeated contributions of an author, if saved elsewhere,
+                # are deleted along with those of the authors no longer listed
+                if (
+                    contribution.author_id in entries_by_author_id
+                    and contribution.author_id not in contributions
+                ):
+                    contributions[contribution.author_id] = contribution
+                else:
+                    deleted_ids.append(contribution.pk)
+            created, updated = [], []
+
+            for author_id, entry in entries_by_author_id.items():
+                contribution = contributions.get(author_id)
+
+                if contribution is None:
+                    created.append(
+                        self.model(
+                            content_type=content_type,
+                            object_id=object_id,
+                            author_id=author_id,
+                            order=entry["order"],
+                            percentage=entry["percentage"],
+                        )
+                    )
+                elif (contribution.order, contribution.percentage) != (
+                    entry["order"],
+                    entry["percentage"],
+                ):
+                    contribution.order = entry["order"]
+                    contribution.percentage = entry["percentage"]
+                    updated.append(contribution)
+
+            if deleted_ids:
+                self.filter(pk__in=deleted_ids).delete()
+
+            signal_kwargs = {
+                "sender": self.model,
+                "content_type": content_type,
+                "object_id": object_id,
+            }
+            pre_save_element.send(**signal_kwargs)
+
+            if updated:
+                # The orders of an element are unique, so the updated
+                # contributions are moved out of the way before being reordered.
+                offset = max(
+                    [contribution.order for contribution in contributions.values()]
+                    + [len(entries)]
+                )
+                for contribution in updated:
+                    contribution.order += offset
+                self.bulk_update(updated, ["order", "percentage"])
+
+                for contribution in updated:
+                    contribution.order -= offset
+                self.bulk_update(updated, ["order"])
+
+            self.bulk_create(created)
+
+            post_save_element.send(**signal_kwargs)
+
+        return len(created), len(updated), len(deleted_ids)
 
 
 class Contribution(models.Model):
@@ -79,13 +429,31 @@ class Contribution(models.Model):
         default=0,
     )
 
+    objects = ContributionQuerySet.as_manager()
+
     class Meta:
         verbose_name = "udział"
         verbose_name_plural = "udziały"
+        constraints = [
+            # Also serves as the index of the authors of an element in order
+            models.UniqueConstraint(
+                fields=["content_type", "object_id", "order"],
+                name="unique_contribution_element_order",
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["author", "content_type", "object_id"],
+                name="contribution_author_element",
+            )
+        ]
 
     def __str__(self):
+        # The content types are cached by their manager, hence no query is made
+        # contrary to accessing the `content_type` foreign key.
+        content_type = ContentType.objects.get_for_id(self.content_type_id)
         return (
             f"{self.author}, w elemencie typu "
-            f"{self.content_type.model_class()._meta.verbose_name} "
+            f"{content_type.model_class()._meta.verbose_name} "
             f"(ID={self.object_id})"
         )
@@ -0,0 +1,8 @@
+from extras.search import search_index
+
+from .models import Author
+
+search_index.register(
+    Author,
+    ["alias", "employee__user__first_name", "employee__user__last_name"],
+)
@@ -0,0 +1,147 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from accounts.models import post_bulk_save
+from employees.models import Employee, Employment
+from units.models import Department, Faculty
+
+from .models import Author, AuthorAffiliation, AuthorAlias
+
+# The affiliations of the authors are recomputed whenever any object along
+# the Author -> Employee -> Employment -> Department -> Faculty path changes.
+# The deleted objects null the foreign keys with SET_NULL, which sends no
+# signals, hence the affected authors are collected before the deletion.
+
+
+@receiver(post_save, sender=Author)
+def refresh_author_affiliation(sender, instance, **kwargs):
+    """Refresh the affiliation of the saved sender Author instance."""
+    AuthorAffiliation.objects.refresh(Author.objects.filter(pk=instance.pk))
+
+
+@receiver(pre_save, sender=Employment)
+def collect_employment_employee(sender, instance, update_fields=None, **kwargs):
+    """Collect the employee of the sender Employment instance before the change."""
+    instance._previous_employee_id = None
+    if instance.pk is not None and (
+        update_fields is None or "employee" in update_fields
+    ):
+        instance._previous_employee_id = (
+            Employment.objects.filter(pk=instance.pk)
+            .values_list("employee_id", flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=Employment)
+@receiver(post_delete, sender=Employment)
+def refresh_employment_affiliations(sender, instance, **kwargs):
+    """
+    Refresh the affiliations of the authors of the sender Employment instance.
+
+    The authors of the previous employee, if changed, are refreshed as well.
+    """
+    employee_ids = {
+        instance.employee_id,
+        getattr(instance, "_previous_employee_id", None),
+    }
+    AuthorAffiliation.objects.refresh(
+        Author.objects.filter(employee_id__in=employee_ids)
+    )
+
+
+@receiver(post_save, sender=Department)
+def refresh_department_affiliations(sender, instance, **kwargs):
+    """Refresh the affiliations of the authors of the sender Department instance."""
+    AuthorAffiliation.objects.refresh(
+        Author.objects.filter(employee__employment__department=instance)
+    )
+
+
+@receiver(post_save, sender=Faculty)
+def refresh_faculty_affiliations(sender, instance, **kwargs):
+    """Refresh the affiliations of the authors of the sender Faculty instance."""
+    AuthorAffiliation.objects.refresh(
+        Author.objects.filter(employee__employment__department__faculty=instance)
+    )
+
+
+@receiver(pre_delete, sender=Employee)
+def collect_employee_authors(sender, instance, **kwargs):
+    """Collect the authors of the sender Employee instance to be deleted."""
+    instance._author_ids = list(instance.author_set.values_list("id", flat=True))
+
+
+@receiver(pre_delete, sender=Department)
+def collect_department_authors(sender, instance, **kwargs):
+    """Collect the authors of the sender Department instance to be deleted."""
+    instance._author_ids = list(
+        Author.objects.filter(employee__employment__department=instance).values_list(
+            "id", flat=True
+        )
+    )
+
+
+@receiver(post_delete, sender=Employee)
+@receiver(post_delete, sender=Department)
+def refresh_deleted_affiliations(sender, instance, **kwargs):
+    """Refresh the affiliations of the authors collected before the deletion."""
+    AuthorAffiliation.objects.refresh(
+        Author.objects.filter(id__in=getattr(instance, "_author_ids", []))
+    )
+
+
+# The alias keys are recomputed whenever the names of the authors change, i.e.
+# their aliases, employees, or the names of the users of the employees.
+
+
+@receiver(post_save, sender=Author)
+def refresh_author_aliases(sender, instance, **kwargs):
+    """Refresh the alias keys of the saved sender Author instance."""
+    AuthorAlias.objects.refresh(authors=Author.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=Employee)
+def refresh_employee_aliases(sender, instance, **kwargs):
+    """Refresh the alias keys of the saved sender Employee instance."""
+    AuthorAlias.objects.refresh(
+        authors=Author.objects.filter(employee=instance),
+        employees=Employee.objects.filter(pk=instance.pk),
+    )
+
+
+@receiver(post_save, sender=get_user_model())
+def refresh_user_aliases(sender, instance, update_fields=None, **kwargs):
+    """Refresh the alias keys of the employee of the saved sender User instance."""
+    if update_fields is not None and not {"first_name", "last_name"} & set(
+        update_fields
+    ):
+        return
+
+    AuthorAlias.objects.refresh(
+        authors=Author.objects.filter(employee__user=instance),
+        employees=Employee.objects.filter(user=instance),
+    )
+
+
+@receiver(post_bulk_save, sender=get_user_model())
+def refresh_bulk_saved_user_aliases(sender, pks, update_fields=None, **kwargs):
+    """Refresh the alias keys of the employees of the users saved in bulk."""
+    if update_fields is not None and not {"first_name", "last_name"} & set(
+        update_fields
+    ):
+        return
+
+    AuthorAlias.objects.refresh(
+        authors=Author.objects.filter(employee__user__in=pks),
+        employees=Employee.objects.filter(user__in=pks),
+    )
+
+
+@receiver(post_delete, sender=Employee)
+def refresh_deleted_aliases(sender, instance, **kwargs):
+    """Refresh the alias keys of the authors collected before the deletion."""
+    AuthorAlias.objects.refresh(
+        authors=Author.objects.filter(id__in=getattr(instance, "_author_ids", []))
+    )
@@ -0,0 +1,40 @@
+from django.contrib import admin
+from django.contrib.contenttypes.admin import GenericTabularInline
+
+from extras.admin import IndexedSearchMixin
+from extras.widgets import PrefetchedAutocompleteSelect
+
+from ..contributions.forms import ContributionInlineFormSet
+from ..contributions.models import Contribution
+
+
+class ContributionInline(GenericTabularInline):
+    model = Contribution
+    formset = ContributionInlineFormSet
+    fields = ["order", "author", "percentage"]
+    autocomplete_fields = ["author"]
+    ordering = ["order"]
+    extra = 0
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related("author")
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        # The selected authors are rendered from the contributions
+        if db_field.name == "author":
+            kwargs["widget"] = PrefetchedAutocompleteSelect(
+                db_field, self.admin_site, using=kwargs.get("using")
+            )
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+
+class ElementAdmin(IndexedSearchMixin, admin.ModelAdmin):
+    """Admin options for the Element models."""
+
+    inlines = [ContributionInline]
+    readonly_fields = ["id"]
+
+    list_display = ["id", "title", "year"]
+    list_filter = ["year"]
+    search_fields = ["title"]
+    ordering = ["-id"]
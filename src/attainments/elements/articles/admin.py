@@ -0,0 +1,16 @@
+from django.contrib import admin
+
+from ..admin import ElementAdmin
+from .models import Article
+
+
+@admin.register(Article)
+class ArticleAdmin(ElementAdmin):
+    """Admin options for the Article model."""
+
+    fieldsets = [
+        (None, {"fields": ["id"]}),
+        ("Informacje podstawowe", {"fields": ["title", "year"]}),
+        ("Informacje dodatkowe", {"fields": ["journal", "volume", "pages", "doi"]}),
+    ]
+    search_fields = [*ElementAdmin.search_fields, "doi"]
@@ -0,0 +1,22 @@
+from django.db import models
+
+from ..models import Element
+
+
+class Article(Element):
+    """A class to represent the Article objects."""
+
+    journal = models.CharField(verbose_name="czasopismo", max_length=255, blank=True)
+    volume = models.CharField(verbose_name="tom", max_length=20, blank=True)
+    pages = models.CharField(verbose_name="strony", max_length=20, blank=True)
+    doi = models.CharField(
+        verbose_name="DOI",
+        max_length=255,
+        unique=True,
+        blank=True,
+        null=True,
+    )
+
+    class Meta:
+        verbose_name = "artykuł"
+        verbose_name_plural = "artykuły"
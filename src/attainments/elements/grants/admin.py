@@ -0,0 +1,16 @@
+from django.contrib import admin
+
+from ..admin import ElementAdmin
+from .models import Grant
+
+
+@admin.register(Grant)
+class GrantAdmin(ElementAdmin):
+    """Admin options for the Grant model."""
+
+    fieldsets = [
+        (None, {"fields": ["id"]}),
+        ("Informacje podstawowe", {"fields": ["title", "year"]}),
+        ("Informacje dodatkowe", {"fields": ["funder", "number"]}),
+    ]
+    search_fields = [*ElementAdmin.search_fields, "number", "funder"]
@@ -0,0 +1,18 @@
+from django.db import models
+
+from ..models import Element
+
+
+class Grant(Element):
+    """A class to represent the Grant objects."""
+
+    number = models.CharField(verbose_name="numer", max_length=50, blank=True)
+    funder = models.CharField(
+        verbose_name="instytucja finansująca",
+        max_length=255,
+        blank=True,
+    )
+
+    class Meta:
+        verbose_name = "grant"
+        verbose_name_plural = "granty"
@@ -0,0 +1,361 @@
+import time
+from dataclasses import dataclass, field
+from itertools import islice
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Max, Q
+
+from extras.search import search_index
+
+from ..contributions.aliases import SIMILARITY_THRESHOLD, AuthorMatcher
+from ..contributions.models import Author, AuthorAffiliation, AuthorAlias, Contribution
+from ..evaluation.deltas import Scope, apply_snapshots, take_snapshot
+from .articles.models import Article
+from .grants.models import Grant
+from .models import get_title_hash
+from .patents.models import Patent
+
+# The element models the records are ingested into, by record type
+ELEMENT_MODELS = {"article": Article, "patent": Patent, "grant": Grant}
+
+# The record fields saved along with the title and the year, by record type
+ELEMENT_FIELDS = {
+    "article": ["journal", "volume", "pages", "doi"],
+    "patent": ["number"],
+    "grant": ["number", "funder"],
+}
+
+
+@dataclass
+class IngestionReport:
+    """A class to represent the summary of the elements ingestion."""
+
+    read: int = 0
+    created: int = 0
+    duplicates: int = 0
+    authors_matched: int = 0
+    authors_created: int = 0
+    ambiguous: int = 0
+    contributions: int = 0
+    elapsed: float = 0.0
+    errors: list = field(default_factory=list)
+
+    @property
+    def rate(self):
+        """Return the number of the records ingested per second."""
+        return self.read / self.elapsed if self.elapsed else 0.0
+
+    def merge(self, other):
+        """Add the results of the other report to the report."""
+        self.read += other.read
+        self.created += other.created
+        self.duplicates += other.duplicates
+        self.authors_matched += other.authors_matched
+        self.authors_created += other.authors_created
+        self.ambiguous += other.ambiguous
+        self.contributions += other.contributions
+        self.elapsed += other.elapsed
+        self.errors.extend(other.errors)
+
+
+def get_percentages(count):
+    """Split the 100% evenly among the authors, the remainder going to the first."""
+    percentages = [100 // count] * count
+    for index in range(100 % count):
+        percentages[index] += 1
+    return percentages
+
+
+def bulk_create_with_ids(model, objects, batch_size, key=()):
+    """
+    Create the objects in bulk, making sure their IDs are set.
+
+    Not all the backends (e.g. MySQL) return the IDs from `bulk_create()`, in
+    which case the objects are inserted without the IDs and read back, as the
+    rows following the greatest ID before the insert. If other rows have been
+    inserted in the meantime, the objects are told apart by the `key` fields
+    (attribute names), unique among the new rows; without the key, or if the
+    rows cannot be told apart, IntegrityError is raised.
+    """
+    if not objects or connection.features.can_return_rows_from_bulk_insert:
+        return model.objects.bulk_create(objects, batch_size=batch_size)
+
+    last_id = model.objects.aggregate(Max("id"))["id__max"] or 0
+    model.objects.bulk_create(objects, batch_size=batch_size)
+    rows = list(
+        model.objects.filter(id__gt=last_id).order_by("id").values_list("id", *key)
+    )
+
+    if len(rows) == len(objects):
+        ids = [row[0] for row in rows]
+    else:
+        ids_by_key = {}
+        for row_id, *values in rows:
+            ids_by_key.setdefault(tuple(values), []).append(row_id)
+        ids = [
+            ids_by_key.get(tuple(getattr(obj, name) for name in key), [])
+            for obj in objects
+        ]
+        if not key or any(len(row_ids) != 1 for row_ids in ids):
+            raise IntegrityError(
+                "The new {} cannot be told apart from those inserted "
+                "concurrently.".format(model._meta.verbose_name_plural)
+            )
+        ids = [row_ids[0] for row_ids in ids]
+
+    for obj, pk in zip(objects, ids):
+        obj.pk = pk
+    return objects
+
+
+class ElementImporter:
+    """
+    A class to represent the importer of the elements of the attainments.
+
+    The records, e.g. parsed from a bibliographic file, see `parsers.py`, are
+    imported in chunks of `batch_size`, each within its own transaction:
+
+    - the records are deduplicated by DOI and by the hash of the title and the
+      year, against each other and against the database (a query per model);
+    - the authors are matched by name against the alias index all at once, see
+      `AuthorMatcher`, on the exact keys only unless `fuzzy` is set (as e.g.
+      "J. Kowalski" and "J. Kowalska" are similar), and the missing authors are
+      created in bulk;
+    - the elements and their ordered contributions are created in bulk, the
+      percentages being split evenly among the authors.
+
+    As `bulk_create()` sends no signals, the affiliations, the alias keys and the
+    search index of the created authors, the search index of the created
+    elements and their evaluation results are updated explicitly.
+    """
+
+    def __init__(self, batch_size=1000, fuzzy=False, threshold=SIMILARITY_THRESHOLD):
+        self.batch_size = batch_size
+        self.fuzzy = fuzzy
+        self.threshold = threshold
+        self.matcher = None
+        # The keys of the records of the committed chunks, and of the current one
+        self.seen_dois = set()
+        self.seen_title_hashes = set()
+        self.chunk_dois = set()
+        self.chunk_title_hashes = set()
+
+    def import_records(self, records, callback=None):
+        """
+        Import the records chunk by chunk, returning the merged report.
+
+        The `callback`, if given, is called with the index and the report of
+        each committed chunk. The records of a chunk are remembered as seen once
+        the chunk is committed only; if it is rolled back, the authors matcher
+        is reloaded, as it may hold the authors created by the chunk.
+        """
+        report = IngestionReport()
+        records = iter(records)
+
+        chunks = iter(lambda: list(islice(records, self.batch_size)), [])
+        for index, chunk in enumerate(chunks):
+            try:
+                with transaction.atomic():
+                    chunk_report = self.import_chunk(chunk)
+            except BaseException:
+                self.matcher = None
+                raise
+
+            self.seen_dois |= self.chunk_dois
+            self.seen_title_hashes |= self.chunk_title_hashes
+            report.merge(chunk_report)
+            if callback is not None:
+                callback(index, chunk_report)
+
+        return report
+
+    def import_chunk(self, records):
+        """Import the chunk of the records, returning its report."""
+        start = time.perf_counter()
+        report = IngestionReport(read=len(records))
+
+        records = self.deduplicate(records, report)
+        author_ids = self.get_author_ids(records, report)
+
+        contributions = []
+        elements = []
+        for record_type, model in ELEMENT_MODELS.items():
+            typed_records = [
+                record for record in records if record["type"] == record_type
+            ]
+            objects = bulk_create_with_ids(
+                model,
+                [self.make_element(model, record) for record in typed_records],
+                self.batch_size,
+                key=["title_hash"],
+            )
+            report.created += len(objects)
+            search_index.reindex(
+                model.objects.filter(id__in=[obj.pk for obj in objects])
+            )
+
+            content_type_id = ContentType.objects.get_for_model(model).pk
+            for record, obj in zip(typed_records, objects):
+                elements.append((content_type_id, obj.pk))
+
+                # The authors listed more than once are kept at their first place
+                record_author_ids = list(
+                    dict.fromkeys(author_ids[name] for name in record["authors"])
+                )
+                if not record_author_ids:
+                    continue
+                for order, (author_id, percentage) in enumerate(
+                    zip(record_author_ids, get_percentages(len(record_author_ids))),
+                    start=1,
+                ):
+                    contributions.append(
+                        Contribution(
+                            content_type_id=content_type_id,
+                            object_id=obj.pk,
+                            order=order,
+                            author_id=author_id,
+                            percentage=percentage,
+                        )
+                    )
+
+        Contribution.objects.bulk_create(contributions, batch_size=self.batch_size)
+        report.contributions = len(contributions)
+
+        # The elements are new, hence their results before are all zeros
+        apply_snapshots({}, take_snapshot(Scope(elements)))
+
+        report.elapsed = time.perf_counter() - start
+        return report
+
+    def deduplicate(self, records, report):
+        """
+        Return the records with no duplicates, neither saved nor in the chunk.
+
+        The keys of the records of the chunk are kept in `chunk_dois` and
+        `chunk_title_hashes`, until the chunk is committed.
+        """
+        self.chunk_dois, self.chunk_title_hashes = set(), set()
+        unique_records = []
+        for record in records:
+            if not record["title"]:
+                report.errors.append((record["position"], "Brak tytułu."))
+                continue
+
+            record["title_hash"] = get_title_hash(record["title"], record["year"])
+            if (
+                record["doi"] in self.seen_dois
+                or record["doi"] in self.chunk_dois
+                or record["title_hash"] in self.seen_title_hashes
+                or record["title_hash"] in self.chunk_title_hashes
+            ):
+                report.duplicates += 1
+                continue
+
+            if record["doi"]:
+                self.chunk_dois.add(record["doi"])
+            self.chunk_title_hashes.add(record["title_hash"])
+            unique_records.append(record)
+
+        # Find the records saved before, with a query per model
+        saved_dois, saved_title_hashes = set(), set()
+        for record_type, model in ELEMENT_MODELS.items():
+            typed_records = [
+                record for record in unique_records if record["type"] == record_type
+            ]
+            if not typed_records:
+                continue
+
+            lookups = Q(
+                title_hash__in=[record["title_hash"] for record in typed_records]
+            )
+            fields = ["title_hash"]
+            if "doi" in ELEMENT_FIELDS[record_type]:
+                lookups |= Q(
+                    doi__in=[record["doi"] for record in typed_records if record["doi"]]
+                )
+                fields.append("doi")
+
+            for saved in model.objects.filter(lookups).values(*fields):
+                saved_title_hashes.add(saved["title_hash"])
+                saved_dois.add(saved.get("doi"))
+
+        records = []
+        for record in unique_records:
+            if (record["doi"] and record["doi"] in saved_dois) or record[
+                "title_hash"
+            ] in saved_title_hashes:
+                report.duplicates += 1
+            else:
+                records.append(record)
+        return records
+
+    def get_author_ids(self, records, report):
+        """
+        Return the IDs of the authors of the records, by name.
+
+        The names are matched all at once; the employees matched with no authors
+        yet and the names not matched at all are given the new authors, created
+        in bulk. The ambiguous names are assigned to their first candidate.
+        """
+        if self.matcher is None:
+            self.matcher = AuthorMatcher(self.threshold)
+
+        names = list(
+            dict.fromkeys(name for record in records for name in record["authors"])
+        )
+        author_ids, new_authors = {}, {}
+
+        for match in self.matcher.match(names):
+            if match.candidates and (match.exact or self.fuzzy):
+                author_id, employee_id = match.candidates[0]
+                report.ambiguous += match.ambiguous
+            else:
+                author_id, employee_id = None, None
+
+            if author_id is not None:
+                author_ids[match.name] = author_id
+                report.authors_matched += 1
+            else:
+                # The names of the same key share the new author
+                key = (match.key, employee_id)
+                if key not in new_authors:
+                    new_authors[key] = Author(
+                        alias=match.name[:50], employee_id=employee_id
+                    )
+                author_ids[match.name] = new_authors[key]
+
+        authors = bulk_create_with_ids(
+            Author,
+            list(new_authors.values()),
+            self.batch_size,
+            key=["alias", "employee_id"],
+        )
+        report.authors_created = len(authors)
+
+        for (key, employee_id), author in new_authors.items():
+            self.matcher.add(key, author.pk, employee_id)
+        for name, author in author_ids.items():
+            if isinstance(author, Author):
+                author_ids[name] = author.pk
+
+        new_authors = Author.objects.filter(id__in=[author.pk for author in authors])
+        AuthorAffiliation.objects.refresh(new_authors)
+        AuthorAlias.objects.refresh(authors=new_authors)
+        search_index.reindex(new_authors)
+
+        return author_ids
+
+    def make_element(self, model, record):
+        """Return the unsaved element of the record."""
+        fields = {
+            name: record[name][: model._meta.get_field(name).max_length]
+            for name in ELEMENT_FIELDS[record["type"]]
+            if record[name]
+        }
+        return model(
+            title=record["title"][: model._meta.get_field("title").max_length],
+            year=record["year"],
+            title_hash=record["title_hash"],
+            **fields,
+        )
@@ -0,0 +1,45 @@
+import hashlib
+
+from django.contrib.contenttypes.fields import GenericRelation
+from django.db import models
+
+from extras.text import fold
+
+from ..contributions.models import Contribution
+
+
+def get_title_hash(title, year=None):
+    """Return the hash of the folded title and the year, used for deduplication."""
+    key = "{}|{}".format(" ".join(fold(title).split()), year or "")
+    return hashlib.md5(key.encode()).hexdigest()
+
+
+class Element(models.Model):
+    """
+    A class to represent an abstract element of the attainments.
+
+    The authors of the elements are given by the ordered Contribution objects.
+    The elements are deduplicated by the hash of the title and the year, see
+    `get_title_hash()`, kept in the indexed `title_hash` field.
+    """
+
+    title = models.CharField(verbose_name="tytuł", max_length=500)
+    year = models.PositiveSmallIntegerField(verbose_name="rok", blank=True, null=True)
+    title_hash = models.CharField(
+        verbose_name="skrót tytułu",
+        max_length=32,
+        editable=False,
+        db_index=True,
+    )
+
+    contributions = GenericRelation(Contribution)
+
+    class Meta:
+        abstract = True
+
+    def __str__(self):
+        return "{}{}".format(self.title, f" ({self.year})" if self.year else "")
+
+    def save(self, *args, **kwargs):
+        self.title_hash = get_title_hash(self.title, self.year)
+        super().save(*args, **kwargs)
@@ -0,0 +1,234 @@
+import csv
+import re
+import unicodedata
+from pathlib import Path
+
+# The record types, i.e. the element models they are ingested into
+RECORD_TYPES = ["article", "patent", "grant"]
+
+# The mappings of the types of the records onto the record types
+BIBTEX_TYPES = {"article": "article", "patent": "patent", "grant": "grant"}
+RIS_TYPES = {"JOUR": "article", "EJOUR": "article", "PAT": "patent", "GRANT": "grant"}
+
+# The mappings of the fields of the records onto the record fields
+BIBTEX_FIELDS = {
+    "title": "title",
+    "year": "year",
+    "author": "authors",
+    "doi": "doi",
+    "journal": "journal",
+    "volume": "volume",
+    "pages": "pages",
+    "number": "number",
+    "funder": "funder",
+    "organization": "funder",
+}
+RIS_FIELDS = {
+    "TI": "title",
+    "T1": "title",
+    "PY": "year",
+    "Y1": "year",
+    "AU": "authors",
+    "A1": "authors",
+    "DO": "doi",
+    "JO": "journal",
+    "JF": "journal",
+    "T2": "journal",
+    "VL": "volume",
+    "SP": "pages",
+    "EP": "end_page",
+    "IS": "number",
+    "M1": "number",
+    "PB": "funder",
+}
+
+# The LaTeX accent commands along with the combining characters they stand for
+LATEX_ACCENTS = {"'": "\u0301", ".": "\u0307", "k": "\u0328", "`": "\u0300"}
+LATEX_LETTERS = {r"\l": "ł", r"\L": "Ł", r"\o": "ø", r"\O": "Ø", r"\ss": "ß"}
+
+LATEX_ACCENT = re.compile(r"\\(['.`]|k(?=[\s{]))\s*\{?\s*([A-Za-z])\}?")
+
+BIBTEX_ENTRY = re.compile(r"\s*@(\w+)\s*\{")
+BIBTEX_FIELD = re.compile(r"[\s,]*([\w-]+)\s*=\s*")
+BIBTEX_BARE_VALUE = re.compile(r"[^,\s}]*")
+
+RIS_LINE = re.compile(r"^([A-Z][A-Z0-9])  -(?: (.*))?$")
+
+
+def read_latex(text):
+    """Convert the LaTeX accents of the text to Unicode and drop the braces."""
+
+    def accent(match):
+        return unicodedata.normalize("NFC", match[2] + LATEX_ACCENTS[match[1]])
+
+    text = LATEX_ACCENT.sub(accent, text)
+    for command, letter in LATEX_LETTERS.items():
+        text = re.sub(re.escape(command) + r"(?![A-Za-z])\s*", letter, text)
+    return " ".join(text.replace("{", "").replace("}", "").split())
+
+
+def parse_year(value):
+    match = re.search(r"\d{4}", value or "")
+    return int(match[0]) if match else None
+
+
+def make_record(record_type, fields, position):
+    """Return the record of the given type, made of the parsed fields."""
+    if fields.get("end_page"):
+        fields["pages"] = "{}-{}".format(fields.get("pages", ""), fields["end_page"])
+    fields["pages"] = fields.get("pages", "").replace("--", "-")
+    return {
+        "type": record_type,
+        "position": position,
+        "title": fields.get("title", ""),
+        "year": parse_year(fields.get("year")),
+        "authors": fields.get("authors", []),
+        "doi": (fields.get("doi") or "").strip().lower() or None,
+        "journal": fields.get("journal", ""),
+        "volume": fields.get("volume", ""),
+        "pages": fields.get("pages", ""),
+        "number": fields.get("number", ""),
+        "funder": fields.get("funder", ""),
+    }
+
+
+def split_bibtex_fields(body):
+    """Yield the (name, value) pairs of the fields of the BibTeX entry body."""
+    index, length = 0, len(body)
+
+    while index < length:
+        match = BIBTEX_FIELD.match(body, index)
+        if not match:
+            return
+        name, start = match[1].lower(), match.end() + 1
+
+        if body.startswith("{", match.end()):
+            # The braced values may contain the nested braces
+            depth = 0
+            for stop in range(match.end(), length):
+                depth += {"{": 1, "}": -1}.get(body[stop], 0)
+                if depth == 0:
+                    break
+        elif body.startswith('"', match.end()):
+            stop = body.find('"', start)
+            stop = length if stop < 0 else stop
+        else:
+            start = match.end()
+            stop = BIBTEX_BARE_VALUE.match(body, start).end()
+
+        yield name, body[start:stop]
+        index = stop + 1
+
+
+def parse_bibtex(lines):
+    """
+    Parse the BibTeX entries, streamed line by line.
+
+    The entries of the types other than those of the elements are skipped. The
+    authors are split on the "and" separators.
+    """
+    entry_type, entry, depth, position = None, [], 0, 0
+
+    for number, line in enumerate(lines, start=1):
+        if entry_type is None:
+            match = BIBTEX_ENTRY.match(line)
+            if not match:
+                continue
+            entry_type, entry, depth, position = match[1].lower(), [], 0, number
+            start = match.end() - 1
+            line = line[start:]
+
+        entry.append(line)
+        depth += line.count("{") - line.count("}")
+        if depth > 0:
+            continue
+
+        # Drop the braces around the entry and the citation key
+        text = "".join(entry).strip()
+        stop = text.rfind("}")
+        body = text[1:stop].partition(",")[2]
+        record_type = BIBTEX_TYPES.get(entry_type)
+        entry_type = None
+
+        if record_type is None:
+            continue
+
+        fields = {}
+        for name, value in split_bibtex_fields(body):
+            if name in BIBTEX_FIELDS:
+                fields[BIBTEX_FIELDS[name]] = read_latex(value)
+        fields["authors"] = [
+            author.strip()
+            for author in re.split(r"\s+and\s+", fields.get("authors", ""))
+            if author.strip()
+        ]
+        yield make_record(record_type, fields, position)
+
+
+def parse_ris(lines):
+    """Parse the RIS records, streamed line by line."""
+    fields, record_type, position = {}, None, 0
+
+    for number, line in enumerate(lines, start=1):
+        match = RIS_LINE.match(line.rstrip("\r\n"))
+        if not match:
+            continue
+        tag, value = match[1], (match[2] or "").strip()
+
+        if tag == "TY":
+            fields, record_type, position = (
+                {"authors": []},
+                RIS_TYPES.get(value),
+                number,
+            )
+        elif tag == "ER":
+            if record_type is not None:
+                yield make_record(record_type, fields, position)
+            fields, record_type = {}, None
+        elif tag in RIS_FIELDS and record_type is not None:
+            name = RIS_FIELDS[tag]
+            if name == "authors":
+                fields["authors"].append(value)
+            else:
+                fields.setdefault(name, value)
+
+
+def parse_csv(lines):
+    """
+    Parse the CSV records, streamed line by line.
+
+    The columns are named after the record fields, with the authors separated
+    by the semicolons, e.g. "type,title,year,doi,authors,journal".
+    """
+    for position, row in enumerate(csv.DictReader(lines), start=2):
+        record_type = (row.get("type") or "").strip().lower()
+        if record_type not in RECORD_TYPES:
+            continue
+
+        fields = {
+            name: (value or "").strip()
+            for name, value in row.items()
+            if name and name != "authors"
+        }
+        fields["authors"] = [
+            author.strip()
+            for author in (row.get("authors") or "").split(";")
+            if author.strip()
+        ]
+        yield make_record(record_type, fields, position)
+
+
+PARSERS = {".bib": parse_bibtex, ".ris": parse_ris, ".csv": parse_csv}
+
+
+def iter_records(path):
+    """Parse the records of the file, by its extension, streaming its lines."""
+    try:
+        parser = PARSERS[Path(path).suffix.lower()]
+    except KeyError:
+        raise ValueError(
+            "Unsupported file '{}', use one of: {}.".format(path, ", ".join(PARSERS))
+        )
+
+    with open(path, encoding="utf-8-sig", newline="") as file:
+        yield from parser(file)
@@ -0,0 +1,16 @@
+from django.contrib import admin
+
+from ..admin import ElementAdmin
+from .models import Patent
+
+
+@admin.register(Patent)
+class PatentAdmin(ElementAdmin):
+    """Admin options for the Patent model."""
+
+    fieldsets = [
+        (None, {"fields": ["id"]}),
+        ("Informacje podstawowe", {"fields": ["title", "year"]}),
+        ("Informacje dodatkowe", {"fields": ["number"]}),
+    ]
+    search_fields = [*ElementAdmin.search_fields, "number"]
@@ -0,0 +1,13 @@
+from django.db import models
+
+from ..models import Element
+
+
+class Patent(Element):
+    """A class to represent the Patent objects."""
+
+    number = models.CharField(verbose_name="numer", max_length=50, blank=True)
+
+    class Meta:
+        verbose_name = "patent"
+        verbose_name_plural = "patenty"
@@ -0,0 +1,9 @@
+from extras.search import search_index
+
+from .articles.models import Article
+from .grants.models import Grant
+from .patents.models import Patent
+
+search_index.register(Article, ["title", "journal", "doi"])
+search_index.register(Patent, ["title", "number"])
+search_index.register(Grant, ["title", "number", "funder"])
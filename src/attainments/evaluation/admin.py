@@ -0,0 +1,55 @@
+from django.contrib import admin
+from django.db import router
+
+from extras.routers import read_from_replica
+
+from .models import DepartmentEvaluation, DisciplineEvaluation
+
+
+class EvaluationAdmin(admin.ModelAdmin):
+    """Admin options for the Evaluation models."""
+
+    list_display = [
+        "employee_count",
+        "contribution_count",
+        "element_count",
+        "share",
+        "share_per_employee",
+        "computed_at",
+    ]
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        if request.method != "GET":
+            return queryset
+
+        # The results are reported from the replicas, if there are any; the
+        # database is chosen up front, as the changelist is read when rendered
+        with read_from_replica():
+            return queryset.using(router.db_for_read(self.model))
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(DisciplineEvaluation)
+class DisciplineEvaluationAdmin(EvaluationAdmin):
+    """Admin options for the DisciplineEvaluation model."""
+
+    list_display = ["discipline", "university", *EvaluationAdmin.list_display]
+    list_select_related = ["discipline", "university"]
+    list_filter = ["university"]
+    ordering = ["university", "discipline"]
+
+
+@admin.register(DepartmentEvaluation)
+class DepartmentEvaluationAdmin(EvaluationAdmin):
+    """Admin options for the DepartmentEvaluation model."""
+
+    list_display = ["discipline", "department", *EvaluationAdmin.list_display]
+    list_select_related = ["discipline", "department"]
+    list_filter = ["department"]
+    ordering = ["department", "discipline"]
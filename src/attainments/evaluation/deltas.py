@@ -0,0 +1,165 @@
+from collections import defaultdict
+
+from django.db.models import Q
+
+from employees.models import Employee
+
+from ..contributions.models import Contribution
+from .engine import EMPLOYEE_LOOKUPS
+from .models import EVALUATION_MODELS
+
+
+class Scope:
+    """
+    A class to represent the part of the data affected by a change.
+
+    The scope consists of the elements, given as (content type ID, object ID)
+    pairs, and of the employees whose results may change. The results of the
+    groups are then recomputed for the scope only, before and after the change.
+    """
+
+    def __init__(self, elements=(), employee_ids=()):
+        self.elements = set(elements)
+        self.employee_ids = set(employee_ids)
+
+    def __bool__(self):
+        return bool(self.elements or self.employee_ids)
+
+    def __sub__(self, other):
+        return Scope(
+            self.elements - other.elements,
+            self.employee_ids - other.employee_ids,
+        )
+
+    def __ior__(self, other):
+        self.elements |= other.elements
+        self.employee_ids |= other.employee_ids
+        return self
+
+    @classmethod
+    def for_employees(cls, employees):
+        """Return the scope of the employees given as a queryset."""
+        employee_ids = set(employees.values_list("id", flat=True))
+        return cls(
+            Contribution.objects.filter(author__employee__in=employee_ids)
+            .values_list("content_type", "object_id")
+            .distinct(),
+            employee_ids,
+        )
+
+
+def take_snapshot(scope):
+    """
+    Compute the partial results of the groups within the scope.
+
+    The results are the numbers of the employees, contributions and elements and
+    the sums of the percentages of the groups of every evaluation model, keyed
+    by the (model, group) pairs. The elements are kept as sets, so that those
+    shared by the employees of the same group are counted once.
+    """
+    snapshot = defaultdict(lambda: [0, 0, set(), 0])
+
+    def add(row, prefix, element=None, percentage=0):
+        for model in EVALUATION_MODELS:
+            group = tuple(
+                row[f"{prefix}{EMPLOYEE_LOOKUPS[key]}"] for key in model.group_keys
+            )
+            results = snapshot[model, group]
+            if element is None:
+                results[0] += 1
+            else:
+                results[1] += 1
+                results[2].add(element)
+                results[3] += percentage
+
+    if scope.employee_ids:
+        for row in Employee.objects.filter(
+            id__in=scope.employee_ids,
+            in_evaluation=True,
+            discipline__isnull=False,
+        ).values(*EMPLOYEE_LOOKUPS.values()):
+            add(row, "")
+
+    if scope.elements:
+        object_ids = defaultdict(list)
+        for content_type_id, object_id in scope.elements:
+            object_ids[content_type_id].append(object_id)
+        elements = Q()
+        for content_type_id, ids in object_ids.items():
+            elements |= Q(content_type_id=content_type_id, object_id__in=ids)
+
+        prefix = "author__employee__"
+        for row in Contribution.objects.filter(
+            elements,
+            author__employee__in_evaluation=True,
+            author__employee__discipline__isnull=False,
+        ).values(
+            "content_type",
+            "object_id",
+            "percentage",
+            *[f"{prefix}{lookup}" for lookup in EMPLOYEE_LOOKUPS.values()],
+        ):
+            add(
+                row,
+                prefix,
+                element=(row["content_type"], row["object_id"]),
+                percentage=row["percentage"],
+            )
+
+    return snapshot
+
+
+def apply_snapshots(before, after):
+    """Update the saved results by the differences of the snapshots."""
+    deltas = defaultdict(dict)
+    for model, group in before.keys() | after.keys():
+        old = before.get((model, group), [0, 0, set(), 0])
+        new = after.get((model, group), [0, 0, set(), 0])
+        delta = (
+            new[0] - old[0],
+            new[1] - old[1],
+            len(new[2]) - len(old[2]),
+            new[3] - old[3],
+        )
+        if any(delta):
+            deltas[model][group] = delta
+
+    for model, model_deltas in deltas.items():
+        model.objects.apply_deltas(model_deltas)
+
+
+class DeletionBatch:
+    """
+    A class to represent the changes made by a single deletion.
+
+    A deletion may cascade onto many objects, all of which are sent `pre_delete`
+    before anything is deleted. The objects are then deleted model by model and
+    sent `post_delete` right after their model. The scopes of the objects are
+    thus collected into a single batch, whose snapshot is retaken once per model,
+    so that the results shared by the objects are not updated more than once.
+    """
+
+    def __init__(self):
+        self.scope = Scope()
+        self.snapshot = {}
+        self.model = None
+
+    def add(self, scope):
+        """Add the scope to the batch, taking the snapshot of its new part."""
+        scope = scope - self.scope
+        if scope:
+            for key, results in take_snapshot(scope).items():
+                self.snapshot.setdefault(key, [0, 0, set(), 0])
+                self.snapshot[key][0] += results[0]
+                self.snapshot[key][1] += results[1]
+                self.snapshot[key][2] |= results[2]
+                self.snapshot[key][3] += results[3]
+            self.scope |= scope
+
+    def apply(self, model):
+        """Update the saved results, once the objects of the model are deleted."""
+        if model is not self.model:
+            snapshot = take_snapshot(self.scope)
+            apply_snapshots(self.snapshot, snapshot)
+            self.snapshot = snapshot
+            self.model = model
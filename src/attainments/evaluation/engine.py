@@ -0,0 +1,86 @@
+from employees.models import Employee
+
+import numpy as np
+import pandas as pd
+
+from ..contributions.models import Contribution
+
+# The lookups of the keys the results can be grouped by, starting at Employee
+EMPLOYEE_LOOKUPS = {
+    "discipline": "discipline",
+    "department": "employment__department",
+    "university": "employment__department__faculty__university",
+}
+
+RESULT_COLUMNS = [
+    "employee_count",
+    "contribution_count",
+    "element_count",
+    "share",
+    "share_per_employee",
+]
+
+
+def read_employees(universities=None):
+    """Read the employees in the evaluation with a single query, as a DataFrame."""
+    queryset = Employee.objects.filter(in_evaluation=True, discipline__isnull=False)
+    if universities is not None:
+        queryset = queryset.filter(
+            **{f"{EMPLOYEE_LOOKUPS['university']}__in": universities}
+        )
+    return pd.DataFrame.from_records(
+        queryset.values_list("id", *EMPLOYEE_LOOKUPS.values()).iterator(),
+        columns=["employee", *EMPLOYEE_LOOKUPS],
+    )
+
+
+def read_contributions(universities=None):
+    """Read the contributions of the employees in the evaluation, as a DataFrame."""
+    queryset = Contribution.objects.filter(
+        author__employee__in_evaluation=True,
+        author__employee__discipline__isnull=False,
+    )
+    if universities is not None:
+        queryset = queryset.filter(
+            **{f"author__employee__{EMPLOYEE_LOOKUPS['university']}__in": universities}
+        )
+    return pd.DataFrame.from_records(
+        queryset.values_list(
+            "author__employee",
+            "content_type",
+            "object_id",
+            "percentage",
+        ).iterator(),
+        columns=["employee", "content_type", "object_id", "percentage"],
+    )
+
+
+def evaluate(employees, contributions, keys):
+    """
+    Compute the results of the groups given by the keys in a single vectorized pass.
+
+    For each group, e.g. of the university and the discipline, the results are
+    the number of the employees in the evaluation ("liczba N"), the number of
+    their contributions and of the distinct elements they contribute to, as well
+    as the share of the elements, i.e. the sum of the percentages, in total and
+    per employee.
+    """
+    employee_count = employees.groupby(keys, dropna=False).size()
+
+    contributions = contributions.merge(employees, on="employee", how="inner")
+    # The elements are identified by their content types and IDs packed together
+    contributions["element"] = (
+        contributions["content_type"].to_numpy(dtype=np.int64) << 32
+    ) | contributions["object_id"].to_numpy(dtype=np.int64)
+    totals = contributions.groupby(keys, dropna=False).agg(
+        contribution_count=("percentage", "size"),
+        element_count=("element", "nunique"),
+        share=("percentage", "sum"),
+    )
+
+    results = totals.reindex(employee_count.index, fill_value=0)
+    results.insert(0, "employee_count", employee_count)
+    results["share"] = results["share"] / 100
+    results["share_per_employee"] = results["share"] / results["employee_count"]
+
+    return results.reset_index()[keys + RESULT_COLUMNS]
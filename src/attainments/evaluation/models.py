@@ -0,0 +1,248 @@
+import math
+
+from django.db import models, transaction
+from django.db.models.functions import Cast
+
+from employees.models import Discipline
+from units.models import Department, University
+
+from .engine import (
+    RESULT_COLUMNS,
+    evaluate,
+    read_contributions,
+    read_employees,
+)
+
+# Tolerance of the comparison of the shares updated incrementally
+SHARE_TOLERANCE = 1e-6
+
+
+class EvaluationManager(models.Manager):
+    """A class to represent the manager of the Evaluation objects."""
+
+    def compute(self, universities=None):
+        """Compute the results of the given universities (or all) as a DataFrame."""
+        return evaluate(
+            read_employees(universities),
+            read_contributions(universities),
+            self.model.group_keys,
+        )
+
+    def refresh(self, universities=None):
+        """
+        Recompute the results of the given universities, or of all of them.
+
+        The data are read with a couple of queries, the results are computed
+        with Pandas, see `engine.py`, and rewritten in bulk.
+        """
+        keys = self.model.group_keys
+        evaluations = [
+            self.model(
+                **{
+                    f"{key}_id": None if math.isnan(row[key]) else int(row[key])
+                    for key in keys
+                },
+                **{column: row[column] for column in RESULT_COLUMNS},
+            )
+            for row in (
+                row._asdict()
+                for row in self.compute(universities).itertuples(index=False)
+            )
+        ]
+
+        with transaction.atomic():
+            stale = self.all()
+            if universities is not None:
+                stale = stale.filter(
+                    **{f"{self.model.university_lookup}__in": universities}
+                )
+            stale.delete()
+            self.bulk_create(evaluations)
+
+        return evaluations
+
+    def apply_deltas(self, deltas):
+        """
+        Update the results of the groups by the given deltas.
+
+        The `deltas` map the groups, given as the tuples of the key IDs, onto
+        the changes of the numbers of the employees, contributions and elements
+        and of the sum of the percentages. The groups left with no employees
+        are deleted.
+        """
+        for group, (employees, contributions, elements, percentage) in deltas.items():
+            lookups = {
+                f"{key}_id": value for key, value in zip(self.model.group_keys, group)
+            }
+            evaluations = self.filter(**lookups)
+
+            # The groups left with no employees are deleted up front, so that
+            # the share per employee of the remaining ones can be updated at once
+            if employees < 0:
+                evaluations.filter(employee_count__lte=-employees).delete()
+
+            share = models.F("share") + percentage / 100
+            updated = evaluations.update(
+                employee_count=models.F("employee_count") + employees,
+                contribution_count=models.F("contribution_count") + contributions,
+                element_count=models.F("element_count") + elements,
+                share=share,
+                share_per_employee=share
+                / Cast(
+                    models.F("employee_count") + employees,
+                    models.FloatField(),
+                ),
+            )
+            if not updated and employees > 0:
+                self.create(
+                    **lookups,
+                    employee_count=employees,
+                    contribution_count=contributions,
+                    element_count=elements,
+                    share=percentage / 100,
+                    share_per_employee=percentage / 100 / employees,
+                )
+
+    def find_differences(self, universities=None):
+        """
+        Compare the saved results against the results recomputed from scratch.
+
+        Returns the list of the (group, column, expected value, saved value)
+        tuples of the differing results.
+        """
+        keys = self.model.group_keys
+        expected = {
+            tuple(None if math.isnan(value) else int(value) for value in row[keys]): row
+            for _, row in self.compute(universities).iterrows()
+        }
+
+        saved = self.all()
+        if universities is not None:
+            saved = saved.filter(
+                **{f"{self.model.university_lookup}__in": universities}
+            )
+        saved = {
+            tuple(row[f"{key}_id"] for key in keys): row
+            for row in saved.values(*[f"{key}_id" for key in keys], *RESULT_COLUMNS)
+        }
+
+        differences = []
+        for group in sorted(expected.keys() | saved.keys(), key=str):
+            for column in RESULT_COLUMNS:
+                expected_value = expected[group][column] if group in expected else None
+                saved_value = saved[group][column] if group in saved else None
+                if expected_value is None or saved_value is None:
+                    equal = expected_value is saved_value
+                else:
+                    equal = math.isclose(
+                        expected_value, saved_value, abs_tol=SHARE_TOLERANCE
+                    )
+                if not equal:
+                    differences.append((group, column, expected_value, saved_value))
+
+        return differences
+
+
+class Evaluation(models.Model):
+    """
+    A class to represent the cached results of the evaluation of the disciplines.
+
+    The subclasses define the foreign keys the results are grouped by, listed in
+    `group_keys`. The objects are recomputed with `objects.refresh()` and updated
+    incrementally by the signals, see `signals.py`.
+    """
+
+    employee_count = models.PositiveIntegerField(verbose_name="liczba N")
+    contribution_count = models.PositiveIntegerField(verbose_name="liczba udziałów")
+    element_count = models.PositiveIntegerField(verbose_name="liczba elementów")
+    share = models.FloatField(verbose_name="udział łączny")
+    share_per_employee = models.FloatField(verbose_name="udział na osobę")
+    computed_at = models.DateTimeField(verbose_name="obliczono", auto_now=True)
+
+    group_keys = []
+    university_lookup = None
+
+    objects = EvaluationManager()
+
+    class Meta:
+        abstract = True
+
+
+class DisciplineEvaluation(Evaluation):
+    """A class to represent the results of the disciplines at the universities."""
+
+    university = models.ForeignKey(
+        to=University,
+        on_delete=models.CASCADE,
+        verbose_name=University._meta.verbose_name,
+        related_name="discipline_evaluations",
+        blank=True,
+        null=True,
+    )
+    discipline = models.ForeignKey(
+        to=Discipline,
+        on_delete=models.CASCADE,
+        verbose_name=Discipline._meta.verbose_name,
+        related_name="evaluations",
+    )
+
+    group_keys = ["university", "discipline"]
+    university_lookup = "university"
+
+    class Meta:
+        verbose_name = "ewaluacja dyscypliny"
+        verbose_name_plural = "ewaluacje dyscyplin"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["university", "discipline"],
+                name="unique_discipline_evaluation",
+            )
+        ]
+
+    def __str__(self):
+        return "{} ({})".format(
+            Discipline.cached.get(self.discipline_id),
+            University.cached.get(self.university_id) or "-",
+        )
+
+
+class DepartmentEvaluation(Evaluation):
+    """A class to represent the results of the disciplines in the departments."""
+
+    department = models.ForeignKey(
+        to=Department,
+        on_delete=models.CASCADE,
+        verbose_name=Department._meta.verbose_name,
+        related_name="discipline_evaluations",
+        blank=True,
+        null=True,
+    )
+    discipline = models.ForeignKey(
+        to=Discipline,
+        on_delete=models.CASCADE,
+        verbose_name=Discipline._meta.verbose_name,
+        related_name="department_evaluations",
+    )
+
+    group_keys = ["department", "discipline"]
+    university_lookup = "department__faculty__university"
+
+    class Meta:
+        verbose_name = "ewaluacja dyscypliny w katedrze"
+        verbose_name_plural = "ewaluacje dyscyplin w katedrach"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["department", "discipline"],
+                name="unique_department_evaluation",
+            )
+        ]
+
+    def __str__(self):
+        return "{} ({})".format(
+            Discipline.cached.get(self.discipline_id),
+            Department.cached.get(self.department_id) or "-",
+        )
+
+
+# The models of the results, all kept up to date by the signals
+EVALUATION_MODELS = [DisciplineEvaluation, DepartmentEvaluation]
@@ -0,0 +1,166 @@
+import threading
+
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from employees.models import Discipline, Employee, Employment
+from units.models import Department, Faculty, University
+
+from ..contributions.models import (
+    Author,
+    Contribution,
+    post_save_element,
+    pre_save_element,
+)
+from .deltas import DeletionBatch, Scope, apply_snapshots, take_snapshot
+
+# The results are updated by the deltas computed for the scope of each change:
+# the snapshot of the scope is taken before the change, and once again after
+# it. The changes of the units and disciplines are rare, but they move all
+# their employees between the groups, hence they are tracked as well.
+
+TRACKED_MODELS = [
+    Contribution,
+    Author,
+    Employee,
+    Employment,
+    Department,
+    Faculty,
+    University,
+    Discipline,
+]
+
+# The fields of the tracked models the results depend on; the saves changing
+# none of them, e.g. of the names only, leave the results as they are.
+TRACKED_FIELDS = {
+    Contribution: ["content_type", "object_id", "author", "percentage"],
+    Author: ["employee"],
+    Employee: ["in_evaluation", "discipline"],
+    Employment: ["employee", "department"],
+    Department: ["faculty"],
+    Faculty: ["university"],
+    University: [],
+    Discipline: [],
+}
+
+# Snapshots of the elements being saved by `save_element()`, by thread
+element_snapshots = threading.local()
+
+
+def get_scope(instance):
+    """Return the scope of the data affected by the change of the instance."""
+    if isinstance(instance, Contribution):
+        return Scope(
+            {
+                (instance.content_type_id, instance.object_id),
+                *Contribution.objects.filter(pk=instance.pk).values_list(
+                    "content_type", "object_id"
+                ),
+            }
+        )
+    if isinstance(instance, Author):
+        return Scope(
+            Contribution.objects.filter(author=instance.pk)
+            .values_list("content_type", "object_id")
+            .distinct()
+        )
+
+    if isinstance(instance, Employment):
+        # The employee of a new employment may be in the evaluation already
+        employees = Q(pk=instance.employee_id)
+        if instance.pk is not None:
+            employees |= Q(employment=instance.pk)
+    elif instance.pk is None:
+        return Scope()
+    elif isinstance(instance, Employee):
+        employees = Q(pk=instance.pk)
+    elif isinstance(instance, Department):
+        employees = Q(employment__department=instance.pk)
+    elif isinstance(instance, Faculty):
+        employees = Q(employment__department__faculty=instance.pk)
+    elif isinstance(instance, University):
+        employees = Q(employment__department__faculty__university=instance.pk)
+    else:
+        employees = Q(discipline=instance.pk)
+
+    return Scope.for_employees(Employee.objects.filter(employees))
+
+
+def is_changed(instance, update_fields=None):
+    """Return whether saving the instance changes any of its tracked fields."""
+    fields = [instance._meta.get_field(name) for name in TRACKED_FIELDS[type(instance)]]
+    if update_fields is not None:
+        fields = [
+            field
+            for field in fields
+            if field.name in update_fields or field.attname in update_fields
+        ]
+    if not fields:
+        return False
+    if instance._state.adding:
+        return True
+
+    attnames = [field.attname for field in fields]
+    saved = (
+        type(instance)
+        ._default_manager.filter(pk=instance.pk)
+        .values_list(*attnames)
+        .first()
+    )
+    return saved != tuple(getattr(instance, attname) for attname in attnames)
+
+
+def snapshot_instance(sender, instance, update_fields=None, **kwargs):
+    """Take the snapshot of the scope of the sender instance to be saved."""
+    if is_changed(instance, update_fields):
+        scope = get_scope(instance)
+        instance._evaluation_change = (scope, take_snapshot(scope))
+
+
+def update_saved_instance(sender, instance, **kwargs):
+    """Update the results by the change made by saving the sender instance."""
+    change = instance.__dict__.pop("_evaluation_change", None)
+    if change is None:
+        return
+    scope, before = change
+
+    # The scope of a created instance is known after it has been saved only
+    scope |= get_scope(instance)
+    apply_snapshots(before, take_snapshot(scope))
+
+
+def collect_deleted_instance(sender, instance, origin=None, **kwargs):
+    """Add the sender instance to be deleted to the batch of its deletion."""
+    origin = instance if origin is None else origin
+    if not hasattr(origin, "_evaluation_batch"):
+        origin._evaluation_batch = DeletionBatch()
+    origin._evaluation_batch.add(get_scope(instance))
+
+
+def update_deleted_instance(sender, instance, origin=None, **kwargs):
+    """Update the results by the deletion the sender instance belongs to."""
+    origin = instance if origin is None else origin
+    origin._evaluation_batch.apply(sender)
+
+
+for model in TRACKED_MODELS:
+    pre_save.connect(snapshot_instance, sender=model)
+    post_save.connect(update_saved_instance, sender=model)
+    pre_delete.connect(collect_deleted_instance, sender=model)
+    post_delete.connect(update_deleted_instance, sender=model)
+
+
+@receiver(pre_save_element, sender=Contribution)
+def snapshot_element(sender, content_type, object_id, **kwargs):
+    """Take the snapshot of the element before its contributions are saved."""
+    scope = Scope({(getattr(content_type, "pk", content_type), object_id)})
+    element_snapshots.change = (scope, take_snapshot(scope))
+
+
+@receiver(post_save_element, sender=Contribution)
+def update_saved_element(sender, content_type, object_id, **kwargs):
+    """Update the results by the change of the contributions to the element."""
+    scope, before = element_snapshots.change
+    del element_snapshots.change
+    apply_snapshots(before, take_snapshot(scope))
@@ -0,0 +1,148 @@
+import random
+import time
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import BaseCommand
+from django.db import transaction
+from django.db.models import Max
+
+from attainments.models import Author, Contribution
+
+
+class Command(BaseCommand):
+    """
+    A command for benchmarking the lookups of the Contribution objects.
+
+    The table is filled with synthetic contributions up to each of the given sizes
+    and the typical lookups are timed at every size. All the data are generated
+    within a transaction rolled back at the end, so the database is left intact.
+    """
+
+    help = "Times the lookups of the contributions as the table grows."
+
+    def add_arguments(self, parser):
+        """Define the command arguments."""
+        parser.add_argument(
+            "--sizes",
+            nargs="+",
+            type=int,
+            default=[10_000, 100_000, 1_000_000],
+            help="Numbers of the contributions the lookups are timed at.",
+        )
+        parser.add_argument(
+            "--lookups",
+            type=int,
+            default=1000,
+            help="Number of the lookups of each kind timed at every size.",
+        )
+        parser.add_argument(
+            "--contributions-per-author",
+            type=int,
+            default=10,
+            help="Average number of the contributions of each synthetic author.",
+        )
+        parser.add_argument(
+            "--authors-per-element",
+            type=int,
+            default=5,
+            help="Number of the contributions of each synthetic element.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10_000,
+            help="Number of the contributions inserted at once.",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Seed of the random number generator.",
+        )
+
+    def handle(self, *args, **options):
+        """Define what does the command do."""
+        rng = random.Random(options["seed"])
+        per_element = options["authors_per_element"]
+        per_author = options["contributions_per_author"]
+
+        with transaction.atomic():
+            # Any content type will do, as the elements are never resolved
+            content_type = ContentType.objects.get_for_model(Contribution)
+            author_ids = []
+
+            self.stdout.write(
+                "{:>12} {:>20} {:>20}".format(
+                    "rows",
+                    "element authors [ms]",
+                    "author elements [ms]",
+                )
+            )
+
+            size = 0
+            for target_size in sorted(options["sizes"]):
+                while size < target_size:
+                    batch = range(size, min(target_size, size + options["batch_size"]))
+
+                    # The authors are added along with the contributions, so that
+                    # the number of the contributions per author stays the same.
+                    # Their IDs are set explicitly, as not all the backends return
+                    # them from `bulk_create()`.
+                    first_id = (Author.objects.aggregate(Max("id"))["id__max"] or 0) + 1
+                    batch_author_ids = list(
+                        range(first_id, first_id + max(1, len(batch) // per_author))
+                    )
+                    Author.objects.bulk_create(
+                        Author(id=author_id, alias=f"Benchmark {author_id}")
+                        for author_id in batch_author_ids
+                    )
+                    author_ids.extend(batch_author_ids)
+
+                    Contribution.objects.bulk_create(
+                        Contribution(
+                            content_type=content_type,
+                            object_id=index // per_element + 1,
+                            order=index % per_element + 1,
+                            author_id=rng.choice(batch_author_ids),
+                            percentage=100 // per_element,
+                        )
+                        for index in batch
+                    )
+                    size = batch.stop
+
+                element_ids = [
+                    rng.randint(1, size // per_element)
+                    for _ in range(options["lookups"])
+                ]
+                start = time.perf_counter()
+                for element_id in element_ids:
+                    list(
+                        Contribution.objects.filter(
+                            content_type=content_type,
+                            object_id=element_id,
+                        )
+                        .order_by("order")
+                        .values_list("author", flat=True)
+                    )
+                element_time = time.perf_counter() - start
+
+                lookup_author_ids = rng.choices(author_ids, k=options["lookups"])
+                start = time.perf_counter()
+                for author_id in lookup_author_ids:
+                    list(
+                        Contribution.objects.filter(
+                            author_id=author_id,
+                            content_type=content_type,
+                        ).values_list("object_id", flat=True)
+                    )
+                author_time = time.perf_counter() - start
+
+                self.stdout.write(
+                    "{:>12} {:>20.3f} {:>20.3f}".format(
+                        size,
+                        1000 * element_time / options["lookups"],
+                        1000 * author_time / options["lookups"],
+                    )
+                )
+
+            transaction.set_rollback(True)
@@ -0,0 +1,69 @@
+from django.core.management import BaseCommand, CommandError
+
+from attainments.evaluation.models import EVALUATION_MODELS
+
+from .evaluate_disciplines import get_universities
+
+
+class Command(BaseCommand):
+    """
+    A command for checking the Evaluation objects against a full recomputation.
+
+    The results are updated incrementally by the signals, hence the command is
+    meant to be run periodically to detect (and, optionally, repair) the results
+    that drifted, e.g. after the data were changed without sending the signals.
+    """
+
+    help = "Checks the saved results of the disciplines against a full recompute."
+
+    def add_arguments(self, parser):
+        """Define the command arguments."""
+        parser.add_argument(
+            "-u",
+            "--university",
+            nargs="+",
+            type=str,
+            default=None,
+            help="Abbreviations of the universities to check the results of.",
+        )
+        parser.add_argument(
+            "--fix",
+            action="store_true",
+            help="Recompute the results of the tables with any differences.",
+        )
+
+    def handle(self, *args, **options):
+        """Define what does the command do."""
+        universities = get_universities(options["university"])
+        inconsistent = False
+
+        for model in EVALUATION_MODELS:
+            differences = model.objects.find_differences(universities)
+
+            for group, column, expected, saved in differences:
+                self.stdout.write(
+                    self.style.ERROR(
+                        "{} {}: {} is {}, expected {}.".format(
+                            model._meta.verbose_name,
+                            group,
+                            column,
+                            saved,
+                            expected,
+                        )
+                    )
+                )
+
+            if differences and options["fix"]:
+                model.objects.refresh(universities)
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        "Recomputed {}.".format(model._meta.verbose_name_plural)
+                    )
+                )
+            elif differences:
+                inconsistent = True
+
+        if inconsistent:
+            raise CommandError("The saved results are inconsistent.")
+
+        self.stdout.write(self.style.SUCCESS("The saved results are consistent."))
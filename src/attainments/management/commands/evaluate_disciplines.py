@@ -0,0 +1,66 @@
+from django.core.management import BaseCommand, CommandError
+
+from attainments.evaluation.models import EVALUATION_MODELS
+from units.models import University
+
+
+def get_universities(abbreviations):
+    """Return the universities of the given abbreviations, or None if there are none."""
+    if not abbreviations:
+        return None
+
+    universities = list(University.objects.filter(abbreviation__in=abbreviations))
+    missing = set(abbreviations) - {
+        university.abbreviation for university in universities
+    }
+    if missing:
+        raise CommandError(
+            "Unknown universities: {}.".format(", ".join(sorted(missing)))
+        )
+    return universities
+
+
+class Command(BaseCommand):
+    """
+    A command for recomputing the Evaluation objects.
+
+    The results of the disciplines are computed for the given universities, or for
+    all of them, and saved in the tables.
+    """
+
+    help = "Recomputes the results of the disciplines in the evaluation."
+
+    def add_arguments(self, parser):
+        """Define the command arguments."""
+        parser.add_argument(
+            "-u",
+            "--university",
+            nargs="+",
+            type=str,
+            default=None,
+            help="Abbreviations of the universities to recompute the results of.",
+        )
+
+    def handle(self, *args, **options):
+        """Define what does the command do."""
+        universities = get_universities(options["university"])
+
+        for model in EVALUATION_MODELS:
+            evaluations = model.objects.refresh(universities)
+
+            for evaluation in evaluations:
+                self.stdout.write(
+                    "{}: N={}, udział={:.2f}".format(
+                        evaluation,
+                        evaluation.employee_count,
+                        evaluation.share,
+                    )
+                )
+            self.stdout.write(
+                self.style.SUCCESS(
+                    "Recomputed {} {}.".format(
+                        len(evaluations),
+                        model._meta.verbose_name_plural,
+                    )
+                )
+            )
@@ -0,0 +1,10 @@
+from attainments.contributions.exports import ContributionExport
+from extras.exports import ExportCommand
+
+
+class Command(ExportCommand):
+    """A command for exporting the Contribution objects to a CSV or Excel file."""
+
+    help = "Exports the contributions of the authors to the elements."
+
+    export_class = ContributionExport
@@ -0,0 +1,97 @@
+from django.core.management import BaseCommand, CommandError
+
+from attainments.contributions.aliases import SIMILARITY_THRESHOLD
+from attainments.elements.ingestion import ElementImporter
+from attainments.elements.parsers import iter_records
+
+
+class Command(BaseCommand):
+    """
+    A command for importing the elements from the bibliographic files.
+
+    The BibTeX (.bib), RIS (.ris) and CSV (.csv) files are parsed as streams and
+    imported chunk by chunk, see `ElementImporter`.
+    """
+
+    help = "Imports the articles, patents and grants from the bibliographic file."
+
+    def add_arguments(self, parser):
+        """Define the command arguments."""
+        parser.add_argument(
+            "path",
+            type=str,
+            help="Path to the BibTeX, RIS or CSV file.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of records imported within a single transaction.",
+        )
+        parser.add_argument(
+            "--fuzzy",
+            action="store_true",
+            help=(
+                "Match the authors with no exact alias keys on the most similar "
+                "keys, instead of creating the new authors."
+            ),
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=SIMILARITY_THRESHOLD,
+            help="Minimum similarity of the author names matched approximately.",
+        )
+
+    def handle(self, *args, **options):
+        """Define what does the command do."""
+        importer = ElementImporter(
+            batch_size=options["batch_size"],
+            fuzzy=options["fuzzy"],
+            threshold=options["threshold"],
+        )
+
+        def write_chunk(index, report):
+            self.stdout.write(
+                "Chunk {}: read {}, created {}, duplicates {} ({:.0f} rec/s).".format(
+                    index + 1,
+                    report.read,
+                    report.created,
+                    report.duplicates,
+                    report.rate,
+                )
+            )
+
+        try:
+            report = importer.import_records(
+                iter_records(options["path"]),
+                callback=write_chunk,
+            )
+        except ValueError as error:
+            raise CommandError(error)
+
+        for position, message in report.errors:
+            self.stdout.write(
+                self.style.ERROR("Record at line {}: {}".format(position, message))
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                (
+                    "Read: {}, created: {}, duplicates: {}, failed: {}. "
+                    "Authors matched: {} (ambiguous: {}), created: {}. "
+                    "Contributions: {}. Time: {:.1f} s ({:.0f} rec/s)."
+                ).format(
+                    report.read,
+                    report.created,
+                    report.duplicates,
+                    len(report.errors),
+                    report.authors_matched,
+                    report.ambiguous,
+                    report.authors_created,
+                    report.contributions,
+                    report.elapsed,
+                    report.rate,
+                )
+            )
+        )
@@ -0,0 +1,58 @@
+from django.core.management import BaseCommand
+
+from attainments.contributions.aliases import SIMILARITY_THRESHOLD, AuthorMatcher
+
+
+class Command(BaseCommand):
+    """
+    A command for matching the names against the authors and employees.
+
+    The names are read from the text file, one per line, and matched all at once,
+    see `AuthorMatcher`.
+    """
+
+    help = "Matches the names listed in the file against the authors."
+
+    def add_arguments(self, parser):
+        """Define the command arguments."""
+        parser.add_argument(
+            "names",
+            type=str,
+            help="Path to the text file with the names, one per line.",
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=SIMILARITY_THRESHOLD,
+            help="Minimum similarity of the names matched approximately.",
+        )
+
+    def handle(self, *args, **options):
+        """Define what does the command do."""
+        with open(options["names"], encoding="utf-8") as file:
+            names = [line.strip() for line in file if line.strip()]
+
+        for match in AuthorMatcher(options["threshold"]).match(names):
+            if not match.candidates:
+                self.stdout.write(self.style.ERROR("{}: -".format(match.name)))
+                continue
+
+            candidates = ", ".join(
+                (
+                    "autor {}".format(author_id)
+                    if author_id
+                    else "pracownik {}".format(employee_id)
+                )
+                for author_id, employee_id in match.candidates
+            )
+            style = self.style.SUCCESS if match.exact else self.style.WARNING
+            self.stdout.write(
+                style(
+                    "{}: {} ({:.2f}){}".format(
+                        match.name,
+                        candidates,
+                        match.similarity,
+                        ", niejednoznaczne" if match.ambiguous else "",
+                    )
+                )
+            )
@@ -0,0 +1,40 @@
+from django.core.management import BaseCommand
+
+from attainments.models import Author, AuthorAffiliation
+
+
+class Command(BaseCommand):
+    """
+    A command for rebuilding the AuthorAffiliation objects.
+
+    The affiliations are kept up to date by the signals; the command is meant for
+    filling them in for the data existing before, or loaded without the signals.
+    """
+
+    help = "Rebuilds the materialized affiliations of all the authors."
+
+    def add_arguments(self, parser):
+        """Define the command arguments."""
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of authors whose affiliations are rebuilt at once.",
+        )
+
+    def handle(self, *args, **options):
+        """Define what does the command do."""
+        batch_size = options["batch_size"]
+        author_ids = list(Author.objects.order_by("id").values_list("id", flat=True))
+
+        for start in range(0, len(author_ids), batch_size):
+            stop = start + batch_size
+            AuthorAffiliation.objects.refresh(
+                Author.objects.filter(id__in=author_ids[start:stop])
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Rebuilt the affiliations of {} authors.".format(len(author_ids))
+            )
+        )
@@ -0,0 +1,43 @@
+from django.core.management import BaseCommand
+
+from attainments.models import Author, AuthorAlias
+from employees.models import Employee
+
+
+class Command(BaseCommand):
+    """
+    A command for rebuilding the AuthorAlias objects.
+
+    The alias keys are kept up to date by the signals; the command is meant for
+    filling them in for the data existing before, or loaded without the signals.
+    """
+
+    help = "Rebuilds the alias keys of all the authors and employees."
+
+    def add_arguments(self, parser):
+        """Define the command arguments."""
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of authors or employees whose keys are rebuilt at once.",
+        )
+
+    def handle(self, *args, **options):
+        """Define what does the command do."""
+        batch_size = options["batch_size"]
+
+        for model, argument in [(Author, "authors"), (Employee, "employees")]:
+            ids = list(model.objects.order_by("id").values_list("id", flat=True))
+
+            for start in range(0, len(ids), batch_size):
+                stop = start + batch_size
+                AuthorAlias.objects.refresh(
+                    **{argument: model.objects.filter(id__in=ids[start:stop])}
+                )
+
+            self.stdout.write(
+                self.style.SUCCESS(
+                    "Rebuilt the alias keys of {} {}.".format(len(ids), argument)
+                )
+            )
@@ -1 +1,5 @@
-from .contributions.models import Author, Contribution
+from .contributions.models import Author, AuthorAffiliation, AuthorAlias, Contribution
+from .elements.articles.models import Article
+from .elements.grants.models import Grant
+from .elements.patents.models import Patent
+from .evaluation.models import DepartmentEvaluation, DisciplineEvaluation
@@ -0,0 +1,337 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.contrib.contenttypes.models import ContentType
+from django.db import IntegrityError, connection
+from django.test import TestCase
+from django.urls import reverse
+
+from employees.models import Discipline, Employee, Employment
+from extras.caches import invalidate_reference_caches
+from extras.synthetic import SyntheticData
+from units.models import Department, Faculty, University
+
+from .contributions.aliases import AuthorMatcher
+from .elements.ingestion import ElementImporter, bulk_create_with_ids
+from .elements.models import get_title_hash
+from .elements.parsers import make_record
+from .evaluation.models import EVALUATION_MODELS
+from .models import Article, Author, AuthorAffiliation, Contribution
+
+
+class ElementViewTests(TestCase):
+    """A class to represent the tests of the editor of the element contributions."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user("editor", is_staff=True)
+        self.user.user_permissions.add(
+            Permission.objects.get(codename="change_contribution")
+        )
+        self.client.force_login(self.user)
+        self.article = Article.objects.create(title="Artykuł")
+
+    def get_url(self, model, object_id):
+        return reverse(
+            "admin:attainments_contribution_element",
+            args=[ContentType.objects.get_for_model(model).pk, object_id],
+        )
+
+    def test_element_change_permission_is_required(self):
+        url = self.get_url(Article, self.article.pk)
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+        self.user.user_permissions.add(
+            Permission.objects.get(codename="change_article")
+        )
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_only_existing_elements_are_edited(self):
+        self.user.user_permissions.add(
+            Permission.objects.get(codename="change_article")
+        )
+        for url in [
+            self.get_url(get_user_model(), self.user.pk),
+            self.get_url(Article, self.article.pk + 1),
+        ]:
+            response = self.client.post(url, {"form-TOTAL_FORMS": 0})
+            self.assertEqual(response.status_code, 404)
+        self.assertFalse(Contribution.objects.exists())
+
+
+class ContributionInlineTests(TestCase):
+    """A class to represent the tests of the contributions inline to an element."""
+
+    def test_authors_are_rendered_selected(self):
+        self.client.force_login(
+            get_user_model().objects.create_superuser("admin", password=None)
+        )
+        article = Article.objects.create(title="Artykuł")
+        for order, alias in enumerate(["Nowak J.", "Kowal A."], start=1):
+            Contribution.objects.create(
+                content_object=article,
+                author=Author.objects.create(alias=alias),
+                order=order,
+                percentage=50,
+            )
+
+        response = self.client.get(
+            reverse("admin:attainments_article_change", args=[article.pk])
+        )
+        for contribution in article.contributions.all():
+            self.assertContains(
+                response,
+                '<option value="{}" selected>{}</option>'.format(
+                    contribution.author_id, contribution.author
+                ),
+                html=True,
+            )
+
+
+class AffiliationSignalsTests(TestCase):
+    """A class to represent the tests of the refresh of the author affiliations."""
+
+    def setUp(self):
+        university = University.objects.create(name="Uczelnia", abbreviation="U")
+        faculty = Faculty.objects.create(
+            name="Wydział", abbreviation="W", university=university
+        )
+        self.department = Department.objects.create(
+            name="Katedra", abbreviation="K", faculty=faculty
+        )
+        self.authors = []
+        for username in ["jnowak", "akowal"]:
+            employee = Employee.objects.create(
+                user=get_user_model().objects.create_user(username)
+            )
+            self.authors.append(
+                Author.objects.create(employee=employee, alias=username)
+            )
+
+    def get_departments(self):
+        return [
+            AuthorAffiliation.objects.get(author=author).department
+            for author in self.authors
+        ]
+
+    def test_employment_moved_to_another_employee(self):
+        Employment.objects.filter(employee=self.authors[1].employee).delete()
+        employment = Employment.objects.get(employee=self.authors[0].employee)
+        employment.department = self.department
+        employment.save()
+        self.assertEqual(self.get_departments(), [self.department, None])
+
+        employment.employee = self.authors[1].employee
+        employment.save()
+        self.assertEqual(self.get_departments(), [None, self.department])
+
+
+class EvaluationDeltasTests(TestCase):
+    """A class to represent the tests of the incremental updates of the results."""
+
+    def setUp(self):
+        invalidate_reference_caches()
+        with self.captureOnCommitCallbacks(execute=True):
+            SyntheticData(employees=20, seed=0, employees_per_department=5).generate()
+        self.authors = list(
+            Author.objects.filter(employee__isnull=False).order_by("pk")
+        )
+
+    def assertResultsComputed(self):
+        for model in EVALUATION_MODELS:
+            self.assertEqual(model.objects.find_differences(), [])
+
+    def test_deltas_match_computed_results(self):
+        article = Article.objects.create(title="Nowy")
+        for order, author in enumerate(self.authors[:3], start=1):
+            Contribution.objects.create(
+                content_object=article, author=author, order=order, percentage=30
+            )
+        self.assertResultsComputed()
+
+        contribution = article.contributions.get(order=1)
+        contribution.percentage = 40
+        contribution.author = self.authors[5]
+        contribution.save()
+        article.contributions.get(order=2).delete()
+        self.assertResultsComputed()
+
+        employee = self.authors[5].employee
+        employee.discipline = Discipline.objects.exclude(
+            pk=employee.discipline_id
+        ).first()
+        employee.save()
+        employee = self.authors[6].employee
+        employee.in_evaluation = not employee.in_evaluation
+        employee.save()
+        employment = self.authors[7].employee.employment
+        employment.department = Department.objects.exclude(
+            pk=employment.department_id
+        ).first()
+        employment.save()
+        self.assertResultsComputed()
+
+        Article.objects.filter(pk=article.pk).delete()
+        self.authors[8].employee.delete()
+        self.assertResultsComputed()
+
+    def test_untracked_changes_take_no_snapshots(self):
+        employee = self.authors[0].employee
+        employee.orcid = "0000-0000-0000-0000"
+        department = Department.objects.first()
+        department.name = "Katedra"
+
+        with mock.patch("attainments.evaluation.signals.take_snapshot") as snapshot:
+            employee.save()
+            department.save(update_fields=["name"])
+        snapshot.assert_not_called()
+
+
+class AuthorMatcherTests(TestCase):
+    """A class to represent the tests of the matching of the names to the authors."""
+
+    def setUp(self):
+        employee = Employee.objects.create(
+            user=get_user_model().objects.create_user(
+                "jkowalski", first_name="Jan", last_name="Kowalski"
+            )
+        )
+        self.author = Author.objects.create(employee=employee, alias="Kowalski J.")
+        self.namesakes = [
+            Author.objects.create(alias=alias) for alias in ["Nowak A.", "A. Nowak"]
+        ]
+
+    def match(self, name, **kwargs):
+        (match,) = AuthorMatcher(**kwargs).match([name])
+        return match
+
+    def test_exact_match(self):
+        match = self.match("J. Kowalski")
+        self.assertTrue(match.exact)
+        self.assertEqual(match.candidates, [(self.author.pk, self.author.employee_id)])
+        self.assertFalse(match.ambiguous)
+
+    def test_similar_match(self):
+        match = self.match("J. Kowalsky")
+        self.assertFalse(match.exact)
+        self.assertGreater(match.similarity, 0.6)
+        self.assertEqual(match.candidates, [(self.author.pk, self.author.employee_id)])
+
+        match = self.match("J. Kowalsky", threshold=0.8)
+        self.assertEqual(match.candidates, [])
+
+    def test_ambiguous_match(self):
+        match = self.match("Nowak, Anna")
+        self.assertTrue(match.exact)
+        self.assertTrue(match.ambiguous)
+        self.assertEqual(
+            match.candidates, [(author.pk, None) for author in self.namesakes]
+        )
+
+    def test_no_match(self):
+        self.assertEqual(self.match("Zieliński Z.").candidates, [])
+
+
+class ElementImporterTests(TestCase):
+    """A class to represent the tests of the ingestion of the elements."""
+
+    def make_record(self, title, doi=None, authors=("Kowalski J.",)):
+        return make_record(
+            "article",
+            {"title": title, "year": "2024", "doi": doi, "authors": list(authors)},
+            position=1,
+        )
+
+    def test_duplicates_in_chunk(self):
+        report = ElementImporter().import_records(
+            [
+                self.make_record("Pierwszy", doi="10.1/1"),
+                self.make_record("Drugi", doi="10.1/1"),
+                self.make_record("pierwszy "),
+            ]
+        )
+        self.assertEqual((report.created, report.duplicates), (1, 2))
+        self.assertEqual(report.authors_created, 1)
+
+    def test_duplicates_in_database(self):
+        Article.objects.create(title="Pierwszy", year=2024)
+        Article.objects.create(title="Drugi", year=2020, doi="10.1/2")
+
+        report = ElementImporter(batch_size=1).import_records(
+            [
+                self.make_record("Pierwszy"),
+                self.make_record("Inny", doi="10.1/2"),
+                self.make_record("Trzeci", doi="10.1/3"),
+                self.make_record("Trzeci", doi="10.1/3"),
+            ]
+        )
+        self.assertEqual((report.created, report.duplicates), (1, 3))
+
+    def test_rolled_back_chunk_is_imported_again(self):
+        importer = ElementImporter()
+        records = [self.make_record("Pierwszy", doi="10.1/1")]
+
+        with mock.patch(
+            "attainments.elements.ingestion.apply_snapshots", side_effect=RuntimeError
+        ):
+            with self.assertRaises(RuntimeError):
+                importer.import_records(records)
+        self.assertFalse(Article.objects.exists())
+
+        report = importer.import_records(records)
+        self.assertEqual((report.created, report.duplicates), (1, 0))
+        self.assertEqual(
+            Contribution.objects.get().author, Author.objects.get(alias="Kowalski J.")
+        )
+
+
+class BulkCreateWithIdsTests(TestCase):
+    """A class to represent the tests of the bulk creation with the IDs set."""
+
+    def setUp(self):
+        Article.objects.create(title="Artykuł")
+
+        # As with the backends not returning the IDs of the inserted rows
+        features = mock.patch.object(
+            type(connection.features), "can_return_rows_from_bulk_insert", False
+        )
+        features.start()
+        self.addCleanup(features.stop)
+
+    def make_articles(self):
+        return [
+            Article(title=title, title_hash=get_title_hash(title))
+            for title in ["Pierwszy", "Drugi"]
+        ]
+
+    def insert_concurrently(self):
+        """Insert another article along with each bulk insert of the articles."""
+        bulk_create = Article.objects.bulk_create
+
+        def bulk_create_concurrently(objects, **kwargs):
+            Article.objects.create(title="Równoległy")
+            return bulk_create(objects, **kwargs)
+
+        return mock.patch.object(
+            Article.objects, "bulk_create", bulk_create_concurrently
+        )
+
+    def assertTitles(self, articles):
+        self.assertEqual(
+            [Article.objects.get(pk=article.pk).title for article in articles],
+            ["Pierwszy", "Drugi"],
+        )
+
+    def test_ids_are_set(self):
+        self.assertTitles(bulk_create_with_ids(Article, self.make_articles(), 1))
+
+    def test_ids_are_set_by_key_with_concurrent_inserts(self):
+        with self.insert_concurrently():
+            articles = bulk_create_with_ids(
+                Article, self.make_articles(), 10, key=["title_hash"]
+            )
+        self.assertTitles(articles)
+
+    def test_concurrent_inserts_without_key_fail(self):
+        with self.insert_concurrently(), self.assertRaises(IntegrityError):
+            bulk_create_with_ids(Article, self.make_articles(), 10)
@@ -1,7 +1,14 @@
-from django.urls import include, path
+from django.urls import include, path, re_path
+
+from . import views
 
 urlpatterns = [
     path("articles/", include("attainments.elements.articles.urls")),
     path("patents/", include("attainments.elements.patents.urls")),
     path("grants/", include("attainments.elements.grants.urls")),
+    re_path(
+        r"^contributions/export\.(?P<format>csv|xlsx)$",
+        views.contribution_export,
+        name="contribution_export",
+    ),
 ]
@@ -0,0 +1,16 @@
+from django.contrib.admin.views.decorators import staff_member_required
+from django.views.decorators.http import require_GET
+
+from extras.exports import parse_in_evaluation
+
+from .contributions.exports import ContributionExport
+
+
+@require_GET
+@staff_member_required
+def contribution_export(request, format):
+    """Stream the contributions as a CSV or Excel file."""
+    export = ContributionExport(
+        in_evaluation=parse_in_evaluation(request.GET.get("in_evaluation"))
+    )
+    return export.as_response(format)
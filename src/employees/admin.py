@@ -4,6 +4,9 @@ from django.urls import reverse_lazy
 from django.utils.html import format_html
 from django.utils.text import capfirst
 
+from extras.admin import IndexedSearchMixin
+from units.models import Department
+
 from .forms import EmployeeAdminForm
 from .models import (
     Degree,
@@ -89,7 +92,7 @@ class DisciplineAdmin(admin.ModelAdmin):
         ordering="domain__name",
     )
     def domain__name(self, obj):
-        return obj.domain.name
+        return Domain.cached.get(obj.domain_id).name
 
 
 @admin.register(Group)
@@ -133,7 +136,7 @@ class SubgroupAdmin(admin.ModelAdmin):
         ordering="group__name",
     )
     def group__name(self, obj):
-        return obj.group.name
+        return Group.cached.get(obj.group_id).name
 
 
 @admin.register(Position)
@@ -149,29 +152,29 @@ class PositionAdmin(admin.ModelAdmin):
     autocomplete_fields = ["subgroups"]
 
     list_display = ["id", "name", "group__name", "subgroups__name_list"]
-    search_fields = ["id", "name", "abbreviation"]
+    search_fields = ["id", "name"]
     ordering = ["id"]
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).prefetch_subgroups()
+
     @admin.display(
         description=capfirst(Position._meta.get_field("subgroups").verbose_name)
     )
     def subgroups__name_list(self, obj):
         return format_html(
-            "<br>".join(
-                [
-                    subgroup.name
-                    for subgroup in obj.subgroups.order_by("group__name", "name").all()
-                ]
-            )
+            "<br>".join([subgroup.name for subgroup in obj.get_ordered_subgroups()])
         )
 
     @admin.display(description=capfirst(Group._meta.verbose_name))
     def group__name(self, obj):
-        return obj.group.name
+        group = obj.group
+        if group:
+            return group.name
 
 
 @admin.register(Employee)
-class EmployeeAdmin(admin.ModelAdmin):
+class EmployeeAdmin(IndexedSearchMixin, admin.ModelAdmin):
     """Admin options for the Employee model."""
 
     class Media:
@@ -222,12 +225,22 @@ class EmployeeAdmin(admin.ModelAdmin):
         "employment__position__name",
         "employment__department__abbreviation",
     ]
+    list_select_related = [
+        "user",
+        "degree",
+        "status",
+        "discipline__domain",
+        "employment__subgroup__group",
+        "employment__position",
+        "employment__department",
+    ]
     search_fields = [
         "id",
         "user__last_name",
         "user__first_name",
         "user__email",
     ]
+    autocomplete_select_related = ["user"]
     ordering = ["id"]
 
     def get_inlines(self, request, obj):
@@ -374,7 +387,7 @@ class EmployeeAdmin(admin.ModelAdmin):
 
 
 @admin.register(Employment)
-class EmploymentAdmin(admin.ModelAdmin):
+class EmploymentAdmin(IndexedSearchMixin, admin.ModelAdmin):
     """Admin options for the Employment model."""
 
     fieldsets = [
@@ -402,7 +415,10 @@ class EmploymentAdmin(admin.ModelAdmin):
         "position__name",
         "department__name",
     ]
+    list_select_related = ["employee__user"]
     search_fields = ["id", "employee__user__last_name", "employee__user__first_name"]
+    search_index_path = "employee"
+    autocomplete_select_related = ["employee__user"]
     ordering = ["id"]
 
     @admin.display(
@@ -414,29 +430,33 @@ class EmploymentAdmin(admin.ModelAdmin):
         ordering="subgroup__group__name",
     )
     def subgroup__group__name(self, obj):
-        if obj.subgroup:
-            return obj.subgroup.group.name
+        subgroup = Subgroup.cached.get(obj.subgroup_id)
+        if subgroup:
+            return Group.cached.get(subgroup.group_id).name
 
     @admin.display(
         description=capfirst(Employment._meta.get_field("subgroup").verbose_name),
         ordering="subgroup__name",
     )
     def subgroup__name(self, obj):
-        if obj.subgroup:
-            return obj.subgroup.name
+        subgroup = Subgroup.cached.get(obj.subgroup_id)
+        if subgroup:
+            return subgroup.name
 
     @admin.display(
         description=capfirst(Employment._meta.get_field("position").verbose_name),
         ordering="position__name",
     )
     def position__name(self, obj):
-        if obj.position:
-            return obj.position.name
+        position = Position.cached.get(obj.position_id)
+        if position:
+            return position.name
 
     @admin.display(
         description=capfirst(Employment._meta.get_field("department").verbose_name),
         ordering="department__name",
     )
     def department__name(self, obj):
-        if obj.department:
-            return obj.department.name
+        department = Department.cached.get(obj.department_id)
+        if department:
+            return department.name
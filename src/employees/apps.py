@@ -7,4 +7,4 @@ class EmployeesConfig(AppConfig):
     verbose_name = "Kadra"
 
     def ready(self):
-        from . import signals
+        from . import search, signals
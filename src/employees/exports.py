@@ -0,0 +1,49 @@
+from accounts.models import User
+from extras.exports import TableExport
+
+from .admin import EmployeeAdmin
+from .models import Domain, Employee, Employment, Group
+
+
+class EmployeeExport(TableExport):
+    """A class to represent the export of the Employee objects."""
+
+    name = "employees"
+    columns = [
+        ("ID", "id"),
+        (User._meta.get_field("last_name").verbose_name, "user.last_name"),
+        (User._meta.get_field("first_name").verbose_name, "user.first_name"),
+        (User._meta.get_field("email").verbose_name, "user.email"),
+        (Employee._meta.get_field("sex").verbose_name, "sex"),
+        (Employee._meta.get_field("degree").verbose_name, "degree.abbreviation"),
+        (Employee._meta.get_field("status").verbose_name, "status.name"),
+        (Employee._meta.get_field("in_evaluation").verbose_name, "in_evaluation"),
+        (Domain._meta.verbose_name, "discipline.domain.name"),
+        (Employee._meta.get_field("discipline").verbose_name, "discipline.name"),
+        (Employee._meta.get_field("orcid").verbose_name, "orcid"),
+        (
+            Employment._meta.get_field("position").verbose_name,
+            "employment.position.name",
+        ),
+        (Group._meta.verbose_name, "employment.subgroup.group.name"),
+        (
+            Employment._meta.get_field("subgroup").verbose_name,
+            "employment.subgroup.name",
+        ),
+        (
+            Employment._meta.get_field("department").verbose_name,
+            "employment.department.name",
+        ),
+    ]
+
+    def __init__(self, in_evaluation=None):
+        self.in_evaluation = in_evaluation
+
+    def get_queryset(self):
+        # The joins are the same as on the admin changelist
+        queryset = Employee.objects.select_related(
+            *EmployeeAdmin.list_select_related
+        ).order_by("id")
+        if self.in_evaluation is not None:
+            queryset = queryset.filter(in_evaluation=self.in_evaluation)
+        return queryset
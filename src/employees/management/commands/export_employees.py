@@ -0,0 +1,10 @@
+from employees.exports import EmployeeExport
+from extras.exports import ExportCommand
+
+
+class Command(ExportCommand):
+    """A command for exporting the Employee objects to a CSV or Excel file."""
+
+    help = "Exports the employees along with their employments."
+
+    export_class = EmployeeExport
@@ -72,6 +72,19 @@ class Subgroup(NamedModel):
         verbose_name_plural = "podgrupy"
 
 
+class PositionQuerySet(models.QuerySet):
+    """A class to represent the querysets of the Position objects."""
+
+    def prefetch_subgroups(self):
+        """Prefetch the subgroups of the positions together with their groups."""
+        return self.prefetch_related(
+            models.Prefetch(
+                "subgroups",
+                queryset=Subgroup.objects.select_related("group"),
+            )
+        )
+
+
 class Position(NamedModel):
     """A class to represent the Position objects."""
 
@@ -82,18 +95,29 @@ class Position(NamedModel):
         blank=True,
     )
 
+    objects = PositionQuerySet.as_manager()
+
     class Meta:
         verbose_name = "stanowisko"
         verbose_name_plural = "stanowiska"
 
+    # The methods below iterate over `subgroups.all()` only, so that they are
+    # served from the cache if the subgroups have been prefetched, see
+    # `PositionQuerySet.prefetch_subgroups()`.
+
     def has_valid_subgroups(self):
-        subgroup_ids = self.subgroups.all().values_list("group", flat=True)
-        return len(list(set(subgroup_ids))) == 1
+        return len({subgroup.group_id for subgroup in self.subgroups.all()}) == 1
+
+    def get_ordered_subgroups(self):
+        return sorted(
+            self.subgroups.all(),
+            key=lambda subgroup: (subgroup.group.name, subgroup.name),
+        )
 
     @property
     def group(self):
         if self.has_valid_subgroups():
-            return self.subgroups.first().group
+            return self.subgroups.all()[0].group
 
 
 class Employee(models.Model):
@@ -158,9 +182,10 @@ class Employee(models.Model):
         verbose_name_plural = "pracownicy"
 
     def __str__(self):
+        degree = Degree.cached.get(self.degree_id)
         return "{}{}".format(
             self.user.get_full_name(),
-            f", {self.degree}" if self.degree else "",
+            f", {degree}" if degree else "",
         )
 
     @property
@@ -214,7 +239,8 @@ class Employment(models.Model):
         verbose_name_plural = "zatrudnienia"
 
     def __str__(self):
+        department = Department.cached.get(self.department_id)
         return "{} ({})".format(
             self.employee.user.get_full_name(),
-            self.department.abbreviation if self.department else "-",
+            department.abbreviation if department else "-",
         )
@@ -0,0 +1,8 @@
+from extras.search import search_index
+
+from .models import Employee
+
+search_index.register(
+    Employee,
+    ["user__first_name", "user__last_name", "user__email", "orcid"],
+)
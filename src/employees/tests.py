@@ -0,0 +1,179 @@
+import csv
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from extras.caches import invalidate_reference_caches
+from extras.synthetic import SyntheticData
+
+from .admin import EmployeeAdmin
+from .models import Employee, Group, Position, Subgroup
+
+
+class EmployeeAdminTests(TestCase):
+    """A class to represent the tests of the EmployeeAdmin pages."""
+
+    def setUp(self):
+        # The caches are not invalidated by the rolled back data of the other tests
+        invalidate_reference_caches()
+        user = get_user_model().objects.create_superuser("admin")
+        self.client.force_login(user)
+
+    def generate(self, employees, seed):
+        # The caches are invalidated once the data are committed
+        with self.captureOnCommitCallbacks(execute=True):
+            SyntheticData(employees=employees, seed=seed).generate()
+
+    def count_changelist_queries(self):
+        """Return the numbers of the queries and of the rows of the changelist."""
+        url = reverse("admin:employees_employee_changelist")
+
+        # The first request loads the caches of the reference tables
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        return len(context), len(response.context["cl"].result_list)
+
+    @mock.patch.object(EmployeeAdmin, "list_per_page", 1000)
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        self.generate(10, seed=0)
+        self.assertEqual(Employee.objects.count(), 10)
+        queries, rows = self.count_changelist_queries()
+        self.assertEqual(rows, 10)
+
+        self.generate(990, seed=1)
+        self.assertEqual(Employee.objects.count(), 1000)
+        self.assertEqual(self.count_changelist_queries(), (queries, 1000))
+
+
+class PositionTests(TestCase):
+    """A class to represent the tests of the subgroups of the Position objects."""
+
+    def test_group_is_read_from_prefetched_subgroups(self):
+        groups = [Group.objects.create(name=name) for name in ["A", "B"]]
+        subgroups = [
+            Subgroup.objects.create(name=name, group=group)
+            for name, group in [("A1", groups[0]), ("A2", groups[0]), ("B1", groups[1])]
+        ]
+        valid = Position.objects.create(name="Adiunkt")
+        valid.subgroups.set(subgroups[:2])
+        invalid = Position.objects.create(name="Asystent")
+        invalid.subgroups.set(subgroups[1:])
+        Position.objects.create(name="Profesor")
+
+        with self.assertNumQueries(2):
+            positions = Position.objects.prefetch_subgroups().order_by("name")
+            self.assertEqual(
+                [
+                    (position.has_valid_subgroups(), position.group)
+                    for position in positions
+                ],
+                [(True, groups[0]), (False, None), (False, None)],
+            )
+
+
+class EmployeeExportTests(TestCase):
+    """A class to represent the tests of the export of the employees."""
+
+    def setUp(self):
+        invalidate_reference_caches()
+        self.client.force_login(get_user_model().objects.create_superuser("admin"))
+        self.employees = {
+            in_evaluation: Employee.objects.create(
+                user=get_user_model().objects.create_user(f"user-{in_evaluation}"),
+                in_evaluation=in_evaluation,
+            )
+            for in_evaluation in [True, False]
+        }
+
+    def get_export(self, in_evaluation):
+        return self.client.get(
+            reverse("employees:employee_export", args=["csv"]),
+            {"in_evaluation": in_evaluation},
+        )
+
+    def get_exported_ids(self, in_evaluation):
+        response = self.get_export(in_evaluation)
+        self.assertEqual(response.status_code, 200)
+        rows = csv.reader(b"".join(response.streaming_content).decode().splitlines())
+        next(rows)
+        return [int(row[0]) for row in rows]
+
+    def test_in_evaluation_filter(self):
+        for value in ["yes", "Tak", "1"]:
+            self.assertEqual(self.get_exported_ids(value), [self.employees[True].pk])
+        for value in ["no", "nie", "0"]:
+            self.assertEqual(self.get_exported_ids(value), [self.employees[False].pk])
+        self.assertEqual(
+            self.get_exported_ids(""),
+            [employee.pk for employee in self.employees.values()],
+        )
+
+    def test_invalid_in_evaluation_filter(self):
+        self.assertEqual(self.get_export("maybe").status_code, 400)
+
+
+class EmployeeApiTests(TestCase):
+    """A class to represent the tests of the JSON API of the employees."""
+
+    def setUp(self):
+        invalidate_reference_caches()
+        self.client.force_login(get_user_model().objects.create_superuser("admin"))
+        self.employees = [
+            Employee.objects.create(
+                user=get_user_model().objects.create_user(
+                    f"user-{index}", last_name=f"Nowak {index}"
+                )
+            )
+            for index in range(3)
+        ]
+        self.url = reverse("employees:employee_list")
+
+    def get(self, **params):
+        return self.client.get(self.url, params)
+
+    def test_pages_follow_cursor(self):
+        ids = []
+        response = self.get(limit=2, fields="id")
+        while True:
+            self.assertEqual(response.status_code, 200)
+            data = response.json()
+            ids.extend(result["id"] for result in data["results"])
+            if data["next"] is None:
+                break
+            response = self.client.get(data["next"])
+        self.assertEqual(ids, [employee.pk for employee in self.employees])
+
+        data = self.get(cursor=self.employees[0].pk, limit=1, fields="id").json()
+        self.assertEqual(data["results"], [{"id": self.employees[1].pk}])
+
+    def test_invalid_limit(self):
+        for limit in ["0", "-1", "x"]:
+            self.assertEqual(self.get(limit=limit).status_code, 400)
+
+    def test_fields(self):
+        data = self.get(limit=1, fields="id,last_name").json()
+        self.assertEqual(
+            data["results"], [{"id": self.employees[0].pk, "last_name": "Nowak 0"}]
+        )
+        self.assertEqual(self.get(fields="id,password").status_code, 400)
+
+    def test_unchanged_page_is_not_sent(self):
+        response = self.get()
+        etag = response["ETag"]
+
+        response = self.client.get(self.url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+        self.employees[0].user.last_name = "Kowal"
+        self.employees[0].user.save()
+        response = self.client.get(self.url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
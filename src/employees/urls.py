@@ -1,3 +1,14 @@
+from django.urls import path, re_path
+
+from . import views
+
 app_name = "employees"
 
-urlpatterns = []
+urlpatterns = [
+    path("api/", views.employee_list, name="employee_list"),
+    re_path(
+        r"^export\.(?P<format>csv|xlsx)$",
+        views.employee_export,
+        name="employee_export",
+    ),
+]
@@ -0,0 +1,130 @@
+import hashlib
+import json
+
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse, HttpResponseBadRequest, JsonResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import urlencode
+from django.views.decorators.http import require_GET
+
+from extras.exports import parse_in_evaluation
+from extras.routers import read_from_replica
+
+from .exports import EmployeeExport
+from .models import Employee
+
+# The fields available in the API along with the lookups they are read with;
+# only the relations required by the requested fields are joined.
+EMPLOYEE_API_FIELDS = {
+    "id": "id",
+    "username": "user__username",
+    "first_name": "user__first_name",
+    "last_name": "user__last_name",
+    "email": "user__email",
+    "sex": "sex",
+    "degree": "degree__abbreviation",
+    "status": "status__abbreviation",
+    "in_evaluation": "in_evaluation",
+    "domain": "discipline__domain__abbreviation",
+    "discipline": "discipline__abbreviation",
+    "orcid": "orcid",
+    "group": "employment__subgroup__group__abbreviation",
+    "subgroup": "employment__subgroup__abbreviation",
+    "position": "employment__position__name",
+    "department": "employment__department__abbreviation",
+    "faculty": "employment__department__faculty__abbreviation",
+    "university": "employment__department__faculty__university__abbreviation",
+}
+
+API_PAGE_SIZE = 100
+
+API_MAX_PAGE_SIZE = 1000
+
+
+def get_positive_int(request, name, default):
+    value = request.GET.get(name)
+    if value is None:
+        return default
+    if not value.isdigit():
+        raise ValueError(f"Parameter '{name}' has to be a non-negative integer.")
+    return int(value)
+
+
+@require_GET
+@staff_member_required
+@read_from_replica()
+def employee_list(request):
+    """
+    Return the employees as JSON, along with their employments.
+
+    The list is paginated by keyset: each page holds the employees with IDs
+    greater than the `cursor` parameter and links to the next page, if any.
+    The `fields` parameter is the comma-separated list of the fields to return
+    (by default, all the fields). The responses carry ETags of their contents,
+    so that unchanged pages are not sent again; the pages are still read and
+    serialized to compute them. The employees are read from the replicas, if
+    there are any.
+    """
+    try:
+        cursor = get_positive_int(request, "cursor", 0)
+        limit = min(
+            get_positive_int(request, "limit", API_PAGE_SIZE), API_MAX_PAGE_SIZE
+        )
+    except ValueError as error:
+        return JsonResponse({"error": str(error)}, status=400)
+    if limit < 1:
+        return JsonResponse(
+            {"error": "Parameter 'limit' has to be positive."}, status=400
+        )
+
+    fields = request.GET.get("fields")
+    fields = fields.split(",") if fields else list(EMPLOYEE_API_FIELDS)
+    unknown_fields = [field for field in fields if field not in EMPLOYEE_API_FIELDS]
+    if unknown_fields:
+        return JsonResponse(
+            {"error": "Unknown fields: {}.".format(", ".join(unknown_fields))},
+            status=400,
+        )
+
+    lookups = {EMPLOYEE_API_FIELDS[field]: field for field in fields}
+    rows = list(
+        Employee.objects.filter(id__gt=cursor)
+        .order_by("id")
+        .values_list("id", *lookups)[: limit + 1]
+    )
+
+    next_url = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_url = "{}?{}".format(
+            request.path,
+            urlencode({**request.GET.dict(), "cursor": rows[-1][0]}),
+        )
+
+    payload = json.dumps(
+        {
+            "results": [dict(zip(lookups.values(), row[1:])) for row in rows],
+            "next": next_url,
+        },
+        cls=DjangoJSONEncoder,
+    ).encode()
+    etag = '"{}"'.format(hashlib.md5(payload).hexdigest())
+
+    response = get_conditional_response(request, etag=etag) or HttpResponse(
+        payload,
+        content_type="application/json",
+    )
+    response["ETag"] = etag
+    return response
+
+
+@require_GET
+@staff_member_required
+def employee_export(request, format):
+    """Stream the employees as a CSV or Excel file."""
+    try:
+        in_evaluation = parse_in_evaluation(request.GET.get("in_evaluation"))
+    except ValueError as error:
+        return HttpResponseBadRequest(str(error))
+    return EmployeeExport(in_evaluation=in_evaluation).as_response(format)
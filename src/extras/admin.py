@@ -0,0 +1,22 @@
+from .search import search_index
+
+
+class IndexedSearchMixin:
+    """
+    A class to represent the admin options searching with the search index.
+
+    The objects, or the related objects given by `search_index_path`, have to be
+    registered in the search index, see `extras.search`. The searches by the
+    numeric IDs are supported as well.
+    """
+
+    search_index_path = "pk"
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip():
+            return super().get_search_results(request, queryset, search_term)
+
+        results = search_index.filter(queryset, search_term, self.search_index_path)
+        if search_term.strip().isdigit():
+            results = results | queryset.filter(pk=int(search_term))
+        return results, False
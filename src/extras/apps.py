@@ -5,3 +5,11 @@ class ExtrasConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "extras"
     verbose_name = "Dodatki"
+
+    def ready(self):
+        from .autocomplete import connect_autocomplete
+        from .caches import connect_reference_caches
+
+        # The models are registered in the admin by now, see `INSTALLED_APPS`
+        connect_autocomplete()
+        connect_reference_caches()
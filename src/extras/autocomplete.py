@@ -0,0 +1,171 @@
+import hashlib
+import json
+from functools import partial
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.admin.views import autocomplete
+from django.core.cache import caches
+from django.core.exceptions import PermissionDenied
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.http import HttpResponse
+from django.utils.text import smart_split, unescape_string_literal
+
+from .caches import TableCache
+from .text import fold
+
+
+def get_cache():
+    return caches[getattr(settings, "AUTOCOMPLETE_CACHE_ALIAS", "default")]
+
+
+def get_version_key(model):
+    return "autocomplete-version:{}".format(model._meta.label_lower)
+
+
+class AutocompleteJsonView(autocomplete.AutocompleteJsonView):
+    """
+    A class to represent the view serving the admin autocomplete fields.
+
+    The responses are cached by the model, the field and the typed term for
+    `AUTOCOMPLETE_CACHE_TIMEOUT` seconds, and invalidated whenever an object of
+    the model is saved or deleted. The texts of the results depending on other
+    models (e.g. the names of the users of the employees) may hence be stale for
+    the timeout at most.
+
+    The reference tables (see `extras.caches`) are searched in memory, with no
+    queries at all. The other tables are searched by the `get_search_results()`
+    method of their admin, i.e. with the indexed search, see `extras.admin`, with
+    the relations listed in the `autocomplete_select_related` attribute of the
+    admin selected along.
+    """
+
+    def get(self, request, *args, **kwargs):
+        self.term, self.model_admin, self.source_field, to_field_name = (
+            self.process_request(request)
+        )
+
+        if not self.has_perm(request):
+            raise PermissionDenied
+
+        cache = get_cache()
+        key = self.get_cache_key(to_field_name, cache)
+        payload = cache.get(key)
+
+        if payload is None:
+            if self.is_cached_table():
+                self.object_list = self.get_cached_objects()
+            else:
+                self.object_list = self.get_queryset()
+            context = self.get_context_data()
+            payload = json.dumps(
+                {
+                    "results": [
+                        self.serialize_result(obj, to_field_name)
+                        for obj in context["object_list"]
+                    ],
+                    "pagination": {"more": context["page_obj"].has_next()},
+                }
+            ).encode()
+            cache.set(
+                key,
+                payload,
+                timeout=getattr(settings, "AUTOCOMPLETE_CACHE_TIMEOUT", 30),
+            )
+
+        return HttpResponse(payload, content_type="application/json")
+
+    def get_cache_key(self, to_field_name, cache):
+        model = self.model_admin.model
+        version = cache.get(get_version_key(model), 0)
+        digest = hashlib.md5(
+            "\n".join(
+                [
+                    self.source_field.model._meta.label_lower,
+                    self.source_field.name,
+                    to_field_name,
+                    self.term,
+                    self.request.GET.get("page", ""),
+                ]
+            ).encode()
+        ).hexdigest()
+        return "autocomplete:{}:{}:{}".format(model._meta.label_lower, version, digest)
+
+    def is_cached_table(self):
+        return (
+            isinstance(getattr(self.model_admin.model, "cached", None), TableCache)
+            and not self.source_field.get_limit_choices_to()
+        )
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        select_related = getattr(self.model_admin, "autocomplete_select_related", [])
+        return queryset.select_related(*select_related) if select_related else queryset
+
+    def get_cached_objects(self):
+        """
+        Return the list of the objects of the reference table matching the term.
+
+        As in `ModelAdmin.get_search_results()`, each word of the term has to be
+        contained in any of the search fields, here regardless of the diacritics.
+        """
+        field_names = [
+            field_name.lstrip("^=@")
+            for field_name in self.model_admin.get_search_fields(self.request)
+        ]
+        words = [
+            fold(unescape_string_literal(word) if word[0] in "\"'" else word)
+            for word in smart_split(self.term)
+        ]
+
+        objects = []
+        for obj in self.model_admin.model.cached.all():
+            text = fold(
+                " ".join(str(getattr(obj, name, "") or "") for name in field_names)
+            )
+            if all(word in text for word in words):
+                objects.append(obj)
+
+        # Only the plain fields of the ordering are supported in memory
+        for field_name in reversed(self.model_admin.get_ordering(self.request) or []):
+            name = field_name.lstrip("-")
+            if "__" not in name and name != "?":
+                objects.sort(
+                    key=lambda obj: (getattr(obj, name) is None, getattr(obj, name)),
+                    reverse=field_name.startswith("-"),
+                )
+
+        return objects
+
+
+def increment_version(model):
+    """Increment the version of the cached autocomplete results of the model."""
+    cache = get_cache()
+    cache.add(get_version_key(model), 0, timeout=None)
+    cache.incr(get_version_key(model))
+
+
+def invalidate_autocomplete(sender, using=None, **kwargs):
+    """
+    Invalidate the cached autocomplete results of the sender model.
+
+    The results are invalidated once the changes are committed, as otherwise the
+    results of the concurrent requests, still without the changes, could be
+    cached under the new version.
+    """
+    if admin.site.is_registered(sender):
+        transaction.on_commit(partial(increment_version, sender), using=using)
+
+
+def connect_autocomplete():
+    """Connect the invalidation of the results to the signals of the admin models."""
+    for model in apps.get_models():
+        if admin.site.is_registered(model):
+            for signal in [post_save, post_delete]:
+                signal.connect(
+                    invalidate_autocomplete,
+                    sender=model,
+                    dispatch_uid=f"autocomplete-{model._meta.label_lower}",
+                )
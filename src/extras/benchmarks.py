@@ -0,0 +1,334 @@
+import csv
+import fnmatch
+import json
+import math
+import subprocess
+import tempfile
+import time
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from datetime import datetime
+from io import StringIO
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management import call_command
+from django.db import connection, connections, transaction
+from django.db.models import Count, Max, Sum
+from django.test import Client, RequestFactory
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils.http import urlencode
+
+from accounts.importers import FIELD_NAMES
+from attainments.evaluation.models import EVALUATION_MODELS
+from attainments.models import Article, Author, Contribution
+from employees.models import Employee
+from units.models import Department
+
+from .instrumentation import QueryRecorder
+from .routers import track_writes
+
+# The models whose numbers of objects are stored along with the results
+COUNTED_MODELS = [get_user_model(), Employee, Department, Author, Article, Contribution]
+
+
+@dataclass
+class BenchmarkResult:
+    """A class to represent the timings of a single benchmark."""
+
+    name: str
+    times: list = field(default_factory=list)
+    queries: int = 0
+    error: str = None
+
+    @property
+    def median(self):
+        times = sorted(self.times)
+        middle = len(times) // 2
+        return (times[middle] + times[~middle]) / 2
+
+    @property
+    def p95(self):
+        times = sorted(self.times)
+        return times[max(0, math.ceil(0.95 * len(times)) - 1)]
+
+    def as_dict(self):
+        if self.error:
+            return {"error": self.error}
+        return {
+            "median": round(self.median * 1000, 2),
+            "p95": round(self.p95 * 1000, 2),
+            "min": round(min(self.times) * 1000, 2),
+            "queries": self.queries,
+        }
+
+
+class BenchmarkSuite:
+    """
+    A class to represent the benchmarks of the project run against the database.
+
+    The benchmarks cover:
+
+    - the changelists of all the registered admins, along with their searches
+      and their autocomplete fields (with the results cache disabled);
+    - the requests through the WSGI handler, with a new database connection per
+      request and with a persistent one;
+    - the `load_users` command, importing `users` new users in streaming mode
+      within a transaction rolled back afterwards;
+    - the aggregations of the employees and of the contributions, and the
+      computation of the evaluation results.
+
+    Each benchmark is run once to warm up and then timed `repeat` times, the
+    queries of its last run being counted. The failing benchmarks are reported
+    with their errors. The data are meant to be generated with the `generate_data`
+    command beforehand.
+
+    The pages are requested as an existing superuser, or as a temporary one
+    deleted afterwards, with the sessions stored in the signed cookies, so that
+    the benchmarks leave no rows behind.
+    """
+
+    def __init__(self, repeat=5, search_term="kowal", users=200):
+        self.repeat = repeat
+        self.search_term = search_term
+        self.users = users
+
+    def get_client(self, stack):
+        User = get_user_model()
+        user = User.objects.filter(is_superuser=True, is_active=True).first()
+        if user is None:
+            user = User.objects.create_superuser("benchmark", password=None)
+            stack.callback(user.delete)
+        client = Client()
+        client.force_login(user)
+        return client
+
+    def get_cases(self, client):
+        """Return the dictionary of the benchmarked callables by name."""
+        cases = {}
+
+        def get_page(url):
+            def view():
+                response = client.get(url)
+                if response.status_code != 200:
+                    raise RuntimeError(f"{url} returned {response.status_code}.")
+
+            return view
+
+        for model, model_admin in admin.site._registry.items():
+            label = model._meta.label_lower
+            url = reverse(
+                f"admin:{model._meta.app_label}_{model._meta.model_name}_changelist"
+            )
+            cases[f"changelist:{label}"] = get_page(url)
+            if model_admin.search_fields:
+                cases[f"search:{label}"] = get_page(
+                    "{}?{}".format(url, urlencode({"q": self.search_term}))
+                )
+            for field_name in model_admin.autocomplete_fields:
+                query = {
+                    "app_label": model._meta.app_label,
+                    "model_name": model._meta.model_name,
+                    "field_name": field_name,
+                    "term": self.search_term[:2],
+                }
+                cases[f"autocomplete:{label}.{field_name}"] = get_page(
+                    "{}?{}".format(reverse("admin:autocomplete"), urlencode(query))
+                )
+
+        # The requests through the WSGI handler, opening a new connection for
+        # each of them or reusing the persistent one
+        cases["request:new-connection"] = self.get_request(client, 0)
+        cases["request:persistent-connection"] = self.get_request(client, None)
+
+        cases["load_users"] = self.load_users
+        cases["aggregate:employees-by-department"] = lambda: list(
+            Employee.objects.values("employment__department").annotate(Count("id"))
+        )
+        cases["aggregate:contributions-by-discipline"] = lambda: list(
+            Contribution.objects.values("author__employee__discipline").annotate(
+                Count("id"), Sum("percentage")
+            )
+        )
+        for model in EVALUATION_MODELS:
+            cases[f"aggregate:{model._meta.label_lower}"] = model.objects.compute
+
+        return cases
+
+    def get_request(self, client, max_age):
+        """
+        Return the request of the units tree with the given `CONN_MAX_AGE`.
+
+        Contrary to the test client, the WSGI handler closes the connections of
+        the expired age at the end of each request, as the server does.
+        """
+        handler = WSGIHandler()
+        cookie = "; ".join(
+            f"{key}={morsel.value}" for key, morsel in client.cookies.items()
+        )
+        url = reverse("units:tree")
+        state = {"prepared": False}
+
+        def request():
+            settings_dict = connection.settings_dict
+            conn_max_age = settings_dict["CONN_MAX_AGE"]
+            settings_dict["CONN_MAX_AGE"] = max_age
+            try:
+                # The connection opened with another age is closed first
+                if not state["prepared"]:
+                    connection.close()
+                    state["prepared"] = True
+
+                environ = RequestFactory().get(url, HTTP_COOKIE=cookie).environ
+                response = handler(environ, lambda status, headers: None)
+                response.close()
+                if response.status_code != 200:
+                    raise RuntimeError(f"{url} returned {response.status_code}.")
+            finally:
+                settings_dict["CONN_MAX_AGE"] = conn_max_age
+
+        return request
+
+    def load_users(self):
+        with transaction.atomic():
+            call_command(
+                "load_users",
+                self.users_path,
+                "--stream",
+                "--checkpoint",
+                str(Path(self.users_path).with_suffix(".checkpoint.json")),
+                stdout=StringIO(),
+            )
+            transaction.set_rollback(True)
+
+    def write_users(self, directory):
+        """Write the data file of the new users imported by `load_users`."""
+        User = get_user_model()
+        first_id = (User.objects.aggregate(Max("id"))["id__max"] or 0) + 1
+        self.users_path = str(Path(directory) / "users.csv")
+
+        with open(self.users_path, "w", newline="") as file:
+            writer = csv.DictWriter(file, FIELD_NAMES)
+            writer.writeheader()
+            for index in range(first_id, first_id + self.users):
+                writer.writerow(
+                    {
+                        "id": index,
+                        "username": f"benchmark-{index}",
+                        "password": f"benchmark-{index}",
+                        "first_name": "Jan",
+                        "last_name": f"Nowak {index}",
+                        "email": f"benchmark-{index}@example.com",
+                        "is_staff": False,
+                        "is_superuser": False,
+                    }
+                )
+
+    def run(self, patterns=None, callback=None):
+        """
+        Run the benchmarks matching any of the (shell-style) name patterns.
+
+        The `callback`, if given, is called with each result.
+        """
+        results = []
+
+        with ExitStack() as stack:
+            stack.enter_context(
+                override_settings(
+                    ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"],
+                    AUTOCOMPLETE_CACHE_TIMEOUT=0,
+                    SESSION_ENGINE="django.contrib.sessions.backends.signed_cookies",
+                )
+            )
+            stack.enter_context(track_writes())
+            self.write_users(stack.enter_context(tempfile.TemporaryDirectory()))
+
+            for name, case in self.get_cases(self.get_client(stack)).items():
+                if patterns and not any(
+                    fnmatch.fnmatch(name, pattern) for pattern in patterns
+                ):
+                    continue
+
+                result = BenchmarkResult(name)
+                try:
+                    self.time_case(case, result)
+                except Exception as error:
+                    result.error = f"{type(error).__name__}: {error}"
+
+                results.append(result)
+                if callback is not None:
+                    callback(result)
+
+        return results
+
+    def time_case(self, case, result):
+        # The writes of a case do not send the reads of the following ones to
+        # the primary database
+        with track_writes():
+            case()
+        for index in range(self.repeat):
+            recorder = QueryRecorder(slow_query_threshold=math.inf)
+            with ExitStack() as stack:
+                stack.enter_context(track_writes())
+                for database in connections.all():
+                    stack.enter_context(database.execute_wrapper(recorder))
+                start = time.perf_counter()
+                case()
+                result.times.append(time.perf_counter() - start)
+            result.queries = recorder.count
+
+
+def get_commit():
+    """Return the current commit of the repository, or None if it is unknown."""
+    try:
+        process = subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return process.stdout.strip()
+
+
+def make_record(results):
+    """Return the stored record of the results, along with their environment."""
+    return {
+        "commit": get_commit(),
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "database": connection.vendor,
+        "rows": {model._meta.label: model.objects.count() for model in COUNTED_MODELS},
+        "results": {result.name: result.as_dict() for result in results},
+    }
+
+
+def save_record(path, record):
+    """Append the record to the JSON Lines file of the results."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a") as file:
+        file.write(json.dumps(record) + "\n")
+
+
+def load_record(path, commit=None):
+    """
+    Return the last stored record of the commit (by prefix), or the last one.
+
+    Returns None if there is no such record.
+    """
+    try:
+        with open(path) as file:
+            records = [json.loads(line) for line in file if line.strip()]
+    except FileNotFoundError:
+        return None
+
+    for record in reversed(records):
+        if commit is None or (record["commit"] or "").startswith(commit):
+            return record
+    return None
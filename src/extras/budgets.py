@@ -0,0 +1,173 @@
+import math
+from contextlib import ExitStack
+from dataclasses import dataclass
+
+from django.contrib import admin
+from django.db import connections
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils.http import urlencode
+
+from attainments.elements.ingestion import get_percentages
+from attainments.models import Article, Author, Contribution
+
+from .instrumentation import QueryRecorder
+
+# The query budgets of the admin pages, unless declared by the admins with the
+# `query_budgets` attribute, e.g. `query_budgets = {"changelist": 8}`
+DEFAULT_QUERY_BUDGETS = {"changelist": 10, "change": 15, "autocomplete": 5}
+
+
+@dataclass
+class QueryCount:
+    """A class to represent the numbers of the queries of a single admin page."""
+
+    admin: str
+    page: str
+    url: str
+    budget: int
+    counts: list
+
+    @property
+    def grows(self):
+        return len(set(self.counts)) > 1
+
+    @property
+    def over_budget(self):
+        return max(self.counts) > self.budget
+
+    @property
+    def failed(self):
+        return self.grows or self.over_budget
+
+
+class QueryBudgetCheck:
+    """
+    A class to represent the check of the numbers of the queries of the admins.
+
+    The changelist, the change form and the autocomplete fields of every
+    registered admin are rendered by `count()` at each size of the data, e.g.
+    once the synthetic data of the size are generated, see `SyntheticData`. A
+    page fails the check if its number of queries differs between the sizes,
+    which is the sign of an N+1 problem, or exceeds its budget. Each page is
+    requested twice, the queries of the second request being counted, so that
+    the reference caches are loaded beforehand.
+
+    The change form is of the first object of the model, or of the article
+    contributed by all the employees, see `seed_article()`, so that its inline
+    rows grow with the data as well.
+
+    The check is meant to be run by the tests, see `extras.tests`, as the data
+    are added to the database.
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self.counts = {}
+        self.change_objects = {}
+
+    def seed_article(self):
+        """Create or update the article contributed by all the employees."""
+        article = self.change_objects.get(Article)
+        if article is None:
+            article = Article.objects.create(title="Budżet zapytań")
+            self.change_objects[Article] = article
+
+        author_ids = list(
+            Author.objects.filter(employee__isnull=False)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+        article.contributions.all().delete()
+        Contribution.objects.bulk_create(
+            Contribution(
+                content_object=article,
+                order=order,
+                author_id=author_id,
+                percentage=percentage,
+            )
+            for order, (author_id, percentage) in enumerate(
+                zip(author_ids, get_percentages(len(author_ids))), start=1
+            )
+        )
+
+    def get_pages(self, model, model_admin):
+        """Return the list of the (page, url) pairs of the admin."""
+        info = model._meta.app_label, model._meta.model_name
+        pages = [("changelist", reverse("admin:{}_{}_changelist".format(*info)))]
+
+        obj = self.change_objects.get(model)
+        if obj is None:
+            obj = model._default_manager.order_by("pk").first()
+        if obj is not None:
+            pages.append(
+                ("change", reverse("admin:{}_{}_change".format(*info), args=[obj.pk]))
+            )
+
+        for field_name in model_admin.autocomplete_fields:
+            query = {
+                "app_label": model._meta.app_label,
+                "model_name": model._meta.model_name,
+                "field_name": field_name,
+            }
+            pages.append(
+                (
+                    "autocomplete",
+                    "{}?{}".format(reverse("admin:autocomplete"), urlencode(query)),
+                )
+            )
+        return pages
+
+    def count_queries(self, url):
+        response = self.client.get(url)
+        if response.status_code != 200:
+            raise RuntimeError(f"{url} returned {response.status_code}.")
+
+        recorder = QueryRecorder(slow_query_threshold=math.inf)
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            self.client.get(url)
+        return recorder.count
+
+    def count(self):
+        """Count the queries of all the admin pages at the current data."""
+        with override_settings(AUTOCOMPLETE_CACHE_TIMEOUT=0):
+            for model, model_admin in admin.site._registry.items():
+                budgets = {
+                    **DEFAULT_QUERY_BUDGETS,
+                    **getattr(model_admin, "query_budgets", {}),
+                }
+                for page, url in self.get_pages(model, model_admin):
+                    if url not in self.counts:
+                        self.counts[url] = QueryCount(
+                            admin=type(model_admin).__name__,
+                            page=page,
+                            url=url,
+                            budget=budgets[page],
+                            counts=[],
+                        )
+                    self.counts[url].counts.append(self.count_queries(url))
+
+    def get_failed(self):
+        """Return the list of the query counts of the pages failing the check."""
+        return [count for count in self.counts.values() if count.failed]
+
+    def format(self, counts):
+        """Return the table of the query counts, e.g. of the failed pages."""
+        return "\n".join(
+            "{:<28} {:<13} {:>7} {:>14}  {}".format(*row)
+            for row in [
+                ("admin", "page", "budget", "queries", "url"),
+                *(
+                    (
+                        count.admin,
+                        count.page,
+                        count.budget,
+                        " -> ".join(str(number) for number in count.counts),
+                        count.url,
+                    )
+                    for count in counts
+                ),
+            ]
+        )
@@ -0,0 +1,186 @@
+import threading
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+# Minimum time (in seconds) between the checks of the shared version numbers
+VERSION_CHECK_INTERVAL = 1.0
+
+reference_caches = []
+
+
+class TableCache:
+    """
+    A class to represent the process-local cache of a small reference table.
+
+    The table is loaded with a single query on the first lookup and kept in memory,
+    indexed by ID and by abbreviation. The cache is invalidated by the signals
+    whenever an object of the table is saved or deleted, once the transaction is
+    committed, so that the rolled back changes are never cached.
+
+    If the `REFERENCE_CACHE_ALIAS` setting names one of the `CACHES`, the
+    invalidations are propagated to the other processes by the version number kept
+    in that shared cache. Otherwise, the cache expires after
+    `REFERENCE_CACHE_TIMEOUT` seconds.
+
+    The cached objects are shared by all the callers, hence they have to be treated
+    as read-only.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.version_key = "reference-cache:{}".format(model._meta.label_lower)
+        self.lock = threading.Lock()
+        self.objects_by_id = None
+        self.objects_by_abbreviation = None
+        self.version = None
+        self.loaded_at = None
+        self.checked_at = None
+
+    @property
+    def shared_cache(self):
+        alias = getattr(settings, "REFERENCE_CACHE_ALIAS", None)
+        return caches[alias] if alias else None
+
+    def is_stale(self):
+        if self.objects_by_id is None:
+            return True
+
+        now = time.monotonic()
+        shared_cache = self.shared_cache
+
+        if shared_cache is None:
+            timeout = getattr(settings, "REFERENCE_CACHE_TIMEOUT", 300)
+            return now - self.loaded_at > timeout
+
+        if now - self.checked_at < VERSION_CHECK_INTERVAL:
+            return False
+        self.checked_at = now
+        return shared_cache.get(self.version_key, 0) != self.version
+
+    def load(self):
+        """Load the whole table into memory."""
+        shared_cache = self.shared_cache
+
+        # The version is read before the table, so that the changes made
+        # in the meantime make the cache stale
+        version = shared_cache.get(self.version_key, 0) if shared_cache else None
+        objects = list(self.model._default_manager.order_by("pk"))
+
+        field_names = {field.name for field in self.model._meta.get_fields()}
+
+        self.objects_by_id = {obj.pk: obj for obj in objects}
+        self.objects_by_abbreviation = (
+            {obj.abbreviation: obj for obj in objects}
+            if "abbreviation" in field_names
+            else {}
+        )
+        self.version = version
+        self.loaded_at = self.checked_at = time.monotonic()
+
+    def get_tables(self):
+        with self.lock:
+            if self.is_stale():
+                self.load()
+            return self.objects_by_id, self.objects_by_abbreviation
+
+    def get_objects_by_id(self):
+        return self.get_tables()[0]
+
+    def all(self):
+        """Return the list of all the objects of the table."""
+        return list(self.get_objects_by_id().values())
+
+    def get(self, pk):
+        """
+        Return the object of the given ID, or None if the ID is None.
+
+        The objects missing from the cache, e.g. created by another process in
+        the meantime, are looked up by reloading the table. Within transactions,
+        they are queried instead, as the uncommitted objects may be rolled back.
+        """
+        if pk is None:
+            return None
+
+        obj = self.get_objects_by_id().get(pk)
+        if obj is None and not transaction.get_connection().in_atomic_block:
+            with self.lock:
+                self.load()
+                obj = self.objects_by_id.get(pk)
+
+        return obj if obj is not None else self.model._default_manager.get(pk=pk)
+
+    def get_by_abbreviation(self, abbreviation):
+        """Return the object of the given abbreviation, or None if there is none."""
+        return self.get_tables()[1].get(abbreviation)
+
+    def invalidate(self):
+        """Drop the cached table, in all the processes if possible."""
+        with self.lock:
+            self.objects_by_id = None
+            self.objects_by_abbreviation = None
+
+        shared_cache = self.shared_cache
+        if shared_cache is not None:
+            shared_cache.add(self.version_key, 0, timeout=None)
+            shared_cache.incr(self.version_key)
+
+
+class ReferenceCache:
+    """
+    A class to represent the model attribute giving access to the TableCache.
+
+    Declared on an abstract model, it provides a separate cache for each of its
+    concrete subclasses, e.g. `Status.cached.get(1)`.
+    """
+
+    def __init__(self):
+        self.owner = None
+        self.table_caches = {}
+        reference_caches.append(self)
+
+    def __set_name__(self, owner, name):
+        self.owner = owner
+
+    def __get__(self, instance, owner):
+        if owner._meta.abstract:
+            raise AttributeError("Abstract models cannot be cached.")
+        try:
+            return self.table_caches[owner]
+        except KeyError:
+            return self.table_caches.setdefault(owner, TableCache(owner))
+
+    def handles(self, model):
+        return issubclass(model, self.owner) and not model._meta.abstract
+
+
+def invalidate_reference_caches():
+    """Invalidate the caches of all the reference tables, e.g. between the tests."""
+    for reference_cache in reference_caches:
+        for table_cache in reference_cache.table_caches.values():
+            table_cache.invalidate()
+
+
+def invalidate_reference_cache(sender, using, **kwargs):
+    """Invalidate the cache of the table of the saved or deleted sender instance."""
+    for reference_cache in reference_caches:
+        if reference_cache.handles(sender):
+            transaction.on_commit(
+                reference_cache.__get__(None, sender).invalidate, using=using
+            )
+
+
+def connect_reference_caches():
+    """Connect the invalidation of the caches to the signals of the cached models."""
+    for model in apps.get_models():
+        if any(reference_cache.handles(model) for reference_cache in reference_caches):
+            for signal in [post_save, post_delete]:
+                signal.connect(
+                    invalidate_reference_cache,
+                    sender=model,
+                    dispatch_uid=f"reference-cache-{model._meta.label_lower}",
+                )
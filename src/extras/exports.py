@@ -0,0 +1,193 @@
+import csv
+import os
+import tempfile
+
+from django.core.exceptions import ObjectDoesNotExist
+from django.core.management import BaseCommand, CommandError
+from django.db import router
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils.text import capfirst
+
+from openpyxl import Workbook
+
+from .routers import read_from_replica, track_writes
+from .text import FALSE_VALUES, TRUE_VALUES, parse_bool
+
+EXPORT_FORMATS = ["csv", "xlsx"]
+
+
+class Echo:
+    """A class to represent the file-like object returning what is written."""
+
+    def write(self, value):
+        return value
+
+
+def get_attribute(obj, path):
+    """
+    Follow the dotted path of attributes, returning None for missing objects.
+
+    The path can be a callable as well, which is then called with the object.
+    """
+    if callable(path):
+        return path(obj)
+    for name in path.split("."):
+        try:
+            obj = getattr(obj, name)
+        except ObjectDoesNotExist:
+            return None
+        if obj is None:
+            return None
+    return obj
+
+
+class TableExport:
+    """
+    A class to represent the export of a queryset to a table.
+
+    The objects are read with `QuerySet.iterator()` in chunks of `chunk_size`
+    and written row by row, so the memory used does not depend on the number
+    of rows. The subclasses define the `columns` as (header, attribute path or
+    callable) pairs and the queryset in `get_queryset()`.
+
+    The exports are read from the replica databases, if there are any, see
+    `extras.routers`.
+    """
+
+    name = None
+    columns = []
+    chunk_size = 2000
+    using = None
+
+    def get_queryset(self):
+        raise NotImplementedError
+
+    def get_headers(self):
+        return [str(capfirst(header)) for header, _ in self.columns]
+
+    def iter_rows(self):
+        """Yield the rows of the table, without the headers."""
+        paths = [path for _, path in self.columns]
+        queryset = self.get_queryset()
+        if self.using is not None:
+            queryset = queryset.using(self.using)
+        for obj in queryset.iterator(chunk_size=self.chunk_size):
+            yield [self.format_value(get_attribute(obj, path)) for path in paths]
+
+    def format_value(self, value):
+        if value is None or isinstance(value, (bool, int, float, str)):
+            return value
+        return str(value)
+
+    def iter_csv(self):
+        """Yield the lines of the table in the CSV format."""
+        writer = csv.writer(Echo())
+        yield writer.writerow(self.get_headers())
+        for row in self.iter_rows():
+            yield writer.writerow(row)
+
+    def write_csv(self, file):
+        file.writelines(self.iter_csv())
+
+    def write_xlsx(self, file):
+        """Write the table to the Excel workbook, in write-only mode."""
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet(self.name)
+        sheet.append(self.get_headers())
+        for row in self.iter_rows():
+            sheet.append(row)
+        workbook.save(file)
+
+    def as_response(self, format):
+        """Return the streaming response with the table in the given format."""
+        filename = "{}.{}".format(self.name, format)
+
+        # The streamed rows are read once the view has returned, out of the
+        # context of the request, hence the database is chosen beforehand
+        with read_from_replica():
+            self.using = router.db_for_read(self.get_queryset().model)
+
+        if format == "csv":
+            response = StreamingHttpResponse(
+                self.iter_csv(),
+                content_type="text/csv; charset=utf-8",
+            )
+            response["Content-Disposition"] = 'attachment; filename="{}"'.format(
+                filename
+            )
+            return response
+
+        # The workbooks cannot be written progressively, so they are saved to
+        # a temporary file first, which is then streamed and removed when closed
+        file = tempfile.TemporaryFile()
+        self.write_xlsx(file)
+        file.seek(0)
+        return FileResponse(file, as_attachment=True, filename=filename)
+
+
+def parse_in_evaluation(value):
+    """
+    Convert the `in_evaluation` filter value to a boolean, or None if not set.
+
+    Raises ValueError if the value is not recognized, see `parse_bool()`.
+    """
+    if value in (None, ""):
+        return None
+    return parse_bool(value)
+
+
+class ExportCommand(BaseCommand):
+    """
+    A class to represent the command exporting the table to a file.
+
+    The subclasses set `export_class` to the TableExport subclass to be used.
+    """
+
+    export_class = None
+
+    def add_arguments(self, parser):
+        """Define the command arguments."""
+        parser.add_argument(
+            "output",
+            type=str,
+            help="Path to the output file; its extension sets the format.",
+        )
+        parser.add_argument(
+            "--in-evaluation",
+            type=str.lower,
+            choices=sorted(TRUE_VALUES | FALSE_VALUES),
+            default=None,
+            help="Export the rows of the employees in or out of the evaluation only.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=TableExport.chunk_size,
+            help="Number of objects read from the database at once.",
+        )
+
+    def handle(self, *args, **options):
+        """Define what does the command do."""
+        path = options["output"]
+        format = os.path.splitext(path)[1].lstrip(".").lower()
+        if format not in EXPORT_FORMATS:
+            raise CommandError(
+                "Unsupported format '{}', use one of: {}.".format(
+                    format,
+                    ", ".join(EXPORT_FORMATS),
+                )
+            )
+
+        export = self.export_class(
+            in_evaluation=parse_in_evaluation(options["in_evaluation"])
+        )
+        export.chunk_size = options["chunk_size"]
+
+        with track_writes(), read_from_replica():
+            if format == "csv":
+                with open(path, "w", newline="", encoding="utf-8") as file:
+                    export.write_csv(file)
+            else:
+                export.write_xlsx(path)
+
+        self.stdout.write(self.style.SUCCESS("Exported to '{}'.".format(path)))
@@ -0,0 +1,191 @@
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+# The literals replaced in the SQL statements to get their fingerprints
+FINGERPRINT_PATTERNS = [
+    (re.compile(r"'(?:[^']|'')*'"), "?"),
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "?"),
+    (re.compile(r"\(\s*(?:\?|%s)(?:\s*,\s*(?:\?|%s))*\s*\)"), "(...)"),
+    (re.compile(r"\s+"), " "),
+]
+
+
+def get_fingerprint(sql):
+    """Return the SQL statement with its literals and parameter lists collapsed."""
+    for pattern, replacement in FINGERPRINT_PATTERNS:
+        sql = pattern.sub(replacement, sql)
+    return sql.strip()
+
+
+class QueryRecorder:
+    """
+    A class to represent the recorder of the queries of a single request.
+
+    It is installed as the execute wrapper of the database connections, see
+    `connection.execute_wrapper()`, and records the number, the total time and
+    the fingerprints of the executed queries, logging the slow ones.
+    """
+
+    def __init__(self, slow_query_threshold):
+        self.slow_query_threshold = slow_query_threshold
+        self.count = 0
+        self.time = 0.0
+        self.fingerprints = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.count += 1
+            self.time += elapsed
+            self.fingerprints[sql] += 1
+
+            if elapsed * 1000 >= self.slow_query_threshold:
+                logger.warning(
+                    "Slow query (%.1f ms, %s): %s",
+                    elapsed * 1000,
+                    context["connection"].alias,
+                    sql,
+                )
+
+    def get_duplicates(self):
+        """Return the fingerprints of the repeated queries with their counts."""
+        # The statements are fingerprinted once per distinct SQL only
+        duplicates = Counter()
+        for sql, count in self.fingerprints.items():
+            duplicates[get_fingerprint(sql)] += count
+        return {
+            fingerprint: count
+            for fingerprint, count in duplicates.most_common()
+            if count > 1
+        }
+
+
+class Metrics:
+    """
+    A class to represent the counters of the requests aggregated by view.
+
+    The counters are kept in the memory of the process, hence they are reset on
+    restarts and are not shared by the processes of the server.
+    """
+
+    FIELDS = [
+        "requests",
+        "slow_requests",
+        "queries",
+        "duplicate_queries",
+        "db_time",
+        "time",
+        "max_time",
+    ]
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.views = {}
+
+    def add(self, view_name, recorder, elapsed, slow):
+        duplicate_queries = sum(
+            count - 1 for count in recorder.get_duplicates().values()
+        )
+        with self.lock:
+            counters = self.views.setdefault(view_name, dict.fromkeys(self.FIELDS, 0))
+            counters["requests"] += 1
+            counters["slow_requests"] += int(slow)
+            counters["queries"] += recorder.count
+            counters["duplicate_queries"] += duplicate_queries
+            counters["db_time"] += recorder.time
+            counters["time"] += elapsed
+            counters["max_time"] = max(counters["max_time"], elapsed)
+
+    def as_dict(self):
+        """Return the copy of the counters, with the times rounded to ms."""
+        with self.lock:
+            return {
+                view_name: {
+                    name: round(value * 1000, 1) if "time" in name else value
+                    for name, value in counters.items()
+                }
+                for view_name, counters in sorted(self.views.items())
+            }
+
+    def reset(self):
+        with self.lock:
+            self.views = {}
+
+
+metrics = Metrics()
+
+
+class InstrumentationMiddleware:
+    """
+    A class to represent the middleware measuring the requests.
+
+    For each request, the number and the total time of the queries, the repeated
+    queries (by fingerprint, usually indicating N+1 problems) and the time of the
+    response are recorded. They are aggregated by view, see `metrics`, and sent
+    in the Server-Timing header. The requests and the queries slower than the
+    `SLOW_REQUEST_THRESHOLD` and `SLOW_QUERY_THRESHOLD` (in ms) are logged.
+
+    The middleware is enabled by the `INSTRUMENTATION_ENABLED` setting; when it
+    is not set, the middleware is removed from the chain by Django at startup,
+    hence it costs nothing.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "INSTRUMENTATION_ENABLED", False):
+            raise MiddlewareNotUsed
+
+        self.get_response = get_response
+        self.slow_request_threshold = getattr(settings, "SLOW_REQUEST_THRESHOLD", 500)
+        self.slow_query_threshold = getattr(settings, "SLOW_QUERY_THRESHOLD", 100)
+
+    def __call__(self, request):
+        recorder = QueryRecorder(self.slow_query_threshold)
+
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - start
+
+        match = request.resolver_match
+        view_name = match.view_name if match else "<unresolved>"
+        slow = elapsed * 1000 >= self.slow_request_threshold
+        metrics.add(view_name, recorder, elapsed, slow)
+
+        if slow:
+            logger.warning(
+                "Slow request (%.1f ms, %d queries in %.1f ms): %s %s [%s]%s",
+                elapsed * 1000,
+                recorder.count,
+                recorder.time * 1000,
+                request.method,
+                request.get_full_path(),
+                view_name,
+                "".join(
+                    f"\n  {count} x {fingerprint}"
+                    for fingerprint, count in recorder.get_duplicates().items()
+                ),
+            )
+
+        response["Server-Timing"] = ", ".join(
+            [
+                f'db;dur={recorder.time * 1000:.1f};desc="{recorder.count} queries"',
+                f"app;dur={(elapsed - recorder.time) * 1000:.1f}",
+                f"total;dur={elapsed * 1000:.1f}",
+            ]
+        )
+        return response
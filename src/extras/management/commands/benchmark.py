@@ -0,0 +1,117 @@
+from django.conf import settings
+from django.core.management import BaseCommand
+
+from extras.benchmarks import BenchmarkSuite, load_record, make_record, save_record
+
+
+class Command(BaseCommand):
+    """
+    A command for running the benchmarks against the database.
+
+    The results are appended to the JSON Lines file along with the commit, the
+    database vendor and the numbers of the rows, so that they can be compared
+    across the commits, see `BenchmarkSuite`.
+    """
+
+    help = "Times the admin pages, load_users, searches and aggregations."
+
+    def add_arguments(self, parser):
+        """Define the command arguments."""
+        parser.add_argument(
+            "patterns",
+            nargs="*",
+            help="Shell-style patterns of the benchmark names, e.g. 'changelist:*'.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Number of the timed runs of each benchmark.",
+        )
+        parser.add_argument(
+            "--term",
+            default="kowal",
+            help="Term of the searches and the autocomplete fields.",
+        )
+        parser.add_argument(
+            "--users",
+            type=int,
+            default=200,
+            help="Number of the users imported by load_users.",
+        )
+        parser.add_argument(
+            "-o",
+            "--output",
+            default=str(settings.BASE_DIR / "benchmarks" / "results.jsonl"),
+            help="Path to the JSON Lines file the results are appended to.",
+        )
+        parser.add_argument(
+            "--no-save",
+            action="store_true",
+            help="Do not store the results.",
+        )
+        parser.add_argument(
+            "--compare",
+            nargs="?",
+            const="",
+            default=None,
+            help=(
+                "Compare the results with the last stored ones of the given "
+                "commit, or with the last stored ones if no commit is given."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        """Define what does the command do."""
+        baseline = None
+        if options["compare"] is not None:
+            baseline = load_record(options["output"], options["compare"] or None)
+            if baseline is None:
+                self.stdout.write(self.style.ERROR("No results to compare with."))
+            else:
+                self.stdout.write(
+                    "Comparing with {} of {}.".format(
+                        baseline["commit"], baseline["date"]
+                    )
+                )
+        previous = (baseline or {}).get("results", {})
+
+        self.stdout.write(
+            "{:<60} {:>10} {:>10} {:>8} {:>8}".format(
+                "benchmark", "median [ms]", "p95 [ms]", "queries", "change"
+            )
+        )
+
+        def write_result(result):
+            if result.error:
+                self.stdout.write(
+                    self.style.ERROR("{:<60} {}".format(result.name, result.error))
+                )
+                return
+
+            data = result.as_dict()
+            change = ""
+            if result.name in previous and previous[result.name].get("median"):
+                change = "{:+.0%}".format(
+                    data["median"] / previous[result.name]["median"] - 1
+                )
+            self.stdout.write(
+                "{:<60} {:>10.2f} {:>10.2f} {:>8} {:>8}".format(
+                    result.name, data["median"], data["p95"], data["queries"], change
+                )
+            )
+
+        suite = BenchmarkSuite(
+            repeat=options["repeat"],
+            search_term=options["term"],
+            users=options["users"],
+        )
+        results = suite.run(options["patterns"], callback=write_result)
+
+        if not options["no_save"]:
+            save_record(options["output"], make_record(results))
+            self.stdout.write(
+                self.style.SUCCESS(
+                    "Saved {} results to {}.".format(len(results), options["output"])
+                )
+            )
@@ -0,0 +1,78 @@
+from django.core.management import BaseCommand, CommandError
+from django.db import IntegrityError
+
+from extras.synthetic import SyntheticData
+
+
+class Command(BaseCommand):
+    """
+    A command for generating the synthetic data of the whole schema.
+
+    The data are deterministic for the given seed and scaled by the number of the
+    employees, from a thousand up to a million, see `SyntheticData`.
+    """
+
+    help = "Generates the deterministic synthetic data for the benchmarks."
+
+    def add_arguments(self, parser):
+        """Define the command arguments."""
+        parser.add_argument(
+            "-e",
+            "--employees",
+            type=int,
+            default=1000,
+            help="Number of the employees, along with their users and employments.",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help=(
+                "Seed of the random number generator. The data of each seed can "
+                "be generated only once in a database."
+            ),
+        )
+        parser.add_argument(
+            "--articles-per-employee",
+            type=float,
+            default=2.0,
+            help="Number of the articles per employee.",
+        )
+        parser.add_argument(
+            "--authors-per-article",
+            type=int,
+            default=4,
+            help="Average number of the authors of each article.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Number of the objects inserted at once.",
+        )
+
+    def handle(self, *args, **options):
+        """Define what does the command do."""
+        generator = SyntheticData(
+            employees=options["employees"],
+            seed=options["seed"],
+            batch_size=options["batch_size"],
+            articles_per_employee=options["articles_per_employee"],
+            authors_per_article=options["authors_per_article"],
+            log=self.stdout.write,
+        )
+
+        try:
+            counts = generator.generate()
+        except IntegrityError as error:
+            raise CommandError(
+                "The data of the seed {} have been already generated ({}).".format(
+                    options["seed"], error
+                )
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Generated {} objects.".format(sum(counts.values())),
+            )
+        )
@@ -0,0 +1,43 @@
+from django.core.management import BaseCommand
+
+from extras.models import SearchToken
+from extras.search import search_index
+
+
+class Command(BaseCommand):
+    """
+    A command for rebuilding the search index.
+
+    The index is kept up to date by the signals; the command is meant for
+    filling it in for the data existing before, or loaded without the signals.
+    """
+
+    help = "Rebuilds the search index of all the registered models."
+
+    def add_arguments(self, parser):
+        """Define the command arguments."""
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of objects indexed at once.",
+        )
+
+    def handle(self, *args, **options):
+        """Define what does the command do."""
+        batch_size = options["batch_size"]
+
+        SearchToken.objects.all().delete()
+
+        for model in search_index.lookups:
+            ids = list(model.objects.order_by("id").values_list("id", flat=True))
+
+            for start in range(0, len(ids), batch_size):
+                stop = start + batch_size
+                search_index.reindex(model.objects.filter(id__in=ids[start:stop]))
+
+            self.stdout.write(
+                self.style.SUCCESS(
+                    "Indexed {} {}.".format(len(ids), model._meta.verbose_name_plural)
+                )
+            )
@@ -1,5 +1,8 @@
+from django.contrib.contenttypes.models import ContentType
 from django.db import models
 
+from .caches import ReferenceCache
+
 
 class NamedModel(models.Model):
     """A class to represent an abstract model with name and abbreviation fields."""
@@ -7,8 +10,45 @@ class NamedModel(models.Model):
     name = models.CharField("nazwa", max_length=50)
     abbreviation = models.CharField("skrót", max_length=10)
 
+    cached = ReferenceCache()
+
     class Meta:
         abstract = True
 
     def __str__(self):
         return self.name or self.abbreviation
+
+
+class SearchToken(models.Model):
+    """
+    A class to represent the tokens of the search index.
+
+    Each token is a folded word of the indexed fields of an object, see
+    `search.py`, so that the objects can be found by the prefixes of the words
+    with the indexed lookups, instead of scanning the tables.
+    """
+
+    content_type = models.ForeignKey(
+        to=ContentType,
+        on_delete=models.CASCADE,
+        verbose_name="rodzaj obiektu",
+    )
+    object_id = models.PositiveIntegerField(verbose_name="ID obiektu")
+    token = models.CharField(verbose_name="słowo", max_length=50)
+
+    class Meta:
+        verbose_name = "słowo indeksu wyszukiwania"
+        verbose_name_plural = "słowa indeksu wyszukiwania"
+        indexes = [
+            models.Index(
+                fields=["content_type", "token"],
+                name="search_token_prefix",
+            ),
+            models.Index(
+                fields=["content_type", "object_id"],
+                name="search_token_object",
+            ),
+        ]
+
+    def __str__(self):
+        return self.token
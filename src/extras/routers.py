@@ -0,0 +1,139 @@
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS
+
+# The key of the session storing the time until which the reads of the user are
+# sent to the primary database
+PRIMARY_UNTIL_SESSION_KEY = "_primary_until"
+
+# Whether the reads of the current context may be sent to the replicas
+replica_reads = ContextVar("replica_reads", default=False)
+
+# Whether the reads of the current context have to be sent to the primary, i.e.
+# the context has written to the database, or the user did it lately
+primary_pinned = ContextVar("primary_pinned", default=False)
+
+# Whether the current context has written to the database
+written = ContextVar("written", default=False)
+
+
+def get_replicas():
+    return getattr(settings, "REPLICA_DATABASES", [])
+
+
+@contextmanager
+def read_from_replica():
+    """
+    Send the reads within the context to the replicas, if there are any.
+
+    It is meant for the read-only reporting, export and API code, and can be
+    used as a decorator as well, e.g. `@read_from_replica()`. The reads still
+    go to the primary once the context (or the user, see
+    `ReplicaStickinessMiddleware`) has written to the database.
+    """
+    token = replica_reads.set(True)
+    try:
+        yield
+    finally:
+        replica_reads.reset(token)
+
+
+@contextmanager
+def track_writes():
+    """
+    Track the writes to the database within the context from scratch.
+
+    The context variable of the writes is otherwise set for good once anything
+    has been written, e.g. for all the following requests of a thread of the
+    server or the following tasks of a command, whose reads would never be sent
+    to the replicas again.
+    """
+    token = written.set(False)
+    try:
+        yield
+    finally:
+        written.reset(token)
+
+
+class ReplicaRouter:
+    """
+    A class to represent the router of the reads to the replica databases.
+
+    The reads marked with `read_from_replica()` are sent to one of the aliases
+    of the `REPLICA_DATABASES` setting, chosen at random, unless the reads have
+    to see the preceding writes. All the other reads and all the writes are
+    sent to the primary (default) database, which is also the fallback when
+    there are no replicas.
+    """
+
+    def db_for_read(self, model, **hints):
+        replicas = get_replicas()
+        if (
+            replicas
+            and replica_reads.get()
+            and not primary_pinned.get()
+            and not written.get()
+        ):
+            return random.choice(replicas)
+        return None
+
+    def db_for_write(self, model, **hints):
+        # Also for the objects read from the replicas
+        written.set(True)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *get_replicas()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, **hints):
+        if db in get_replicas():
+            return False
+        return None
+
+
+class ReplicaStickinessMiddleware:
+    """
+    A class to represent the middleware keeping the users reading their writes.
+
+    Once a request has written to the database, the reads of the following
+    requests of the user (by the session) are sent to the primary database for
+    `REPLICA_STICKY_SECONDS`, i.e. for longer than the expected lag of the
+    replicas. The middleware has to follow the SessionMiddleware.
+
+    The middleware is enabled when there are replicas, see `REPLICA_DATABASES`;
+    otherwise it is removed from the chain by Django at startup.
+    """
+
+    def __init__(self, get_response):
+        if not get_replicas():
+            raise MiddlewareNotUsed
+
+        self.get_response = get_response
+        self.sticky_seconds = getattr(settings, "REPLICA_STICKY_SECONDS", 15)
+
+    def __call__(self, request):
+        now = time.time()
+        pinned = request.session.get(PRIMARY_UNTIL_SESSION_KEY, 0) > now
+
+        # The context variables are reset, as the threads of the server are
+        # reused by the following requests
+        token = primary_pinned.set(pinned)
+        try:
+            with track_writes():
+                response = self.get_response(request)
+                if written.get():
+                    request.session[PRIMARY_UNTIL_SESSION_KEY] = (
+                        now + self.sticky_seconds
+                    )
+        finally:
+            primary_pinned.reset(token)
+
+        return response
@@ -0,0 +1,143 @@
+import re
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from .models import SearchToken
+from .text import fold
+
+TOKEN_LENGTH = SearchToken._meta.get_field("token").max_length
+
+
+def tokenize(text):
+    """Return the folded words of the text, e.g. "zolc" and "l" for "Żółć, Ł."."""
+    return [word[:TOKEN_LENGTH] for word in re.findall(r"\w+", fold(text or ""))]
+
+
+class SearchIndex:
+    """
+    A class to represent the search index of the registered models.
+
+    The index keeps the folded words of the registered lookups of the objects
+    as the SearchToken objects. It is updated by the signals whenever an object,
+    or any object along its lookups (e.g. the user of an employee), is saved,
+    and can be rebuilt with the `rebuild_search_index` command. The objects are
+    then filtered by the prefixes of the words, with a subquery on the indexed
+    tokens per word of the search term.
+    """
+
+    def __init__(self):
+        self.lookups = {}
+        # The indexed models and the paths to the related models, by the latter
+        self.related_paths = {}
+
+    def register(self, model, lookups):
+        """Index the given lookups of the model."""
+        self.lookups[model] = lookups
+
+        post_save.connect(
+            self.reindex_saved,
+            sender=model,
+            dispatch_uid=f"search-index-{model._meta.label_lower}",
+        )
+        post_delete.connect(
+            self.delete_deleted,
+            sender=model,
+            dispatch_uid=f"search-index-delete-{model._meta.label_lower}",
+        )
+
+        # Reindex the objects whenever any of their related objects is saved
+        paths = {
+            "__".join(lookup.split("__")[:length])
+            for lookup in lookups
+            for length in range(1, lookup.count("__") + 1)
+        }
+        for path in paths:
+            related_model = model
+            for name in path.split("__"):
+                related_model = related_model._meta.get_field(name).related_model
+
+            self.related_paths.setdefault(related_model, []).append((model, path))
+
+            def reindex_related(sender, instance, model=model, path=path, **kwargs):
+                self.reindex(model._default_manager.filter(**{path: instance.pk}))
+
+            post_save.connect(
+                reindex_related,
+                sender=related_model,
+                weak=False,
+                dispatch_uid=f"search-index-{model._meta.label_lower}-{path}",
+            )
+
+    def reindex_saved(self, sender, instance, **kwargs):
+        self.reindex(sender._default_manager.filter(pk=instance.pk))
+
+    def delete_deleted(self, sender, instance, **kwargs):
+        SearchToken.objects.filter(
+            content_type=ContentType.objects.get_for_model(sender),
+            object_id=instance.pk,
+        ).delete()
+
+    def reindex(self, queryset):
+        """Rebuild the tokens of the objects of the queryset."""
+        model = queryset.model
+        tokens = {}
+        for pk, *values in queryset.values_list("pk", *self.lookups[model]):
+            tokens.setdefault(pk, set()).update(
+                token for value in values for token in tokenize(str(value or ""))
+            )
+
+        content_type = ContentType.objects.get_for_model(model)
+        with transaction.atomic():
+            SearchToken.objects.filter(
+                content_type=content_type,
+                object_id__in=list(tokens),
+            ).delete()
+            SearchToken.objects.bulk_create(
+                SearchToken(content_type=content_type, object_id=pk, token=token)
+                for pk, object_tokens in tokens.items()
+                for token in sorted(object_tokens)
+            )
+
+    def reindex_bulk_saved(self, queryset):
+        """
+        Rebuild the tokens of the objects saved in bulk, i.e. with no signals.
+
+        The objects indexed along their lookups, e.g. the employees of the
+        users, are reindexed as well, as they are by the signals.
+        """
+        model = queryset.model
+        if model in self.lookups:
+            self.reindex(queryset)
+        for indexed_model, path in self.related_paths.get(model, []):
+            self.reindex(
+                indexed_model._default_manager.filter(**{f"{path}__in": queryset})
+            )
+
+    def filter(self, queryset, search_term, path="pk"):
+        """
+        Filter the queryset by the search term.
+
+        Each word of the term has to be a prefix of any of the indexed words of
+        the object given by the `path`, e.g. "author" for the contributions.
+        """
+        model = queryset.model
+        if path != "pk":
+            for name in path.split("__"):
+                model = model._meta.get_field(name).related_model
+        content_type = ContentType.objects.get_for_model(model)
+
+        for term in dict.fromkeys(tokenize(search_term)):
+            queryset = queryset.filter(
+                **{
+                    f"{path}__in": SearchToken.objects.filter(
+                        content_type=content_type,
+                        token__startswith=term,
+                    ).values("object_id")
+                }
+            )
+        return queryset
+
+
+search_index = SearchIndex()
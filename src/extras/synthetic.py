@@ -0,0 +1,419 @@
+import random
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+
+from attainments.elements.ingestion import bulk_create_with_ids, get_percentages
+from attainments.elements.models import get_title_hash
+from attainments.evaluation.models import EVALUATION_MODELS
+from attainments.models import (
+    Article,
+    Author,
+    AuthorAffiliation,
+    AuthorAlias,
+    Contribution,
+)
+from employees.models import (
+    Degree,
+    Discipline,
+    Domain,
+    Employee,
+    Employment,
+    Group,
+    Position,
+    Status,
+    Subgroup,
+)
+from extras.autocomplete import invalidate_autocomplete
+from extras.caches import TableCache
+from extras.search import search_index
+from units.models import Department, Faculty, University
+
+User = get_user_model()
+
+FEMALE_FIRST_NAMES = ["Anna", "Maria", "Katarzyna", "Małgorzata", "Agnieszka", "Zofia"]
+MALE_FIRST_NAMES = ["Piotr", "Krzysztof", "Andrzej", "Tomasz", "Paweł", "Michał"]
+LAST_NAMES = [
+    "Nowak",
+    "Kowalski",
+    "Wiśniewski",
+    "Wójcik",
+    "Kowalczyk",
+    "Kamiński",
+    "Lewandowski",
+    "Zieliński",
+    "Szymański",
+    "Woźniak",
+    "Dąbrowski",
+    "Kozłowski",
+    "Jankowski",
+    "Mazur",
+    "Kwiatkowski",
+    "Krawczyk",
+    "Piotrowski",
+    "Grabowski",
+    "Nowakowski",
+    "Pawłowski",
+    "Michalski",
+    "Nowicki",
+    "Adamczyk",
+    "Dudek",
+    "Zając",
+    "Wieczorek",
+    "Jabłoński",
+    "Król",
+    "Majewski",
+    "Olszewski",
+    "Jaworski",
+    "Wróbel",
+    "Malinowski",
+    "Pawlak",
+    "Witkowski",
+    "Walczak",
+    "Stępień",
+    "Górski",
+    "Rutkowski",
+    "Michalak",
+]
+TITLE_WORDS = [
+    "analiza",
+    "modelowanie",
+    "badania",
+    "metody",
+    "zastosowanie",
+    "struktura",
+    "wpływ",
+    "optymalizacja",
+    "systemów",
+    "procesów",
+    "materiałów",
+    "danych",
+    "sieci",
+    "języka",
+    "zjawisk",
+    "populacji",
+]
+
+# The reference tables, by model: the number of the objects and their names
+REFERENCE_TABLES = [
+    (Domain, 3, "Dziedzina"),
+    (Group, 3, "Grupa"),
+    (Degree, 5, "Stopień"),
+    (Status, 3, "Status"),
+]
+
+
+def get_female_last_name(last_name):
+    """Return the female form of the Polish last name, e.g. "Kowalska"."""
+    return last_name[:-1] + "a" if last_name.endswith("i") else last_name
+
+
+class SyntheticData:
+    """
+    A class to represent the generator of the synthetic data of the whole schema.
+
+    The data are generated from the given seed, hence deterministic, and scaled by
+    the number of the employees (each with a user and an employment):
+
+    - the University -> Faculty -> Department tree, a department per about
+      `employees_per_department` employees, 6 departments per faculty and 8
+      faculties per university;
+    - the domains, disciplines, groups, subgroups, positions, degrees and statuses;
+    - the authors, one per employee plus the external ones, and the articles
+      with their contributions.
+
+    The objects are created in bulk, and the tables derived by the signals (the
+    affiliations, the alias keys, the search index and the evaluation results)
+    are refreshed for the created objects afterwards, and the caches of their
+    models invalidated. The usernames follow the seed, hence the data of the same
+    seed can be generated only once in a database.
+    """
+
+    def __init__(
+        self,
+        employees=1000,
+        seed=0,
+        batch_size=5000,
+        employees_per_department=50,
+        external_authors=0.5,
+        articles_per_employee=2.0,
+        authors_per_article=4,
+        log=None,
+    ):
+        self.employees = employees
+        self.seed = seed
+        self.batch_size = batch_size
+        self.employees_per_department = employees_per_department
+        self.external_authors = external_authors
+        self.articles_per_employee = articles_per_employee
+        self.authors_per_article = authors_per_article
+        self.log = log or (lambda message: None)
+        self.rng = random.Random(seed)
+        self.counts = {}
+        self.created_ids = {}
+
+    def generate(self):
+        """Generate the data, returning the numbers of the objects by model."""
+        with transaction.atomic():
+            self.create_units()
+            self.create_references()
+            self.create_employees()
+            self.create_attainments()
+            self.refresh_derived_tables()
+        return self.counts
+
+    def create(self, model, objects):
+        """Create the objects in batches, returning their IDs."""
+        ids = []
+        objects = iter(objects)
+        for batch in iter(lambda: list(islice(objects, self.batch_size)), []):
+            ids.extend(
+                obj.pk for obj in bulk_create_with_ids(model, batch, self.batch_size)
+            )
+        self.created_ids.setdefault(model, []).extend(ids)
+        self.counts[model._meta.label] = len(self.created_ids[model])
+        self.log(f"Created {len(ids)} {model._meta.verbose_name_plural}.")
+        return ids
+
+    def create_units(self):
+        departments = max(1, self.employees // self.employees_per_department)
+        faculties = max(1, -(-departments // 6))
+        universities = max(1, -(-faculties // 8))
+        name = f"S{self.seed}"
+
+        university_ids = self.create(
+            University,
+            (
+                University(name=f"Uczelnia {name}-{index}", abbreviation=f"U{index}")
+                for index in range(universities)
+            ),
+        )
+        faculty_ids = self.create(
+            Faculty,
+            (
+                Faculty(
+                    name=f"Wydział {name}-{index}",
+                    abbreviation=f"W{index}",
+                    university_id=university_ids[index % universities],
+                )
+                for index in range(faculties)
+            ),
+        )
+        self.department_ids = self.create(
+            Department,
+            (
+                Department(
+                    name=f"Katedra {name}-{index}",
+                    abbreviation=f"K{index}",
+                    faculty_id=faculty_ids[index % faculties],
+                )
+                for index in range(departments)
+            ),
+        )
+
+    def create_references(self):
+        ids = {}
+        for model, count, name in REFERENCE_TABLES:
+            objects = [
+                model(abbreviation=f"{name[:3]}{index}"[:10]) for index in range(count)
+            ]
+            for index, obj in enumerate(objects):
+                if model is not Degree:
+                    obj.name = f"{name} {index}"
+            ids[model] = self.create(model, objects)
+
+        self.degree_ids = ids[Degree]
+        self.status_ids = ids[Status]
+        self.discipline_ids = self.create(
+            Discipline,
+            (
+                Discipline(
+                    name=f"Dyscyplina {index}",
+                    abbreviation=f"Dys{index}",
+                    domain_id=ids[Domain][index % len(ids[Domain])],
+                )
+                for index in range(12)
+            ),
+        )
+        subgroup_ids = self.create(
+            Subgroup,
+            (
+                Subgroup(
+                    name=f"Podgrupa {index}",
+                    abbreviation=f"Pod{index}",
+                    group_id=ids[Group][index % len(ids[Group])],
+                )
+                for index in range(9)
+            ),
+        )
+        self.position_ids = self.create(
+            Position, (Position(name=f"Stanowisko {index}") for index in range(20))
+        )
+
+        # Each position belongs to one or two subgroups of the same group
+        group_subgroup_ids = [[] for _ in ids[Group]]
+        for index, subgroup_id in enumerate(subgroup_ids):
+            group_subgroup_ids[index % len(ids[Group])].append(subgroup_id)
+
+        self.position_subgroups = {}
+        through_objects = []
+        for index, position_id in enumerate(self.position_ids):
+            position_subgroup_ids = group_subgroup_ids[index % len(ids[Group])]
+            self.position_subgroups[position_id] = position_subgroup_ids[0]
+            through_objects.extend(
+                Position.subgroups.through(
+                    position_id=position_id, subgroup_id=subgroup_id
+                )
+                for subgroup_id in position_subgroup_ids[: 1 + index % 2]
+            )
+        Position.subgroups.through.objects.bulk_create(through_objects)
+
+    def get_name(self, sex):
+        last_name = self.rng.choice(LAST_NAMES)
+        if sex == Employee.SexChoices.FEMALE:
+            return self.rng.choice(FEMALE_FIRST_NAMES), get_female_last_name(last_name)
+        return self.rng.choice(MALE_FIRST_NAMES), last_name
+
+    def create_employees(self):
+        # Hashing is slow on purpose, hence all the users share the same password
+        password = make_password(f"synthetic-{self.seed}")
+        rng = self.rng
+
+        people = []
+        for index in range(self.employees):
+            sex = rng.choice(Employee.SexChoices.values)
+            people.append((index, sex, *self.get_name(sex)))
+
+        user_ids = self.create(
+            User,
+            (
+                User(
+                    username=f"synthetic-{self.seed}-{index}",
+                    password=password,
+                    first_name=first_name,
+                    last_name=last_name,
+                    email=f"synthetic-{self.seed}-{index}@example.com",
+                )
+                for index, _, first_name, last_name in people
+            ),
+        )
+        self.employee_ids = self.create(
+            Employee,
+            (
+                Employee(
+                    user_id=user_id,
+                    sex=sex,
+                    degree_id=rng.choice([None, *self.degree_ids]),
+                    status_id=rng.choice(self.status_ids),
+                    in_evaluation=rng.random() < 0.8,
+                    discipline_id=rng.choice([None, *self.discipline_ids]),
+                )
+                for user_id, (_, sex, _, _) in zip(user_ids, people)
+            ),
+        )
+
+        positions = [rng.choice(self.position_ids) for _ in self.employee_ids]
+        self.create(
+            Employment,
+            (
+                Employment(
+                    employee_id=employee_id,
+                    position_id=position_id,
+                    subgroup_id=self.position_subgroups[position_id],
+                    department_id=rng.choice(self.department_ids),
+                )
+                for employee_id, position_id in zip(self.employee_ids, positions)
+            ),
+        )
+        self.employee_names = [(first, last) for _, _, first, last in people]
+
+    def create_attainments(self):
+        rng = self.rng
+
+        # The employees are the authors under their short names
+        aliases = [f"{first[0]}. {last}" for first, last in self.employee_names]
+        external_aliases = []
+        for index in range(int(self.employees * self.external_authors)):
+            first_name, last_name = self.get_name(rng.choice("FM"))
+            external_aliases.append(f"{first_name[0]}. {last_name} ({index})")
+
+        author_ids = self.create(
+            Author,
+            (
+                Author(employee_id=employee_id, alias=alias)
+                for employee_id, alias in zip(self.employee_ids, aliases)
+            ),
+        )
+        author_ids += self.create(
+            Author, (Author(alias=alias) for alias in external_aliases)
+        )
+
+        articles = int(self.employees * self.articles_per_employee)
+        titles = [
+            "{} {} ({}/{})".format(
+                " ".join(rng.sample(TITLE_WORDS, 4)).capitalize(),
+                rng.choice(LAST_NAMES),
+                self.seed,
+                index,
+            )
+            for index in range(articles)
+        ]
+        years = [rng.randint(2017, 2025) for _ in titles]
+        article_ids = self.create(
+            Article,
+            (
+                Article(
+                    title=title,
+                    year=year,
+                    title_hash=get_title_hash(title, year),
+                    journal=f"Czasopismo {rng.randint(1, 200)}",
+                )
+                for title, year in zip(titles, years)
+            ),
+        )
+
+        content_type_id = ContentType.objects.get_for_model(Article).pk
+
+        def iter_contributions():
+            for article_id in article_ids:
+                count = rng.randint(1, self.authors_per_article * 2 - 1)
+                article_author_ids = rng.sample(author_ids, min(count, len(author_ids)))
+                percentages = get_percentages(len(article_author_ids))
+                for order, (author_id, percentage) in enumerate(
+                    zip(article_author_ids, percentages), start=1
+                ):
+                    yield Contribution(
+                        content_type_id=content_type_id,
+                        object_id=article_id,
+                        order=order,
+                        author_id=author_id,
+                        percentage=percentage,
+                    )
+
+        self.create(Contribution, iter_contributions())
+
+    def refresh_derived_tables(self):
+        """Refresh the tables kept up to date by the signals, in batches."""
+        for model, refresh in [
+            (Author, AuthorAffiliation.objects.refresh),
+            (Author, lambda authors: AuthorAlias.objects.refresh(authors=authors)),
+            (Employee, lambda people: AuthorAlias.objects.refresh(employees=people)),
+            *((model, search_index.reindex) for model in search_index.lookups),
+        ]:
+            ids = self.created_ids.get(model, [])
+            for start in range(0, len(ids), self.batch_size):
+                stop = start + self.batch_size
+                refresh(model.objects.filter(id__in=ids[start:stop]))
+
+        for model in EVALUATION_MODELS:
+            model.objects.refresh()
+
+        # As with the signals, the caches are invalidated once the data are saved
+        for model in self.created_ids:
+            if isinstance(getattr(model, "cached", None), TableCache):
+                transaction.on_commit(model.cached.invalidate)
+            invalidate_autocomplete(model)
+        self.log("Refreshed the derived tables.")
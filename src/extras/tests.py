@@ -0,0 +1,196 @@
+import math
+import time
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from employees.models import Status
+
+from .autocomplete import get_cache, get_version_key
+from .budgets import QueryBudgetCheck
+from .caches import invalidate_reference_caches
+from .instrumentation import QueryRecorder, metrics
+from .models import SearchToken
+from .routers import (
+    PRIMARY_UNTIL_SESSION_KEY,
+    ReplicaRouter,
+    ReplicaStickinessMiddleware,
+    read_from_replica,
+    track_writes,
+    written,
+)
+from .search import search_index
+from .synthetic import SyntheticData
+
+
+class TableCacheTests(TestCase):
+    """A class to represent the tests of the caches of the reference tables."""
+
+    def setUp(self):
+        invalidate_reference_caches()
+        self.status = Status.objects.create(name="Pracownik", abbreviation="P")
+        self.assertEqual(Status.cached.all(), [self.status])
+
+    def test_committed_changes_invalidate_cache(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            status = Status.objects.create(name="Doktorant", abbreviation="D")
+        self.assertEqual(Status.cached.all(), [self.status, status])
+        self.assertEqual(Status.cached.get_by_abbreviation("D"), status)
+
+    def test_rolled_back_changes_are_not_cached(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(RuntimeError):
+                with transaction.atomic():
+                    status = Status.objects.create(name="Doktorant", abbreviation="D")
+                    self.assertEqual(Status.cached.get(status.pk), status)
+                    raise RuntimeError
+
+        self.assertEqual(Status.cached.all(), [self.status])
+        with self.assertRaises(Status.DoesNotExist):
+            Status.cached.get(status.pk)
+
+    def test_missing_objects_are_queried(self):
+        # The objects created in bulk, as by another process, send no signals
+        (status,) = Status.objects.bulk_create(
+            [Status(name="Doktorant", abbreviation="D")]
+        )
+        self.assertEqual(Status.cached.get(status.pk), status)
+        self.assertIsNone(Status.cached.get(None))
+
+
+class AutocompleteInvalidationTests(TestCase):
+    """A class to represent the tests of the invalidation of the autocomplete."""
+
+    def test_admin_models_invalidate_results(self):
+        key = get_version_key(Status)
+        version = get_cache().get(key, 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            Status.objects.create(name="Pracownik", abbreviation="P")
+            # The results of the concurrent requests are cached under the old one
+            self.assertEqual(get_cache().get(key, 0), version)
+        self.assertEqual(get_cache().get(key), version + 1)
+
+    def test_other_models_are_fast_deleted(self):
+        get_user_model().objects.create_user("jnowak", first_name="Jan")
+        search_index.reindex(get_user_model().objects.all())
+        with self.assertNumQueries(1):
+            SearchToken.objects.all().delete()
+        self.assertFalse(SearchToken.objects.exists())
+
+
+class QueryBudgetTests(TestCase):
+    """A class to represent the tests of the numbers of the queries of the admins."""
+
+    def setUp(self):
+        invalidate_reference_caches()
+        user = get_user_model().objects.create_superuser("query-budgets")
+        self.client.force_login(user)
+
+    def test_admin_pages_are_within_budgets(self):
+        check = QueryBudgetCheck(self.client)
+        generated = 0
+        for seed, size in enumerate([10, 30]):
+            # The caches are invalidated once the data are committed
+            with self.captureOnCommitCallbacks(execute=True):
+                SyntheticData(
+                    employees=size - generated, seed=seed, employees_per_department=2
+                ).generate()
+            generated = size
+            check.seed_article()
+            check.count()
+
+        failed = check.get_failed()
+        self.assertFalse(
+            failed,
+            "The admin pages exceed their query budgets or make more queries as "
+            "the data grow:\n" + check.format(failed),
+        )
+
+
+class InstrumentationTests(TestCase):
+    """A class to represent the tests of the measuring of the requests."""
+
+    def setUp(self):
+        metrics.reset()
+        self.addCleanup(metrics.reset)
+
+    def test_recorder_counts_queries(self):
+        recorder = QueryRecorder(slow_query_threshold=0)
+        with self.assertLogs("extras.instrumentation", "WARNING") as logs:
+            with connection.execute_wrapper(recorder):
+                for pk in [1, 2]:
+                    Status.objects.filter(pk=pk).exists()
+
+        self.assertEqual(recorder.count, 2)
+        self.assertEqual(len(logs.records), 2)
+        self.assertIn("Slow query", logs.records[0].getMessage())
+        self.assertEqual(list(recorder.get_duplicates().values()), [2])
+
+    def test_fast_queries_are_not_logged(self):
+        recorder = QueryRecorder(slow_query_threshold=math.inf)
+        with self.assertNoLogs("extras.instrumentation", "WARNING"):
+            with connection.execute_wrapper(recorder):
+                Status.objects.exists()
+        self.assertEqual(recorder.count, 1)
+
+    @override_settings(INSTRUMENTATION_ENABLED=True)
+    def test_requests_are_aggregated_by_view(self):
+        url = reverse("extras:metrics")
+        self.assertIn("Server-Timing", self.client.get(url))
+        views = self.client.get(url).json()["views"]
+        self.assertEqual(views["extras:metrics"]["requests"], 1)
+
+
+@override_settings(REPLICA_DATABASES=["replica"])
+class ReplicaRouterTests(SimpleTestCase):
+    """A class to represent the tests of the routing of the reads to the replicas."""
+
+    def setUp(self):
+        self.router = ReplicaRouter()
+        # The writes of the preceding tests are not tracked by the test cases
+        self.enterContext(track_writes())
+
+    def test_reads_are_sent_to_replica(self):
+        self.assertIsNone(self.router.db_for_read(Status))
+        with read_from_replica():
+            self.assertEqual(self.router.db_for_read(Status), "replica")
+
+    def test_reads_after_write_are_sent_to_primary(self):
+        with read_from_replica():
+            with track_writes():
+                self.assertEqual(self.router.db_for_write(Status), "default")
+                self.assertIsNone(self.router.db_for_read(Status))
+            self.assertEqual(self.router.db_for_read(Status), "replica")
+
+    def get_response(self, request):
+        if request.method == "POST":
+            self.router.db_for_write(Status)
+        with read_from_replica():
+            return HttpResponse(self.router.db_for_read(Status) or "default")
+
+    def call_middleware(self, request, primary_until=0):
+        request.session = import_module(settings.SESSION_ENGINE).SessionStore()
+        if primary_until:
+            request.session[PRIMARY_UNTIL_SESSION_KEY] = primary_until
+        response = ReplicaStickinessMiddleware(self.get_response)(request)
+        return response.content.decode(), request.session
+
+    def test_middleware_resets_writes(self):
+        content, session = self.call_middleware(RequestFactory().post("/"))
+        self.assertEqual(content, "default")
+        self.assertGreater(session[PRIMARY_UNTIL_SESSION_KEY], time.time())
+        self.assertFalse(written.get())
+
+        content, session = self.call_middleware(RequestFactory().get("/"))
+        self.assertEqual(content, "replica")
+        self.assertNotIn(PRIMARY_UNTIL_SESSION_KEY, session)
+
+    def test_recent_writers_read_from_primary(self):
+        request = RequestFactory().get("/")
+        content, session = self.call_middleware(request, time.time() + 60)
+        self.assertEqual(content, "default")
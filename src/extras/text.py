@@ -0,0 +1,65 @@
+import re
+import unicodedata
+
+# The letters not decomposed by the Unicode normalization
+FOLDED_LETTERS = str.maketrans({"ł": "l", "Ł": "L", "ø": "o", "Ø": "O", "ß": "ss"})
+
+# The texts of the boolean values, e.g. in the query strings or the data files
+TRUE_VALUES = {"1", "true", "t", "yes", "y", "tak"}
+FALSE_VALUES = {"0", "false", "f", "no", "n", "nie"}
+
+
+def fold(text):
+    """Return the text lowercased, without diacritics and extra whitespace."""
+    text = unicodedata.normalize("NFKD", text.translate(FOLDED_LETTERS))
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return " ".join(text.lower().split())
+
+
+def parse_bool(text):
+    """Convert the text of the boolean value, raising ValueError if unrecognized."""
+    value = text.strip().lower()
+    if value in TRUE_VALUES:
+        return True
+    if value in FALSE_VALUES:
+        return False
+    raise ValueError(
+        "'{}' is not a boolean value, use one of: {}.".format(
+            text, ", ".join(sorted(TRUE_VALUES | FALSE_VALUES))
+        )
+    )
+
+
+def get_name_key(name):
+    """
+    Return the normalized key of the name of a person.
+
+    The key consists of the initials of the first names followed by the last
+    name, folded, e.g. "j m kowalski" for "Jan Maria Kowalski", "J.M. Kowalski",
+    "Kowalski J. M.", "Kowalski JM" or "Kowalski, Jan Maria".
+    """
+
+    def split(text):
+        return re.findall(r"[^\W\d_][\w-]*", text)
+
+    if "," in name:
+        last_name, _, first_names = name.partition(",")
+        initials = [word[0] for word in split(first_names)]
+        last_names = split(last_name)
+    else:
+        # The initials are the single letters and the short uppercase words,
+        # e.g. "JM"; the rest of the words are the last name, unless there are
+        # no initials at all, in which case the last word is the last name
+        words = split(name)
+        initials, last_names = [], []
+        for word in words:
+            if len(word) == 1 or (len(words) > 1 and len(word) <= 3 and word.isupper()):
+                initials.extend(word)
+            else:
+                last_names.append(word)
+        if not initials and last_names:
+            *first_names, last_name = last_names
+            initials = [word[0] for word in first_names]
+            last_names = [last_name]
+
+    return fold(" ".join([*initials, *last_names]))
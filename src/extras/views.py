@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+
+from .instrumentation import metrics
+
+
+@require_GET
+def metrics_view(request):
+    """
+    Return the request metrics of the process as JSON, see `InstrumentationMiddleware`.
+
+    The metrics are available from the `INTERNAL_IPS` or to the staff members only.
+    """
+    if not (
+        request.META.get("REMOTE_ADDR") in settings.INTERNAL_IPS
+        or request.user.is_staff
+    ):
+        raise PermissionDenied
+
+    return JsonResponse(
+        {
+            "enabled": getattr(settings, "INSTRUMENTATION_ENABLED", False),
+            "views": metrics.as_dict(),
+        }
+    )
@@ -1,3 +1,4 @@
+from django.contrib.admin.widgets import AutocompleteSelect
 from django.forms import widgets
 
 
@@ -5,3 +6,33 @@ class ReadOnlyInput(widgets.Widget):
     """A class to represent a widget for displaying form data as a plain text."""
 
     template_name = "extras/forms/widgets/read_only_input.html"
+
+
+class PrefetchedAutocompleteSelect(AutocompleteSelect):
+    """
+    A class to represent an autocomplete widget rendering the prefetched objects.
+
+    The selected object is rendered from the `objects` dictionary (by the string
+    of its value), e.g. filled with the related objects selected along with the
+    inline forms, with no query. Any other value is looked up as in
+    `AutocompleteSelect`.
+    """
+
+    def __init__(self, *args, objects=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.objects = objects or {}
+
+    def optgroups(self, name, value, attr=None):
+        values = [
+            str(v) for v in value if str(v) not in self.choices.field.empty_values
+        ]
+        if any(v not in self.objects for v in values):
+            return super().optgroups(name, value, attr)
+
+        options = []
+        if not self.is_required:
+            options.append(self.create_option(name, "", "", False, 0))
+        for v in values:
+            label = self.choices.field.label_from_instance(self.objects[v])
+            options.append(self.create_option(name, v, label, True, len(options)))
+        return [(None, options, 0)]
@@ -0,0 +1,15 @@
+from django.contrib import admin
+
+from extras.autocomplete import AutocompleteJsonView
+
+
+class AdminSite(admin.AdminSite):
+    """
+    A class to represent the admin site of the project.
+
+    The site serves the autocomplete fields with the cached results, see
+    `extras.autocomplete`.
+    """
+
+    def autocomplete_view(self, request):
+        return AutocompleteJsonView.as_view(admin_site=self)(request)
@@ -0,0 +1,7 @@
+from django.contrib.admin.apps import AdminConfig as BaseAdminConfig
+
+
+class AdminConfig(BaseAdminConfig):
+    """A class to represent the admin application with the project admin site."""
+
+    default_site = "project.admin.AdminSite"
@@ -37,7 +37,7 @@ ALLOWED_HOSTS = []
 # Application definition
 
 INSTALLED_APPS = [
-    "django.contrib.admin",
+    "project.apps.AdminConfig",
     "django.contrib.auth",
     "django.contrib.contenttypes",
     "django.contrib.sessions",
@@ -56,8 +56,10 @@ INSTALLED_APPS = [
 # Middleware, URLs, templates
 
 MIDDLEWARE = [
+    "extras.instrumentation.InstrumentationMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
+    "extras.routers.ReplicaStickinessMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
@@ -67,6 +69,18 @@ MIDDLEWARE = [
 
 ROOT_URLCONF = "project.urls"
 
+# The measuring of the requests (see extras.instrumentation), along with the
+# thresholds (in ms) of the logged slow requests and queries. The metrics are
+# served to the INTERNAL_IPS (and the staff members) at /extras/metrics/.
+
+INSTRUMENTATION_ENABLED = getenv("INSTRUMENTATION_ENABLED", "") in ["1", "true"]
+
+SLOW_REQUEST_THRESHOLD = int(getenv("SLOW_REQUEST_THRESHOLD", 500))
+
+SLOW_QUERY_THRESHOLD = int(getenv("SLOW_QUERY_THRESHOLD", 100))
+
+INTERNAL_IPS = ["127.0.0.1"]
+
 TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
@@ -105,9 +119,93 @@ DATABASES = {
         "PORT": getenv("DB_PORT"),
         "USER": getenv("DB_USER"),
         "PASSWORD": getenv("DB_PASSWORD"),
+        # The connections are kept open between the requests for the given number
+        # of seconds ("none" for unlimited, 0 to close them after each request),
+        # and checked before being reused by the next request. The persistent
+        # connections are kept per thread, hence there are as many of them as the
+        # worker threads of the server.
+        "CONN_MAX_AGE": (
+            None
+            if getenv("DB_CONN_MAX_AGE", "").lower() == "none"
+            else int(getenv("DB_CONN_MAX_AGE", 60))
+        ),
+        "CONN_HEALTH_CHECKS": getenv("DB_CONN_HEALTH_CHECKS", "1") in ["1", "true"],
+        "OPTIONS": {},
+    }
+}
+
+# The timeout (in seconds) of opening the connections
+if getenv("DB_CONNECT_TIMEOUT"):
+    DATABASES["default"]["OPTIONS"]["connect_timeout"] = int(
+        getenv("DB_CONNECT_TIMEOUT")
+    )
+
+# The pool of the connections, supported by the PostgreSQL backend only, given as
+# the minimal and the maximal numbers of the connections, e.g. "2,10". The pooled
+# connections are returned to the pool after each request instead of persisting.
+if getenv("DB_POOL"):
+    min_size, max_size = map(int, getenv("DB_POOL").split(","))
+    DATABASES["default"]["OPTIONS"]["pool"] = {
+        "min_size": min_size,
+        "max_size": max_size,
+    }
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+
+# The read replicas of the default database, given as the comma-separated hosts
+# (with the optional ports, e.g. "replica1,replica2:5433") sharing the rest of
+# its settings. The reporting, export and API reads are sent to the replicas
+# (see extras.routers), apart from the users who wrote to the database within
+# the last REPLICA_STICKY_SECONDS, so that they see their changes. With no
+# replicas, all the queries go to the default database.
+REPLICA_DATABASES = []
+
+for index, replica in enumerate(
+    filter(None, map(str.strip, getenv("DB_REPLICA_HOSTS", "").split(","))), 1
+):
+    host, _, port = replica.partition(":")
+    alias = f"replica{index}"
+    DATABASES[alias] = {
+        **DATABASES["default"],
+        "HOST": host,
+        "PORT": port or DATABASES["default"]["PORT"],
+        "OPTIONS": {**DATABASES["default"]["OPTIONS"]},
+        "TEST": {"MIRROR": "default"},
+    }
+    REPLICA_DATABASES.append(alias)
+
+DATABASE_ROUTERS = ["extras.routers.ReplicaRouter"]
+
+REPLICA_STICKY_SECONDS = int(getenv("DB_REPLICA_STICKY_SECONDS", 15))
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.0/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": getenv(
+            "CACHE_BACKEND",
+            "django.core.cache.backends.locmem.LocMemCache",
+        ),
+        "LOCATION": getenv("CACHE_LOCATION", ""),
     }
 }
 
+# The alias of the cache shared by the processes, used to invalidate the cached
+# reference tables (see extras.caches) in all of them; if not set, the cached
+# tables expire after the timeout (in seconds).
+
+REFERENCE_CACHE_ALIAS = getenv("REFERENCE_CACHE_ALIAS")
+
+REFERENCE_CACHE_TIMEOUT = int(getenv("REFERENCE_CACHE_TIMEOUT", 300))
+
+# The alias of the cache and the timeout (in seconds) of the cached results of the
+# admin autocomplete fields (see extras.autocomplete).
+
+AUTOCOMPLETE_CACHE_ALIAS = getenv("AUTOCOMPLETE_CACHE_ALIAS", "default")
+
+AUTOCOMPLETE_CACHE_TIMEOUT = int(getenv("AUTOCOMPLETE_CACHE_TIMEOUT", 30))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.0/ref/settings/#auth-password-validators
@@ -7,4 +7,5 @@ urlpatterns = [
     path("units/", include("units.urls")),
     path("employees/", include("employees.urls")),
     path("attainments/", include("attainments.urls")),
+    path("extras/", include("extras.urls")),
 ]
@@ -3,6 +3,7 @@ from django.utils.text import capfirst
 
 from .forms import DepartmentAdminForm
 from .models import Department, Faculty, University
+from .tree import unit_tree
 
 
 @admin.register(University)
@@ -49,7 +50,7 @@ class FacultyAdmin(admin.ModelAdmin):
         ordering="university__name",
     )
     def university__name(self, obj):
-        return obj.university.name
+        return unit_tree.get_parent(obj).name
 
 
 @admin.register(Department)
@@ -80,7 +81,7 @@ class DepartmentAdmin(admin.ModelAdmin):
         ordering="faculty__name",
     )
     def faculty__name(self, obj):
-        return obj.faculty.name
+        return unit_tree.get_parent(obj).name
 
     @admin.display(
         description=capfirst(
@@ -91,4 +92,4 @@ class DepartmentAdmin(admin.ModelAdmin):
         ordering="faculty__university__name",
     )
     def faculty__university__name(self, obj):
-        return obj.faculty.university.name
+        return unit_tree.get_university(obj).name
@@ -4,6 +4,7 @@ from django.utils.text import capfirst
 from extras.forms import ReadOnlyField
 
 from .models import Department, University
+from .tree import unit_tree
 
 
 class DepartmentAdminForm(forms.ModelForm):
@@ -19,6 +20,4 @@ class DepartmentAdminForm(forms.ModelForm):
         super().__init__(*args, **kwargs)
 
         if self.instance.pk:
-            self.fields["university"].initial = getattr(
-                self.instance.faculty, "university"
-            )
+            self.fields["university"].initial = unit_tree.get_university(self.instance)
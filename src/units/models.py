@@ -1,5 +1,7 @@
 from django.db import models
 
+from extras.caches import ReferenceCache
+
 
 class Unit(models.Model):
     """A class to represent abstract Unit objects."""
@@ -7,6 +9,8 @@ class Unit(models.Model):
     name = models.CharField(verbose_name="nazwa", max_length=50)
     abbreviation = models.CharField(verbose_name="skrót", max_length=10)
 
+    cached = ReferenceCache()
+
     class Meta:
         abstract = True
 
@@ -0,0 +1,38 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from extras.caches import invalidate_reference_caches
+
+from .models import Department, Faculty, University
+from .tree import unit_tree
+
+
+class UnitTreeTests(TestCase):
+    """A class to represent the tests of the in-memory tree of the units."""
+
+    def setUp(self):
+        invalidate_reference_caches()
+        self.assertEqual(unit_tree.as_list(), [])
+
+        # The units created in bulk, as by another process, send no signals
+        (self.university,) = University.objects.bulk_create(
+            [University(name="Uczelnia", abbreviation="U")]
+        )
+        (self.faculty,) = Faculty.objects.bulk_create(
+            [Faculty(name="Wydział", abbreviation="W", university=self.university)]
+        )
+        (self.department,) = Department.objects.bulk_create(
+            [Department(name="Katedra", abbreviation="K", faculty=self.faculty)]
+        )
+
+    def test_units_missing_from_tree_are_looked_up(self):
+        self.assertEqual(unit_tree.get_parent(self.department), self.faculty)
+        self.assertEqual(unit_tree.get_university(self.department), self.university)
+
+    def test_changelist_with_stale_tree(self):
+        user = get_user_model().objects.create_superuser("admin")
+        self.client.force_login(user)
+
+        response = self.client.get(reverse("admin:units_department_changelist"))
+        self.assertContains(response, self.university.name)
@@ -0,0 +1,125 @@
+import json
+import threading
+
+from .models import Department, Faculty, University
+
+# The levels of the units hierarchy along with the fields pointing to the parents
+LEVELS = [
+    (University, None),
+    (Faculty, "university_id"),
+    (Department, "faculty_id"),
+]
+
+
+class UnitTree:
+    """
+    A class to represent the in-memory tree of the units.
+
+    The units of each level (University -> Faculty -> Department) are read from
+    their reference caches, see `extras.caches`, i.e. with a single query per level.
+    As the caches are invalidated by level, only the child lists of the changed
+    level are rebuilt after a unit is saved or deleted. All the lookups of parents,
+    children and ancestors are then O(1) dictionary lookups.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.sources = {}
+        self.children = {}
+        self.payload = None
+        self.payload_sources = None
+
+    def get_units(self, model):
+        """Return the dictionary of the units of the level, by ID."""
+        units = model.cached.get_objects_by_id()
+
+        # Rebuild the child lists of the parents, if the level has been reloaded
+        if self.sources.get(model) is not units:
+            with self.lock:
+                parent_field = dict(LEVELS)[model]
+                children = {}
+                if parent_field:
+                    for unit in units.values():
+                        children.setdefault(getattr(unit, parent_field), []).append(
+                            unit
+                        )
+                self.children[model] = children
+                self.sources[model] = units
+
+        return units
+
+    def get(self, model, pk):
+        """
+        Return the unit of the given level and ID, or None if the ID is None.
+
+        The units missing from the tree, e.g. created by another process in the
+        meantime, are looked up in the reference cache, which reloads the level.
+        """
+        unit = self.get_units(model).get(pk)
+        if unit is None and pk is not None:
+            unit = model.cached.get(pk)
+        return unit
+
+    def get_parent(self, unit):
+        """Return the parent of the unit, or None for the universities."""
+        models = [model for model, _ in LEVELS]
+        level = models.index(type(unit))
+        if level == 0:
+            return None
+        return self.get(models[level - 1], getattr(unit, LEVELS[level][1]))
+
+    def get_children(self, unit):
+        """Return the list of the child units of the unit."""
+        models = [model for model, _ in LEVELS]
+        level = models.index(type(unit))
+        if level == len(models) - 1:
+            return []
+        child_model = models[level + 1]
+        self.get_units(child_model)
+        return list(self.children[child_model].get(unit.pk, []))
+
+    def get_ancestors(self, unit):
+        """Return the list of the ancestors of the unit, the closest one first."""
+        ancestors = []
+        parent = self.get_parent(unit)
+        while parent is not None:
+            ancestors.append(parent)
+            parent = self.get_parent(parent)
+        return ancestors
+
+    def get_university(self, unit):
+        """Return the university the unit belongs to."""
+        ancestors = [unit, *self.get_ancestors(unit)]
+        return ancestors[-1] if isinstance(ancestors[-1], University) else None
+
+    def as_list(self):
+        """Return the whole hierarchy as a list of nested dictionaries."""
+
+        def serialize(unit):
+            data = {
+                "id": unit.pk,
+                "name": unit.name,
+                "abbreviation": unit.abbreviation,
+            }
+            if not isinstance(unit, Department):
+                key = "faculties" if isinstance(unit, University) else "departments"
+                data[key] = [serialize(child) for child in self.get_children(unit)]
+            return data
+
+        return [serialize(unit) for unit in self.get_units(University).values()]
+
+    def as_json(self):
+        """Return the whole hierarchy serialized to JSON, as cached bytes."""
+        sources = tuple(self.get_units(model) for model, _ in LEVELS)
+
+        if self.payload_sources is None or any(
+            source is not payload_source
+            for source, payload_source in zip(sources, self.payload_sources)
+        ):
+            self.payload = json.dumps(self.as_list(), ensure_ascii=False).encode()
+            self.payload_sources = sources
+
+        return self.payload
+
+
+unit_tree = UnitTree()
@@ -1,3 +1,9 @@
+from django.urls import path
+
+from . import views
+
 app_name = "units"
 
-urlpatterns = []
+urlpatterns = [
+    path("tree/", views.tree, name="tree"),
+]
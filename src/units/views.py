@@ -0,0 +1,25 @@
+import hashlib
+
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import require_GET
+
+from .tree import unit_tree
+
+
+@require_GET
+@staff_member_required
+def tree(request):
+    """Return the whole hierarchy of the units as JSON."""
+    payload = unit_tree.as_json()
+    etag = '"{}"'.format(hashlib.md5(payload).hexdigest())
+
+    if etag in request.headers.get("If-None-Match", ""):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(payload, content_type="application/json")
+
+    response["ETag"] = etag
+    patch_cache_control(response, private=True, max_age=60)
+    return response